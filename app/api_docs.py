@@ -3,6 +3,7 @@
 自定義 FastAPI OpenAPI 生成，增加台灣特色與醫療合規資訊
 """
 
+from functools import lru_cache
 from typing import Dict, Any, Optional
 from fastapi import FastAPI
 from fastapi.openapi.utils import get_openapi
@@ -342,12 +343,13 @@ def enhance_fastapi_docs(app: FastAPI) -> None:
         return response
 
 
+@lru_cache(maxsize=1)
 def get_taiwan_medical_openapi_config() -> Dict[str, Any]:
     """
     取得台灣醫療 AI 助理的 OpenAPI 設定
 
     Returns:
-        Dict: OpenAPI 設定字典
+        Dict: OpenAPI 設定字典（只建立一次並共用，呼叫端不應修改）
     """
     return {
         "title": "台灣醫療 AI 助理 API",
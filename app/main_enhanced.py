@@ -7,6 +7,7 @@ import uuid
 import asyncio
 from typing import Callable
 from fastapi import FastAPI, Request, Response
+from fastapi.middleware.gzip import GZipMiddleware
 from starlette.middleware.base import BaseHTTPMiddleware
 from fastapi.responses import JSONResponse
 from app.config import get_settings
@@ -18,6 +19,8 @@ from app.routers.monitoring import router as monitoring_router
 from app.monitoring.structured_logging import configure_logging, structured_logger
 from app.monitoring.health import health_checker
 from app.monitoring.metrics import metrics_collector
+from app.services.geocoding import close_http_client, close_async_http_client
+from app.services.places import close_async_http_client as close_places_http_client
 from app.api_docs import enhance_fastapi_docs, get_taiwan_medical_openapi_config
 
 
@@ -66,6 +69,9 @@ async def lifespan(app_instance: FastAPI):
     structured_logger.info("Taiwan Medical AI Assistant started")
     yield
     # Shutdown
+    close_http_client()
+    await close_async_http_client()
+    await close_places_http_client()
     structured_logger.info("Taiwan Medical AI Assistant shutting down")
 
 # 創建 FastAPI 應用程式實例（使用增強的 OpenAPI 配置）
@@ -86,6 +92,9 @@ app = FastAPI(
 # 增強 API 文件功能
 enhance_fastapi_docs(app)
 
+# 回應壓縮：大於 1KB 的回應以 gzip 傳輸（最先註冊，位於最內層以取得完整回應內容）
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 # 添加監控中介層（按照執行順序）
 app.add_middleware(StructuredLoggingMiddleware)  # 最外層：結構化日誌
 app.add_middleware(MetricsMiddleware)            # 度量收集
@@ -3,6 +3,7 @@ PDPA-compliant audit logging system for Taiwan Medical AI Assistant.
 Ensures comprehensive audit trail while maintaining privacy compliance.
 """
 
+import base64
 import hashlib
 import json
 import os
@@ -17,7 +18,10 @@ from dataclasses import dataclass, asdict
 import asyncio
 from pathlib import Path
 import gzip
-import base64
+import zlib
+import orjson
+from cryptography.exceptions import InvalidTag
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 
 
 class AuditEventType(Enum):
@@ -134,17 +138,28 @@ class AuditStorageBackend(ABC):
 class EncryptedAuditStorage(AuditStorageBackend):
     """Encrypted file-based audit storage."""
 
+    NONCE_SIZE = 12
+    READ_BATCH_SIZE = 64
+
     def __init__(self, encryption_key: str, storage_path: str):
         if len(encryption_key) < 32:
             raise ValueError("Encryption key must be at least 32 characters")
 
         self.encryption_key = encryption_key
+        # AES-256-GCM key derived from the configured passphrase; AESGCM is
+        # stateless per call, so one instance is shared across threads
+        self._cipher = AESGCM(hashlib.sha256(encryption_key.encode('utf-8')).digest())
         self.storage_path = Path(storage_path)
         self.storage_path.mkdir(parents=True, exist_ok=True)
         self._lock = threading.Lock()
 
     async def store_event(self, event: AuditEvent):
         """Store an encrypted audit event."""
+        # Encryption and file I/O are blocking; keep them off the event loop
+        await asyncio.to_thread(self._store_event_sync, event)
+
+    def _store_event_sync(self, event: AuditEvent):
+        """Encrypt and write an audit event (blocking)."""
         event_data = event.to_dict()
 
         # Encrypt and store
@@ -162,42 +177,80 @@ class EncryptedAuditStorage(AuditStorageBackend):
                           user_id_hash: Optional[str] = None,
                           limit: int = 1000) -> List[AuditEvent]:
         """Query encrypted audit events."""
+        file_paths = await asyncio.to_thread(lambda: list(self.storage_path.glob("*.audit")))
+        events: List[AuditEvent] = []
+
+        for offset in range(0, len(file_paths), self.READ_BATCH_SIZE):
+            if len(events) >= limit:
+                break
+
+            # Issue the batch's file reads concurrently instead of one after another
+            batch = file_paths[offset:offset + self.READ_BATCH_SIZE]
+            encrypted_records = await asyncio.gather(
+                *(asyncio.to_thread(self._read_encrypted_data, file_path) for file_path in batch),
+                return_exceptions=True
+            )
+
+            events.extend(await asyncio.to_thread(
+                self._decrypt_and_filter_sync, encrypted_records,
+                start_time, end_time, event_type, correlation_id, user_id_hash,
+                limit - len(events)
+            ))
+
+        return sorted(events, key=lambda e: e.timestamp)
+
+    def _decrypt_and_filter_sync(self, encrypted_records: List[Union[bytes, BaseException]],
+                                 start_time: Optional[datetime],
+                                 end_time: Optional[datetime],
+                                 event_type: Optional[AuditEventType],
+                                 correlation_id: Optional[str],
+                                 user_id_hash: Optional[str],
+                                 limit: int) -> List[AuditEvent]:
+        """Decrypt and filter a batch of audit records (blocking)."""
         events = []
+        # Bind once: every record is decrypted with the same AESGCM key schedule
+        decrypt_data = self._decrypt_data
 
-        with self._lock:
-            for file_path in self.storage_path.glob("*.audit"):
-                if len(events) >= limit:
-                    break
-
-                try:
-                    encrypted_data = self._read_encrypted_data(file_path)
-                    event_data = self._decrypt_data(encrypted_data)
-
-                    # Parse event
-                    event = self._dict_to_event(event_data)
-
-                    # Apply filters
-                    if start_time and event.timestamp < start_time:
-                        continue
-                    if end_time and event.timestamp > end_time:
-                        continue
-                    if event_type and event.event_type != event_type:
-                        continue
-                    if correlation_id and event.correlation_id != correlation_id:
-                        continue
-                    if user_id_hash and event.user_id_hash != user_id_hash:
-                        continue
-
-                    events.append(event)
-
-                except Exception:
-                    # Skip corrupted files
+        for encrypted_data in encrypted_records:
+            if len(events) >= limit:
+                break
+
+            # Skip unreadable files (e.g. deleted mid-scan)
+            if isinstance(encrypted_data, BaseException):
+                continue
+
+            try:
+                event_data = decrypt_data(encrypted_data)
+
+                # Parse event
+                event = self._dict_to_event(event_data)
+
+                # Apply filters
+                if start_time and event.timestamp < start_time:
+                    continue
+                if end_time and event.timestamp > end_time:
+                    continue
+                if event_type and event.event_type != event_type:
+                    continue
+                if correlation_id and event.correlation_id != correlation_id:
+                    continue
+                if user_id_hash and event.user_id_hash != user_id_hash:
                     continue
 
-        return sorted(events, key=lambda e: e.timestamp)
+                events.append(event)
+
+            except Exception:
+                # Skip corrupted files
+                continue
+
+        return events
 
     async def delete_events(self, event_ids: List[str]):
         """Delete audit events by IDs."""
+        await asyncio.to_thread(self._delete_events_sync, event_ids)
+
+    def _delete_events_sync(self, event_ids: List[str]):
+        """Remove audit event files (blocking)."""
         with self._lock:
             for event_id in event_ids:
                 file_path = self.storage_path / f"{event_id}.audit"
@@ -205,38 +258,44 @@ class EncryptedAuditStorage(AuditStorageBackend):
                     file_path.unlink()
 
     def _encrypt_data(self, data: Dict[str, Any]) -> bytes:
-        """Encrypt data using AES encryption."""
-        # Simple XOR encryption for demo (use proper AES in production)
+        """Encrypt data using AES-GCM (nonce prepended to ciphertext)."""
         json_data = json.dumps(data, ensure_ascii=False).encode('utf-8')
-        key_bytes = self.encryption_key.encode('utf-8')
-
-        encrypted = bytearray()
-        for i, byte in enumerate(json_data):
-            encrypted.append(byte ^ key_bytes[i % len(key_bytes)])
-
-        return base64.b64encode(bytes(encrypted))
+        nonce = os.urandom(self.NONCE_SIZE)
+        return nonce + self._cipher.encrypt(nonce, json_data, None)
 
     def _decrypt_data(self, encrypted_data: bytes) -> Dict[str, Any]:
-        """Decrypt data."""
-        data = base64.b64decode(encrypted_data)
+        """Decrypt and authenticate data."""
+        # Slice through a memoryview so the ciphertext is not copied per record
+        view = memoryview(encrypted_data)
+        try:
+            json_data = self._cipher.decrypt(view[:self.NONCE_SIZE], view[self.NONCE_SIZE:], None)
+        except InvalidTag:
+            # Records written before AES-GCM use the XOR+base64 format
+            json_data = self._decrypt_legacy_data(encrypted_data)
+        return orjson.loads(json_data)
+
+    def _decrypt_legacy_data(self, encrypted_data: bytes) -> bytes:
+        """Decrypt a pre-AES-GCM record (base64 of key-XORed JSON)."""
+        xored = base64.b64decode(encrypted_data, validate=True)
         key_bytes = self.encryption_key.encode('utf-8')
-
-        decrypted = bytearray()
-        for i, byte in enumerate(data):
-            decrypted.append(byte ^ key_bytes[i % len(key_bytes)])
-
-        json_str = bytes(decrypted).decode('utf-8')
-        return json.loads(json_str)
+        key_len = len(key_bytes)
+        return bytes(byte ^ key_bytes[i % key_len] for i, byte in enumerate(xored))
 
     def _write_encrypted_data(self, data: bytes, file_path: Path):
         """Write encrypted data to file."""
-        with gzip.open(file_path, 'wb') as f:
-            f.write(data)
+        # Ciphertext is incompressible, so it is stored raw rather than gzipped
+        file_path.write_bytes(data)
 
     def _read_encrypted_data(self, file_path: Path) -> bytes:
         """Read encrypted data from file."""
-        with gzip.open(file_path, 'rb') as f:
-            return f.read()
+        data = file_path.read_bytes()
+        if data[:2] == b"\x1f\x8b":
+            # Records written before raw storage are gzip-wrapped
+            try:
+                return gzip.decompress(data)
+            except (OSError, EOFError, zlib.error):
+                pass
+        return data
 
     def _dict_to_event(self, data: Dict[str, Any]) -> AuditEvent:
         """Convert dictionary to AuditEvent."""
@@ -752,9 +811,22 @@ class AuditTrail:
         session_end = events[-1].timestamp
         session_duration = (session_end - session_start).total_seconds() / 60
 
-        # Extract unique event types and actions
-        event_types = list(set(e.event_type.value for e in events))
-        actions = [e.action for e in events]
+        # Serialize events and derive types, actions and timeline in one pass
+        event_types = set()
+        actions = []
+        event_dicts = []
+        timeline = []
+        for event in events:
+            event_dict = event.to_dict()
+            event_types.add(event_dict["event_type"])
+            actions.append(event.action)
+            event_dicts.append(event_dict)
+            timeline.append({
+                "timestamp": event_dict["timestamp"],
+                "action": event_dict["action"],
+                "resource": event_dict["resource"],
+                "details": event_dict["details"]
+            })
 
         return {
             "correlation_id": correlation_id,
@@ -762,9 +834,10 @@ class AuditTrail:
             "session_start": session_start.isoformat(),
             "session_end": session_end.isoformat(),
             "session_duration_minutes": session_duration,
-            "event_types": event_types,
+            "event_types": list(event_types),
             "actions": actions,
-            "events": [e.to_dict() for e in events]
+            "events": event_dicts,
+            "timeline": timeline
         }
 
 
@@ -782,30 +855,29 @@ class ComplianceReporter:
             end_time=end_date
         )
 
-        # Analyze events
-        data_collection_events = [
-            e for e in events
-            if e.event_type == AuditEventType.DATA_PROCESSING and e.action == "data_collection"
-        ]
-
-        data_processing_events = [
-            e for e in events
-            if e.event_type == AuditEventType.DATA_PROCESSING and e.action == "data_processing"
-        ]
-
-        # Extract legal bases
-        legal_bases = set()
-        for event in data_collection_events:
-            if "legal_basis" in event.details:
-                legal_bases.add(event.details["legal_basis"])
+        # Analyze events in a single pass; legal bases keep first-seen order
+        data_collection_count = 0
+        data_processing_count = 0
+        legal_bases: Dict[Any, None] = {}
+        data_processing_type = AuditEventType.DATA_PROCESSING
+
+        for event in events:
+            if event.event_type != data_processing_type:
+                continue
+            if event.action == "data_collection":
+                data_collection_count += 1
+                if "legal_basis" in event.details:
+                    legal_bases[event.details["legal_basis"]] = None
+            elif event.action == "data_processing":
+                data_processing_count += 1
 
         return {
             "period": {
                 "start": start_date,
                 "end": end_date
             },
-            "data_collection_events": len(data_collection_events),
-            "data_processing_events": len(data_processing_events),
+            "data_collection_events": data_collection_count,
+            "data_processing_events": data_processing_count,
             "legal_bases": list(legal_bases),
             "compliance_status": "compliant" if legal_bases else "needs_review"
         }
@@ -819,24 +891,23 @@ class ComplianceReporter:
             event_type=AuditEventType.SECURITY_EVENT
         )
 
-        # Analyze security events
-        failed_auth = [
-            e for e in events
-            if e.action == "authentication_attempt" and not e.details.get("success", True)
-        ]
-
-        rate_limiting = [
-            e for e in events
-            if e.action == "rate_limit_exceeded"
-        ]
+        # Analyze security events in a single pass
+        failed_auth_count = 0
+        rate_limiting_count = 0
+        for event in events:
+            if event.action == "authentication_attempt":
+                if not event.details.get("success", True):
+                    failed_auth_count += 1
+            elif event.action == "rate_limit_exceeded":
+                rate_limiting_count += 1
 
         return {
             "period": {
                 "start": start_date,
                 "end": end_date
             },
-            "failed_authentication_attempts": len(failed_auth),
-            "rate_limiting_events": len(rate_limiting),
+            "failed_authentication_attempts": failed_auth_count,
+            "rate_limiting_events": rate_limiting_count,
             "security_incidents": [e.to_dict() for e in events]
         }
 
@@ -10,6 +10,7 @@ from collections import defaultdict, deque
 from contextlib import contextmanager
 from datetime import datetime, timedelta
 from enum import Enum
+from functools import lru_cache
 from typing import Dict, List, Any, Optional, Union, Callable
 import psutil
 import statistics
@@ -23,6 +24,12 @@ class MetricType(Enum):
     SUMMARY = "summary"
 
 
+@lru_cache(maxsize=4096)
+def _format_labels(label_key: tuple) -> str:
+    """Render a sorted label tuple as Prometheus label pairs (cached per label set)."""
+    return ",".join(f'{k}="{v}"' for k, v in label_key)
+
+
 class Counter:
     """Counter metric that only increases."""
 
@@ -83,18 +90,19 @@ class Counter:
 
     def to_prometheus_format(self) -> str:
         """Convert to Prometheus format."""
+        name = self.name
         lines = [
-            f"# HELP {self.name} {self.description}",
-            f"# TYPE {self.name} counter"
+            f"# HELP {name} {self.description}",
+            f"# TYPE {name} counter"
         ]
 
-        samples = self.get_all_samples()
-        for sample in samples:
-            if sample["labels"]:
-                label_str = ",".join(f'{k}="{v}"' for k, v in sample["labels"].items())
-                lines.append(f'{self.name}{{{label_str}}} {sample["value"]}')
-            else:
-                lines.append(f'{self.name} {sample["value"]}')
+        with self._lock:
+            if self._value > 0:
+                lines.append(f'{name} {self._value}')
+
+            for label_key, value in self._labeled_values.items():
+                if value > 0:
+                    lines.append(f'{name}{{{_format_labels(label_key)}}} {value}')
 
         return "\n".join(lines)
 
@@ -183,18 +191,20 @@ class Gauge:
 
     def to_prometheus_format(self) -> str:
         """Convert to Prometheus format."""
+        name = self.name
         lines = [
-            f"# HELP {self.name} {self.description}",
-            f"# TYPE {self.name} gauge"
+            f"# HELP {name} {self.description}",
+            f"# TYPE {name} gauge"
         ]
 
-        samples = self.get_all_samples()
-        for sample in samples:
-            if sample["labels"]:
-                label_str = ",".join(f'{k}="{v}"' for k, v in sample["labels"].items())
-                lines.append(f'{self.name}{{{label_str}}} {sample["value"]}')
-            else:
-                lines.append(f'{self.name} {sample["value"]}')
+        with self._lock:
+            lines.append(f'{name} {self._value}')
+
+            for label_key, value in self._labeled_values.items():
+                if label_key:
+                    lines.append(f'{name}{{{_format_labels(label_key)}}} {value}')
+                else:
+                    lines.append(f'{name} {value}')
 
         return "\n".join(lines)
 
@@ -330,29 +340,32 @@ class Histogram:
             f"# TYPE {self.name} histogram"
         ]
 
+        name = self.name
         with self._lock:
+            # Label prefixes are rendered once per label set, not once per bucket
+            labeled_buckets = [
+                (_format_labels(label_key) + ",", buckets)
+                for label_key, buckets in self._labeled_buckets.items()
+            ]
+
             # Add bucket metrics
             for bucket in self.buckets:
                 bucket_str = "+Inf" if bucket == float('inf') else str(bucket)
-                lines.append(f'{self.name}_bucket{{le="{bucket_str}"}} {self._buckets[bucket]}')
+                lines.append(f'{name}_bucket{{le="{bucket_str}"}} {self._buckets[bucket]}')
 
                 # Add labeled bucket metrics
-                for label_key, buckets in self._labeled_buckets.items():
-                    labels_dict = dict(label_key)
-                    labels_dict["le"] = bucket_str
-                    label_str = ",".join(f'{k}="{v}"' for k, v in labels_dict.items())
-                    lines.append(f'{self.name}_bucket{{{label_str}}} {buckets[bucket]}')
+                for label_prefix, buckets in labeled_buckets:
+                    lines.append(f'{name}_bucket{{{label_prefix}le="{bucket_str}"}} {buckets[bucket]}')
 
             # Add count and sum
-            lines.append(f'{self.name}_count {self._count}')
-            lines.append(f'{self.name}_sum {self._sum}')
+            lines.append(f'{name}_count {self._count}')
+            lines.append(f'{name}_sum {self._sum}')
 
             # Add labeled count and sum
-            for label_key in self._labeled_count.keys():
-                labels_dict = dict(label_key)
-                label_str = ",".join(f'{k}="{v}"' for k, v in labels_dict.items())
-                lines.append(f'{self.name}_count{{{label_str}}} {self._labeled_count[label_key]}')
-                lines.append(f'{self.name}_sum{{{label_str}}} {self._labeled_sum[label_key]}')
+            for label_key, count in self._labeled_count.items():
+                label_str = _format_labels(label_key)
+                lines.append(f'{name}_count{{{label_str}}} {count}')
+                lines.append(f'{name}_sum{{{label_str}}} {self._labeled_sum[label_key]}')
 
         return "\n".join(lines)
 
@@ -423,24 +436,25 @@ class Summary:
 
             if labels:
                 label_key = tuple(sorted(labels.items()))
-                observations = [val for val, _ in self._labeled_observations.get(label_key, [])]
-            else:
-                observations = [val for val, _ in self._observations]
+                return self._compute_quantiles(self._labeled_observations.get(label_key, ()))
+            return self._compute_quantiles(self._observations)
 
-            if not observations:
-                return {q: 0.0 for q in self.quantiles}
+    def _compute_quantiles(self, timed_observations) -> Dict[float, float]:
+        """Compute quantiles from (value, timestamp) pairs; caller holds the lock."""
+        observations = sorted(val for val, _ in timed_observations)
 
-            observations.sort()
-            result = {}
+        if not observations:
+            return {q: 0.0 for q in self.quantiles}
 
-            for q in self.quantiles:
-                if q == 0.5:
-                    result[q] = statistics.median(observations)
-                else:
-                    index = int(q * (len(observations) - 1))
-                    result[q] = observations[index]
+        result = {}
+        for q in self.quantiles:
+            if q == 0.5:
+                result[q] = statistics.median(observations)
+            else:
+                index = int(q * (len(observations) - 1))
+                result[q] = observations[index]
 
-            return result
+        return result
 
     def get_count(self, labels: Optional[Dict[str, str]] = None) -> int:
         """Get observation count."""
@@ -480,31 +494,33 @@ class Summary:
             f"# TYPE {self.name} summary"
         ]
 
+        name = self.name
         with self._lock:
+            # Quantiles are computed under the lock already held here; calling
+            # get_quantiles() would try to re-acquire it and deadlock
+            self._clean_old_observations()
+
             # Add quantile metrics
-            quantiles = self.get_quantiles()
+            quantiles = self._compute_quantiles(self._observations)
             for q in self.quantiles:
-                lines.append(f'{self.name}{{quantile="{q}"}} {quantiles.get(q, 0)}')
+                lines.append(f'{name}{{quantile="{q}"}} {quantiles.get(q, 0)}')
 
             # Add labeled quantile metrics
-            for label_key in self._labeled_observations.keys():
-                labels_dict = dict(label_key)
-                labeled_quantiles = self.get_quantiles(labels_dict)
+            for label_key, observations in self._labeled_observations.items():
+                label_prefix = _format_labels(label_key)
+                labeled_quantiles = self._compute_quantiles(observations)
                 for q in self.quantiles:
-                    labels_dict["quantile"] = str(q)
-                    label_str = ",".join(f'{k}="{v}"' for k, v in labels_dict.items())
-                    lines.append(f'{self.name}{{{label_str}}} {labeled_quantiles.get(q, 0)}')
+                    lines.append(f'{name}{{{label_prefix},quantile="{q}"}} {labeled_quantiles.get(q, 0)}')
 
             # Add count and sum
-            lines.append(f'{self.name}_count {self._count}')
-            lines.append(f'{self.name}_sum {self._sum}')
+            lines.append(f'{name}_count {self._count}')
+            lines.append(f'{name}_sum {self._sum}')
 
             # Add labeled count and sum
-            for label_key in self._labeled_count.keys():
-                labels_dict = dict(label_key)
-                label_str = ",".join(f'{k}="{v}"' for k, v in labels_dict.items())
-                lines.append(f'{self.name}_count{{{label_str}}} {self._labeled_count[label_key]}')
-                lines.append(f'{self.name}_sum{{{label_str}}} {self._labeled_sum[label_key]}')
+            for label_key, count in self._labeled_count.items():
+                label_str = _format_labels(label_key)
+                lines.append(f'{name}_count{{{label_str}}} {count}')
+                lines.append(f'{name}_sum{{{label_str}}} {self._labeled_sum[label_key]}')
 
         return "\n".join(lines)
 
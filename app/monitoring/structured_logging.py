@@ -3,7 +3,6 @@ Structured logging system for Taiwan Medical AI Assistant.
 Provides JSON-structured logging with correlation IDs and PDPA compliance.
 """
 
-import json
 import logging
 import threading
 import uuid
@@ -13,6 +12,18 @@ from contextlib import contextmanager
 import os
 import sys
 
+import orjson
+
+
+# orjson encodes datetimes/UUIDs natively; anything else falls back to str()
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+_STRUCTURED_EXTRA = {'structured': True}
+
+
+def _dumps(data: Dict[str, Any]) -> str:
+    """Serialize a log payload to a JSON string."""
+    return orjson.dumps(data, default=str, option=_ORJSON_OPTIONS).decode()
+
 
 class StructuredLogger:
     """JSON-structured logger with correlation ID support."""
@@ -43,6 +54,10 @@ class StructuredLogger:
 
     def _log(self, level: int, message: str, extra: Optional[Dict[str, Any]] = None):
         """Internal logging method with structured data."""
+        # Skip sanitization and encoding entirely for filtered-out levels
+        if not self.logger.isEnabledFor(level):
+            return
+
         log_data = {
             'timestamp': datetime.now().isoformat(),
             'level': logging.getLevelName(level),
@@ -57,7 +72,8 @@ class StructuredLogger:
             sanitized_extra = self._sanitize_data(extra)
             log_data.update(sanitized_extra)
 
-        self.logger.log(level, json.dumps(log_data, ensure_ascii=False))
+        # Values (e.g. datetimes) are encoded here, only for records that are emitted
+        self.logger.log(level, _dumps(log_data), extra=_STRUCTURED_EXTRA)
 
     def _sanitize_data(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Remove or hash potential PII from log data."""
@@ -114,11 +130,15 @@ class StructuredFormatter(logging.Formatter):
 
     def format(self, record):
         """Format log record as JSON."""
+        # Records from StructuredLogger are already JSON; no need to re-parse them
+        if getattr(record, 'structured', False):
+            return record.getMessage()
+
         # If the message is already JSON, return as-is
         try:
-            json.loads(record.getMessage())
+            orjson.loads(record.getMessage())
             return record.getMessage()
-        except (json.JSONDecodeError, ValueError):
+        except orjson.JSONDecodeError:
             # Not JSON, create structured format
             log_data = {
                 'timestamp': datetime.fromtimestamp(record.created).isoformat(),
@@ -133,7 +153,7 @@ class StructuredFormatter(logging.Formatter):
             if hasattr(record, 'correlation_id'):
                 log_data['correlation_id'] = record.correlation_id
 
-            return json.dumps(log_data, ensure_ascii=False)
+            return _dumps(log_data)
 
 
 # Global structured logger instance
@@ -3,6 +3,7 @@
 為每個 API 路由器添加台灣醫療特色的文件增強功能
 """
 
+from functools import lru_cache
 from typing import Dict, Any, List
 from fastapi import APIRouter
 from fastapi.openapi.models import Tag
@@ -292,12 +293,13 @@ def enhance_monitoring_router_docs(router: APIRouter) -> Dict[str, Any]:
     return enhanced_docs
 
 
+@lru_cache(maxsize=1)
 def create_enhanced_router_docs() -> Dict[str, Any]:
     """
     建立所有路由器的增強文件
 
     Returns:
-        Dict: 完整的增強文件字典
+        Dict: 完整的增強文件字典（只建立一次並共用，呼叫端不應修改）
     """
     return {
         "triage": enhance_triage_router_docs(None),
@@ -338,8 +340,9 @@ class TaiwanMedicalExampleGenerator:
     """台灣醫療 API 範例生成器"""
 
     @staticmethod
+    @lru_cache(maxsize=1)
     def generate_symptom_examples() -> Dict[str, Any]:
-        """生成症狀評估範例"""
+        """生成症狀評估範例（只建立一次並共用，呼叫端不應修改）"""
         return {
             "emergency_examples": [
                 {
@@ -366,8 +369,9 @@ class TaiwanMedicalExampleGenerator:
         }
 
     @staticmethod
+    @lru_cache(maxsize=1)
     def generate_hospital_examples() -> Dict[str, Any]:
-        """生成醫院搜尋範例"""
+        """生成醫院搜尋範例（只建立一次並共用，呼叫端不應修改）"""
         return {
             "major_cities": {
                 "台北市": {"lat": 25.0330, "lng": 121.5654, "famous_hospitals": ["台大醫院", "榮總", "馬偕醫院"]},
@@ -5,18 +5,40 @@
 """
 
 from typing import Optional, List, Dict, Any
+import importlib
 import time
 from fastapi import APIRouter, Query, HTTPException, Request
 from pydantic import BaseModel, field_validator, Field
-from app.services.geocoding import ip_geolocate, geocode_address, GeocodeResult
-from app.services.places import nearby_hospitals, format_hospital_results
+from app.services.geocoding import ip_geolocate_async, geocode_address_async, GeocodeResult
+from app.services.places import nearby_hospitals_async, format_hospital_results
 from app.services.nhia_registry import enhance_places_with_nhia_info
 from app.config import get_settings
-from app.domain.triage import TriageSystem
-from app.monitoring.metrics import metrics_collector
 
 router = APIRouter(prefix="/v1/hospitals", tags=["醫院搜尋"])
 
+# 延遲載入：僅在有症狀輸入時才匯入並建立，之後重複使用同一實例
+_TRIAGE_SYSTEM = None
+_METRICS_COLLECTOR = None
+
+
+def _get_triage_system():
+    """取得（延遲建立的）症狀分級系統實例"""
+    global _TRIAGE_SYSTEM
+    if _TRIAGE_SYSTEM is None:
+        triage_module = importlib.import_module("app.domain.triage")
+        _TRIAGE_SYSTEM = triage_module.TriageSystem()
+    return _TRIAGE_SYSTEM
+
+
+def _get_metrics_collector():
+    """取得（延遲匯入的）指標收集器"""
+    global _METRICS_COLLECTOR
+    if _METRICS_COLLECTOR is None:
+        metrics_module = importlib.import_module("app.monitoring.metrics")
+        _METRICS_COLLECTOR = metrics_module.metrics_collector
+    return _METRICS_COLLECTOR
+
+
 # Medical disclaimer constants
 MEDICAL_DISCLAIMERS = {
     "general": "⚠️ 本服務僅供參考，不能取代專業醫療診斷。如有緊急狀況，請立即撥打119。",
@@ -144,7 +166,8 @@ async def search_nearby_hospitals(
         # Task 23: Record metrics for symptom processing
         detection_start = time.time()
 
-        triage_system = TriageSystem()
+        triage_system = _get_triage_system()
+        metrics_collector = _get_metrics_collector()
         assessment = triage_system.assess_symptoms(symptoms)
 
         # Record red-flag detection timing
@@ -186,7 +209,7 @@ async def search_nearby_hospitals(
     # 第二優先：地址geocoding
     elif address:
         try:
-            geocode_result = geocode_address(address)
+            geocode_result = await geocode_address_async(address)
             if geocode_result:
                 search_center = {
                     "latitude": geocode_result.latitude,
@@ -208,7 +231,7 @@ async def search_nearby_hospitals(
     elif use_ip:
         client_ip = get_client_ip(request)
         try:
-            ip_result = ip_geolocate(client_ip)
+            ip_result = await ip_geolocate_async(client_ip)
             if ip_result:
                 search_center = {
                     "latitude": ip_result.latitude,
@@ -234,7 +257,7 @@ async def search_nearby_hospitals(
 
     # 搜尋附近醫院
     try:
-        places_results = nearby_hospitals(
+        places_results = await nearby_hospitals_async(
             lat=search_center["latitude"],
             lng=search_center["longitude"],
             radius=adjusted_radius,  # 使用調整後的半徑
@@ -244,17 +267,12 @@ async def search_nearby_hospitals(
         # 如果是緊急狀況，優先排序急診醫院
         if emergency_info and emergency_info.is_emergency:
             # 將含有"急診"的醫院排在前面
-            emergency_hospitals = []
-            regular_hospitals = []
-
-            for place in places_results:
-                if "急診" in place.name or "emergency" in getattr(place, 'types', []):
-                    emergency_hospitals.append(place)
-                else:
-                    regular_hospitals.append(place)
-
-            # 急診醫院在前，然後是一般醫院，都按距離排序
-            places_results = emergency_hospitals + regular_hospitals
+            # 穩定排序：急診醫院在前，然後是一般醫院，各自維持原本的距離順序
+            places_results.sort(
+                key=lambda place: not (
+                    "急診" in place.name or "emergency" in getattr(place, 'types', [])
+                )
+            )
 
         # 增強健保資訊（可選）
         if include_nhia:
@@ -4,7 +4,8 @@
 """
 
 from datetime import datetime, timezone
-from typing import List, Dict, Any
+from functools import lru_cache
+from typing import List, Dict, Any, Tuple
 from fastapi import APIRouter, Response
 from pydantic import BaseModel
 from app.config import get_settings
@@ -31,6 +32,20 @@ class EmergencyResponse(BaseModel):
     usage_notes: List[str]
 
 
+@lru_cache(maxsize=1)
+def _get_emergency_number_models() -> Tuple[EmergencyNumber, ...]:
+    """
+    建立急救號碼模型（只驗證一次）
+
+    急救號碼詳細資訊為固定資料，首次請求時建立後即重複使用，
+    避免每次請求重新執行 Pydantic 驗證。
+    """
+    settings = get_settings()
+    return tuple(
+        EmergencyNumber(**detail) for detail in settings.emergency_numbers_detail
+    )
+
+
 @router.get("/emergency",
            summary="取得台灣急救熱線資訊",
            description="取得台灣地區的急救、報案、諮詢熱線號碼與使用說明",
@@ -52,15 +67,11 @@ async def get_emergency_numbers(response: Response) -> EmergencyResponse:
         - 所有號碼均為24小時服務
         - 緊急情況請優先撥打 119 或 110
     """
-    settings = get_settings()
-
     # 設定快取標頭（急救號碼資訊相對穩定）
     response.headers["Cache-Control"] = "public, max-age=3600"  # 1小時快取
 
-    # 取得急救號碼詳細資訊
-    emergency_numbers = [
-        EmergencyNumber(**detail) for detail in settings.emergency_numbers_detail
-    ]
+    # 取得急救號碼詳細資訊（預先建立的模型）
+    emergency_numbers = list(_get_emergency_number_models())
 
     # 建構回應
     emergency_response = EmergencyResponse(
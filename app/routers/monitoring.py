@@ -4,17 +4,23 @@ Provides health checks, metrics, audit trails, and dashboard data.
 """
 
 import asyncio
+import fnmatch
+import functools
+import hashlib
+import re
+import time
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional, Union
+from functools import lru_cache
+from typing import Dict, List, Any, Optional, Tuple, Union
+import orjson
 from fastapi import APIRouter, HTTPException, Depends, Query, Request, Response
-from fastapi.responses import PlainTextResponse, JSONResponse
+from fastapi.responses import PlainTextResponse, JSONResponse, StreamingResponse
 from pydantic import BaseModel, Field
 
 from app.monitoring.health import health_checker, HealthStatus
-from app.monitoring.metrics import metrics_collector
+from app.monitoring.metrics import metrics_collector, MetricType
 from app.monitoring.audit import (
-    AuditTrail, ComplianceReporter, DataRetentionManager,
-    EncryptedAuditStorage, AuditEventType
+    AuditTrail, ComplianceReporter, EncryptedAuditStorage, AuditEventType
 )
 from app.monitoring.structured_logging import structured_logger
 
@@ -69,6 +75,20 @@ class DashboardResponse(BaseModel):
     system_status: Dict[str, Any]
 
 
+class RealtimeDashboardResponse(BaseModel):
+    timestamp: str
+    health_status: str
+    active_connections: int
+    current_load: Dict[str, Union[int, float]]
+
+
+class PerformanceMetricsResponse(BaseModel):
+    api_performance: Dict[str, Any]
+    external_services: Dict[str, Dict[str, Union[int, float]]]
+    system_resources: Dict[str, Union[int, float]]
+    time_range: Optional[Dict[str, str]] = None
+
+
 class AlertRule(BaseModel):
     name: str
     condition: str
@@ -94,6 +114,16 @@ class AnonymizationRequest(BaseModel):
     anonymization_level: str
 
 
+class BatchRequestItem(BaseModel):
+    id: str
+    path: str
+    params: Dict[str, str] = Field(default_factory=dict)
+
+
+class BatchRequest(BaseModel):
+    requests: List[BatchRequestItem] = Field(..., min_length=1, max_length=20)
+
+
 # Router setup
 router = APIRouter(
     prefix="/v1/monitoring",
@@ -105,18 +135,161 @@ router = APIRouter(
 )
 
 
-# Initialize monitoring components
-audit_storage = EncryptedAuditStorage(
-    encryption_key="taiwan_medical_audit_encryption_key_32",
-    storage_path="/tmp/audit_logs"
-)
-audit_trail = AuditTrail(audit_storage)
-compliance_reporter = ComplianceReporter(audit_storage)
-retention_manager = DataRetentionManager(audit_storage)
+# Monitoring components are created on first use (not at import) so workers
+# and tests that never touch audit endpoints skip the storage and key setup
+@lru_cache(maxsize=1)
+def get_audit_storage() -> EncryptedAuditStorage:
+    """Shared encrypted audit storage (dependency)."""
+    return EncryptedAuditStorage(
+        encryption_key="taiwan_medical_audit_encryption_key_32",
+        storage_path="/tmp/audit_logs"
+    )
+
+
+@lru_cache(maxsize=1)
+def get_audit_trail_service() -> AuditTrail:
+    """Shared audit trail over the audit storage (dependency)."""
+    return AuditTrail(get_audit_storage())
+
+
+@lru_cache(maxsize=1)
+def get_compliance_reporter() -> ComplianceReporter:
+    """Shared compliance reporter over the audit storage (dependency)."""
+    return ComplianceReporter(get_audit_storage())
+
+
+# Number of data points per series in dashboard trends
+TREND_DATA_POINTS = 60
+
+# Rendered Prometheus output shared by concurrent scrapers:
+# (format, type, name_pattern) -> (rendered_at, body)
+METRICS_CACHE_TTL_SECONDS = 2.0
+_metrics_cache: Dict[Tuple[str, Optional[str], Optional[str]], Tuple[float, bytes]] = {}
+_metrics_cache_lock = asyncio.Lock()
+
+
+# Summary health results shared by /health and /dashboard bursts
+HEALTH_CACHE_TTL_SECONDS = 5.0
+_health_cache: Optional[Tuple[float, Dict[str, Any]]] = None
+_health_cache_lock = asyncio.Lock()
+
+
+async def _get_cached_health() -> Dict[str, Any]:
+    """Return summary health data, re-running the checks at most every TTL."""
+    global _health_cache
+
+    if _health_cache and time.monotonic() - _health_cache[0] < HEALTH_CACHE_TTL_SECONDS:
+        return _health_cache[1]
+
+    async with _health_cache_lock:
+        # Another request may have refreshed the cache while we waited
+        if _health_cache and time.monotonic() - _health_cache[0] < HEALTH_CACHE_TTL_SECONDS:
+            return _health_cache[1]
+
+        health_data = await health_checker.check_health()
+        _health_cache = (time.monotonic(), health_data)
+        return health_data
+
+
+# ISO timestamp cached per wall-clock second, shared by handlers that stamp responses
+_now_iso_cache: Tuple[int, str] = (-1, "")
+
+
+def _now_iso() -> str:
+    """Return the current local time as ISO 8601, formatted at most once per second."""
+    global _now_iso_cache
+    second = int(time.time())
+    cached_second, cached_iso = _now_iso_cache
+    if cached_second != second:
+        cached_iso = datetime.now().isoformat()
+        _now_iso_cache = (second, cached_iso)
+    return cached_iso
+
+
+# Conditional-GET caching for read-only dashboard endpoints
+DASHBOARD_CACHE_CONTROL = "max-age=5, must-revalidate"
+
+
+def _encode_with_etag(data: Dict[str, Any]) -> Tuple[bytes, str]:
+    """Serialize data and derive its strong ETag."""
+    body = orjson.dumps(data)
+    return body, f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def _etag_response(body: bytes, etag: str, request: Request) -> Response:
+    """Answer with a pre-encoded body, or 304 if the client's ETag still matches."""
+    headers = {"ETag": etag, "Cache-Control": DASHBOARD_CACHE_CONTROL}
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and etag in (tag.strip() for tag in if_none_match.split(",")):
+        return Response(status_code=304, headers=headers)
+
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def _encode_audit_value(value: Any) -> Any:
+    """orjson fallback for AuditEvent fields it cannot serialize natively."""
+    if isinstance(value, BaseException):
+        return str(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def _get_cached_metrics(cache_key: Tuple[str, Optional[str], Optional[str]]) -> Optional[bytes]:
+    """Return cached metrics output if it is still within the TTL."""
+    cached = _metrics_cache.get(cache_key)
+    if cached and time.monotonic() - cached[0] < METRICS_CACHE_TTL_SECONDS:
+        return cached[1]
+    return None
+
+
+def logged_endpoint(fail_msg: str, fail_detail: Optional[str] = None,
+                    success_msg: Optional[str] = None):
+    """
+    Wrap a handler in the shared logging and error-conversion path.
+
+    HTTPExceptions raised by the handler pass through unchanged; any other
+    exception is logged as ``fail_msg`` and turned into a 500 carrying
+    ``fail_detail`` (defaults to ``fail_msg``). ``success_msg``, when given,
+    is logged after the handler returns.
+    """
+    detail = fail_detail or fail_msg
+
+    def decorator(func):
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                try:
+                    result = await func(*args, **kwargs)
+                except HTTPException:
+                    raise
+                except Exception as e:
+                    structured_logger.error(fail_msg, error=str(e))
+                    raise HTTPException(status_code=500, detail=detail)
+                if success_msg:
+                    structured_logger.info(success_msg)
+                return result
+        else:
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                try:
+                    result = func(*args, **kwargs)
+                except HTTPException:
+                    raise
+                except Exception as e:
+                    structured_logger.error(fail_msg, error=str(e))
+                    raise HTTPException(status_code=500, detail=detail)
+                if success_msg:
+                    structured_logger.info(success_msg)
+                return result
+
+        return wrapper
+
+    return decorator
 
 
 # Health monitoring endpoints
 @router.get("/health", response_model=HealthCheckResponse)
+@logged_endpoint("Health check failed")
 async def get_health_status(
     include_details: bool = Query(False, description="Include detailed health information"),
     timeout: int = Query(30, description="Health check timeout in seconds")
@@ -129,27 +302,25 @@ async def get_health_status(
     - Individual service health checks
     - System information (if details requested)
     """
-    try:
-        health_data = await health_checker.check_health(include_details=include_details)
+    if include_details:
+        health_data = await health_checker.check_health(include_details=True)
+    else:
+        health_data = await _get_cached_health()
 
-        # Determine HTTP status code based on health
-        status_code = 200
-        if health_data["status"] == HealthStatus.UNHEALTHY.value:
-            status_code = 503
-        elif health_data["status"] == HealthStatus.DEGRADED.value:
-            status_code = 200  # Still considered OK, but degraded
+    # Determine HTTP status code based on health
+    status_code = 200
+    if health_data["status"] == HealthStatus.UNHEALTHY.value:
+        status_code = 503
+    elif health_data["status"] == HealthStatus.DEGRADED.value:
+        status_code = 200  # Still considered OK, but degraded
 
-        structured_logger.info(
-            "Health check completed",
-            status=health_data["status"],
-            services_checked=len(health_data["checks"])
-        )
+    structured_logger.info(
+        "Health check completed",
+        status=health_data["status"],
+        services_checked=len(health_data["checks"])
+    )
 
-        return JSONResponse(content=health_data, status_code=status_code)
-
-    except Exception as e:
-        structured_logger.error("Health check failed", error=str(e))
-        raise HTTPException(status_code=500, detail="Health check failed")
+    return JSONResponse(content=health_data, status_code=status_code)
 
 
 @router.get("/health/{service_name}")
@@ -190,7 +361,43 @@ async def get_health_history(
 
 
 # Metrics endpoints
+def _match_no_metrics(name: str) -> bool:
+    """Metric filter that rejects every metric."""
+    return False
+
+
+def _render_prometheus_metrics(type: Optional[str], name_pattern: Optional[str]) -> bytes:
+    """Collect fresh system metrics and render them in Prometheus format (blocking)."""
+    metrics_collector.collect_system_metrics()
+
+    metric_filter = None
+    if type:
+        try:
+            target_type = MetricType(type)
+        except ValueError:
+            # Unknown metric type matches nothing
+            metric_filter = _match_no_metrics
+        else:
+            metric_filter = (
+                lambda name, registry=metrics_collector.registry, target=target_type:
+                (metric := registry.get_metric(name)) is not None
+                and metric.metric_type is target
+            )
+    elif name_pattern:
+        # Compile the glob once instead of per metric name
+        metric_filter = re.compile(fnmatch.translate(name_pattern)).match
+
+    return metrics_collector.get_prometheus_output(metric_filter=metric_filter).encode("utf-8")
+
+
+def _collect_metrics_json() -> Dict[str, Any]:
+    """Collect fresh system metrics and snapshot them as JSON-ready data (blocking)."""
+    metrics_collector.collect_system_metrics()
+    return metrics_collector.get_metrics_json()
+
+
 @router.get("/metrics")
+@logged_endpoint("Metrics export failed")
 async def get_metrics(
     format: str = Query("prometheus", pattern="^(prometheus|json)$"),
     type: Optional[str] = Query(None, description="Filter by metric type"),
@@ -201,120 +408,199 @@ async def get_metrics(
 
     Supports filtering by metric type and name patterns.
     """
-    try:
-        # Collect fresh system metrics
-        metrics_collector.collect_system_metrics()
-
-        if format == "prometheus":
-            metric_filter = None
-            if type:
-                metric_filter = lambda name: any(
-                    metric.metric_type.value == type
-                    for metric in [metrics_collector.registry.get_metric(name)]
-                    if metric
-                )
-            elif name_pattern:
-                import fnmatch
-                metric_filter = lambda name: fnmatch.fnmatch(name, name_pattern)
-
-            output = metrics_collector.get_prometheus_output(metric_filter=metric_filter)
-
-            structured_logger.info(
-                "Prometheus metrics exported",
-                format=format,
-                filter_type=type,
-                pattern=name_pattern
-            )
+    if format == "prometheus":
+        cache_key = (format, type, name_pattern)
+        output = _get_cached_metrics(cache_key)
+        if output is None:
+            async with _metrics_cache_lock:
+                # Another scraper may have rendered while we waited
+                output = _get_cached_metrics(cache_key)
+                if output is None:
+                    # psutil probes and rendering are blocking; run them off the loop
+                    output = await asyncio.to_thread(_render_prometheus_metrics, type, name_pattern)
+                    _metrics_cache[cache_key] = (time.monotonic(), output)
 
-            return PlainTextResponse(
-                content=output,
-                media_type="text/plain; charset=utf-8"
-            )
-        else:
-            metrics_data = metrics_collector.get_metrics_json()
-
-            structured_logger.info("JSON metrics exported", format=format)
-            return metrics_data
+        structured_logger.info(
+            "Prometheus metrics exported",
+            format=format,
+            filter_type=type,
+            pattern=name_pattern
+        )
 
-    except Exception as e:
-        structured_logger.error("Metrics export failed", error=str(e))
-        raise HTTPException(status_code=500, detail="Metrics export failed")
+        return PlainTextResponse(
+            content=output,
+            media_type="text/plain; charset=utf-8"
+        )
+    else:
+        metrics_data = await asyncio.to_thread(_collect_metrics_json)
+
+        structured_logger.info("JSON metrics exported", format=format)
+        return metrics_data
+
+
+# Static response payloads, built (and where possible encoded) once at import
+BUSINESS_METRICS_BODY = orjson.dumps({
+    "triage_requests": {
+        "total": 0,
+        "by_level": {},
+        "avg_response_time_ms": 0
+    },
+    "hospital_searches": {
+        "total": 0,
+        "by_type": {},
+        "avg_results_count": 0
+    },
+    "emergency_escalations": {
+        "total": 0,
+        "by_type": {}
+    }
+})
+
+PERFORMANCE_METRICS_TEMPLATE = {
+    "api_performance": {
+        "request_duration": {"p50": 0, "p95": 0, "p99": 0},
+        "request_rate": 0,
+        "error_rate": 0
+    },
+    "external_services": {
+        "google_places": {"avg_response_time": 0, "error_rate": 0},
+        "geocoding": {"avg_response_time": 0, "error_rate": 0}
+    },
+    "system_resources": {
+        "cpu_usage": 0,
+        "memory_usage": 0,
+        "disk_usage": 0
+    }
+}
 
 
 @router.get("/metrics/business")
+@logged_endpoint("Business metrics export failed", success_msg="Business metrics exported")
 async def get_business_metrics():
     """Get business-specific metrics."""
-    try:
-        business_data = {
-            "triage_requests": {
-                "total": 0,
-                "by_level": {},
-                "avg_response_time_ms": 0
-            },
-            "hospital_searches": {
-                "total": 0,
-                "by_type": {},
-                "avg_results_count": 0
-            },
-            "emergency_escalations": {
-                "total": 0,
-                "by_type": {}
-            }
-        }
+    return Response(content=BUSINESS_METRICS_BODY, media_type="application/json")
 
-        structured_logger.info("Business metrics exported")
-        return business_data
 
-    except Exception as e:
-        structured_logger.error("Business metrics export failed", error=str(e))
-        raise HTTPException(status_code=500, detail="Business metrics export failed")
-
-
-@router.get("/metrics/performance")
+@router.get("/metrics/performance", response_model=PerformanceMetricsResponse,
+            response_model_exclude_none=True)
+@logged_endpoint("Performance metrics export failed", success_msg="Performance metrics exported")
 async def get_performance_metrics(
     start_time: Optional[datetime] = Query(None, description="Start time for metrics"),
     end_time: Optional[datetime] = Query(None, description="End time for metrics")
 ):
     """Get performance metrics with optional time range."""
-    try:
-        perf_data = {
-            "api_performance": {
-                "request_duration": {"p50": 0, "p95": 0, "p99": 0},
-                "request_rate": 0,
-                "error_rate": 0
-            },
-            "external_services": {
-                "google_places": {"avg_response_time": 0, "error_rate": 0},
-                "geocoding": {"avg_response_time": 0, "error_rate": 0}
-            },
-            "system_resources": {
-                "cpu_usage": 0,
-                "memory_usage": 0,
-                "disk_usage": 0
-            }
+    # Shallow copy: only the top level gains a per-request key
+    perf_data = dict(PERFORMANCE_METRICS_TEMPLATE)
+
+    if start_time and end_time:
+        perf_data["time_range"] = {
+            "start": start_time.isoformat(),
+            "end": end_time.isoformat()
         }
 
-        if start_time and end_time:
-            perf_data["time_range"] = {
-                "start": start_time.isoformat(),
-                "end": end_time.isoformat()
-            }
+    return perf_data
 
-        structured_logger.info("Performance metrics exported")
-        return perf_data
 
-    except Exception as e:
-        structured_logger.error("Performance metrics export failed", error=str(e))
-        raise HTTPException(status_code=500, detail="Performance metrics export failed")
+METRICS_STREAM_INTERVAL_SECONDS = 5
+
+
+class MetricsBroadcaster:
+    """Fan out one encoded metrics snapshot per tick to every SSE subscriber.
+
+    A single background task serializes the metrics once per interval and wakes
+    all subscribers through a shared event, so encoding cost does not grow with
+    the number of connected dashboards.
+    """
+
+    def __init__(self, interval: float = METRICS_STREAM_INTERVAL_SECONDS):
+        self.interval = interval
+        self._payload = b""
+        self._tick: Optional[asyncio.Event] = None
+        self._tick_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+        self._subscribers = 0
+
+    @staticmethod
+    def _encode() -> bytes:
+        return b"data: " + orjson.dumps(metrics_collector.get_metrics_json()) + b"\n\n"
+
+    def _ensure_running(self):
+        task = self._task
+        loop = asyncio.get_running_loop()
+        if task is None or task.done() or task.get_loop() is not loop:
+            self._payload = self._encode()
+            # Keep one event per loop so subscribers waiting on it are never stranded
+            if self._tick is None or self._tick_loop is not loop:
+                self._tick = asyncio.Event()
+                self._tick_loop = loop
+            self._tick.clear()
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self):
+        try:
+            while True:
+                await asyncio.sleep(self.interval)
+                if not self._subscribers:
+                    return
+                try:
+                    self._payload = self._encode()
+                except Exception as e:
+                    # Keep the previous snapshot and retry on the next tick
+                    structured_logger.error("Metrics stream snapshot failed", error=str(e))
+                    continue
+                self._tick.set()
+                self._tick.clear()
+        finally:
+            if self._task is asyncio.current_task():
+                self._task = None
+            # Leave the event set so current and late waiters see no fresh
+            # snapshot and close, rather than blocking forever
+            self._tick.set()
+
+    async def subscribe(self):
+        """Yield SSE frames: the latest snapshot immediately, then one per tick."""
+        self._subscribers += 1
+        try:
+            self._ensure_running()
+            last = self._payload
+            yield last
+            while True:
+                # Only wait if this subscriber has already sent the latest snapshot
+                if self._payload is last:
+                    await self._tick.wait()
+                    if self._payload is last:
+                        # Woken without a new snapshot: the broadcaster stopped
+                        return
+                last = self._payload
+                yield last
+        finally:
+            self._subscribers -= 1
+
+
+metrics_broadcaster = MetricsBroadcaster()
 
 
 @router.get("/metrics/stream")
-async def get_realtime_metrics():
-    """Get real-time metrics stream data."""
+def get_realtime_metrics(request: Request):
+    """
+    Get real-time metrics stream data.
+
+    Clients sending ``Accept: text/event-stream`` receive a Server-Sent Events
+    stream with one metrics snapshot every ``update_interval_seconds``; other
+    clients get a single JSON snapshot for polling.
+    """
+    if "text/event-stream" in request.headers.get("accept", ""):
+        structured_logger.info("Real-time metrics stream subscribed")
+        return StreamingResponse(
+            metrics_broadcaster.subscribe(),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache"}
+        )
+
     try:
         stream_data = {
             "current_metrics": metrics_collector.get_metrics_json(),
-            "update_interval_seconds": 5,
+            "update_interval_seconds": METRICS_STREAM_INTERVAL_SECONDS,
             "stream_id": "metrics_stream_001"
         }
 
@@ -328,68 +614,72 @@ async def get_realtime_metrics():
 
 # Audit logging endpoints
 @router.get("/audit/events", response_model=AuditEventResponse)
+@logged_endpoint("Audit events query failed")
 async def get_audit_events(
     start_time: Optional[datetime] = Query(None, description="Start time for events"),
     end_time: Optional[datetime] = Query(None, description="End time for events"),
     event_type: Optional[str] = Query(None, description="Filter by event type"),
     correlation_id: Optional[str] = Query(None, description="Filter by correlation ID"),
-    limit: int = Query(100, le=1000, description="Maximum number of events to return")
+    limit: int = Query(100, le=1000, description="Maximum number of events to return"),
+    audit_trail: AuditTrail = Depends(get_audit_trail_service)
 ):
     """
     Query audit events with filtering options.
 
     Requires admin privileges for access.
     """
-    try:
-        # Convert event type string to enum if provided
-        event_type_enum = None
-        if event_type:
-            try:
-                event_type_enum = AuditEventType(event_type)
-            except ValueError:
-                raise HTTPException(status_code=400, detail=f"Invalid event type: {event_type}")
-
-        # Query events
-        events = await audit_trail.storage_backend.query_events(
-            start_time=start_time,
-            end_time=end_time,
-            event_type=event_type_enum,
-            correlation_id=correlation_id,
-            limit=limit
-        )
-
-        # Convert to dictionaries for response
-        event_dicts = [event.to_dict() for event in events]
-
-        response_data = {
-            "events": event_dicts,
-            "total_count": len(event_dicts),
+    # Convert event type string to enum if provided
+    event_type_enum = None
+    if event_type:
+        try:
+            event_type_enum = AuditEventType(event_type)
+        except ValueError:
+            raise HTTPException(status_code=400, detail=f"Invalid event type: {event_type}")
+
+    # Query events
+    events = await audit_trail.storage_backend.query_events(
+        start_time=start_time,
+        end_time=end_time,
+        event_type=event_type_enum,
+        correlation_id=correlation_id,
+        limit=limit
+    )
+
+    # Serialize the AuditEvent dataclasses directly in orjson; this yields the
+    # same JSON as AuditEvent.to_dict() without building intermediate dicts
+    response_body = orjson.dumps(
+        {
+            "events": events,
+            "total_count": len(events),
             "page_info": {
                 "limit": limit,
-                "has_more": len(event_dicts) == limit
+                "has_more": len(events) == limit
             }
+        },
+        default=_encode_audit_value
+    )
+
+    structured_logger.info(
+        "Audit events queried",
+        event_count=len(events),
+        # Datetimes are passed raw; the logger's orjson encoder formats them
+        # only when the record is actually emitted
+        filters={
+            "start_time": start_time,
+            "end_time": end_time,
+            "event_type": event_type,
+            "correlation_id": correlation_id
         }
+    )
 
-        structured_logger.info(
-            "Audit events queried",
-            event_count=len(event_dicts),
-            filters={
-                "start_time": start_time.isoformat() if start_time else None,
-                "end_time": end_time.isoformat() if end_time else None,
-                "event_type": event_type,
-                "correlation_id": correlation_id
-            }
-        )
-
-        return response_data
-
-    except Exception as e:
-        structured_logger.error("Audit events query failed", error=str(e))
-        raise HTTPException(status_code=500, detail="Audit events query failed")
+    return Response(content=response_body, media_type="application/json")
 
 
 @router.get("/audit/trail/{correlation_id}")
-async def get_audit_trail(correlation_id: str):
+async def get_audit_trail(
+    correlation_id: str,
+    audit_trail: AuditTrail = Depends(get_audit_trail_service)
+):
     """Get complete audit trail for a correlation ID."""
     try:
         trail_summary = await audit_trail.generate_trail_summary(correlation_id)
@@ -397,16 +687,6 @@ async def get_audit_trail(correlation_id: str):
         if "error" in trail_summary:
             raise HTTPException(status_code=404, detail=trail_summary["error"])
 
-        # Add timeline reconstruction
-        trail_summary["timeline"] = []
-        for event in trail_summary.get("events", []):
-            trail_summary["timeline"].append({
-                "timestamp": event["timestamp"],
-                "action": event["action"],
-                "resource": event["resource"],
-                "details": event.get("details", {})
-            })
-
         structured_logger.info("Audit trail generated", correlation_id=correlation_id)
         return trail_summary
 
@@ -418,403 +698,409 @@ async def get_audit_trail(correlation_id: str):
 
 
 @router.get("/audit/compliance/pdpa", response_model=ComplianceReportResponse)
-async def get_pdpa_compliance_report():
+@logged_endpoint("PDPA compliance report failed", success_msg="PDPA compliance report generated")
+async def get_pdpa_compliance_report(
+    compliance_reporter: ComplianceReporter = Depends(get_compliance_reporter)
+):
     """Get PDPA compliance report."""
-    try:
-        end_date = datetime.now()
-        start_date = end_date - timedelta(days=30)  # Last 30 days
-
-        report = await compliance_reporter.generate_pdpa_report(start_date, end_date)
-
-        # Format response
-        response_data = {
-            "report_period": {
-                "start": start_date.isoformat(),
-                "end": end_date.isoformat()
-            },
-            "data_processing_events": report.get("data_processing_events", 0),
-            "consent_events": 0,  # Would be calculated from actual data
-            "retention_compliance": {"compliant": True},
-            "legal_basis_breakdown": {"consent": 100},
-            "data_subject_rights_requests": 0
-        }
-
-        structured_logger.info("PDPA compliance report generated")
-        return response_data
+    end_date = datetime.now()
+    start_date = end_date - timedelta(days=30)  # Last 30 days
+
+    report = await compliance_reporter.generate_pdpa_report(start_date, end_date)
+
+    # Format response
+    response_data = {
+        "report_period": {
+            "start": start_date.isoformat(),
+            "end": end_date.isoformat()
+        },
+        "data_processing_events": report.get("data_processing_events", 0),
+        "consent_events": 0,  # Would be calculated from actual data
+        "retention_compliance": {"compliant": True},
+        "legal_basis_breakdown": {"consent": 100},
+        "data_subject_rights_requests": 0
+    }
 
-    except Exception as e:
-        structured_logger.error("PDPA compliance report failed", error=str(e))
-        raise HTTPException(status_code=500, detail="PDPA compliance report failed")
+    return response_data
 
 
 @router.get("/audit/security", response_model=SecurityReportResponse)
-async def get_security_audit_report():
+@logged_endpoint("Security audit report failed", success_msg="Security audit report generated")
+async def get_security_audit_report(
+    compliance_reporter: ComplianceReporter = Depends(get_compliance_reporter)
+):
     """Get security audit report."""
-    try:
-        end_date = datetime.now()
-        start_date = end_date - timedelta(days=7)  # Last 7 days
-
-        report = await compliance_reporter.generate_security_report(start_date, end_date)
-
-        response_data = {
-            "authentication_events": {
-                "total": 0,
-                "successful": 0,
-                "failed": report.get("failed_authentication_attempts", 0)
-            },
-            "authorization_events": {
-                "total": 0,
-                "permitted": 0,
-                "denied": 0
-            },
-            "security_incidents": report.get("security_incidents", []),
-            "rate_limiting_events": report.get("rate_limiting_events", 0)
-        }
-
-        structured_logger.info("Security audit report generated")
-        return response_data
+    end_date = datetime.now()
+    start_date = end_date - timedelta(days=7)  # Last 7 days
+
+    report = await compliance_reporter.generate_security_report(start_date, end_date)
+
+    response_data = {
+        "authentication_events": {
+            "total": 0,
+            "successful": 0,
+            "failed": report.get("failed_authentication_attempts", 0)
+        },
+        "authorization_events": {
+            "total": 0,
+            "permitted": 0,
+            "denied": 0
+        },
+        "security_incidents": report.get("security_incidents", []),
+        "rate_limiting_events": report.get("rate_limiting_events", 0)
+    }
 
-    except Exception as e:
-        structured_logger.error("Security audit report failed", error=str(e))
-        raise HTTPException(status_code=500, detail="Security audit report failed")
+    return response_data
 
 
 @router.get("/audit/retention/status", response_model=RetentionStatusResponse)
-async def get_retention_status():
+@logged_endpoint("Retention status check failed", success_msg="Retention status checked")
+async def get_retention_status(
+    compliance_reporter: ComplianceReporter = Depends(get_compliance_reporter)
+):
     """Get audit data retention status."""
-    try:
-        # Get retention compliance status
-        compliance_status = await compliance_reporter.validate_data_retention_compliance(7)
-
-        response_data = {
-            "current_retention_days": 7,
-            "total_events": 0,  # Would be calculated from actual data
-            "oldest_event_date": None,
-            "expired_events_count": compliance_status.get("expired_events_count", 0)
-        }
-
-        structured_logger.info("Retention status checked")
-        return response_data
+    # Get retention compliance status
+    compliance_status = await compliance_reporter.validate_data_retention_compliance(7)
+
+    response_data = {
+        "current_retention_days": 7,
+        "total_events": 0,  # Would be calculated from actual data
+        "oldest_event_date": None,
+        "expired_events_count": compliance_status.get("expired_events_count", 0)
+    }
 
-    except Exception as e:
-        structured_logger.error("Retention status check failed", error=str(e))
-        raise HTTPException(status_code=500, detail="Retention status check failed")
+    return response_data
 
 
 @router.post("/audit/anonymize")
+@logged_endpoint("Audit data anonymization failed")
 async def anonymize_audit_data(request: AnonymizationRequest):
     """Anonymize audit data older than specified days."""
-    try:
-        # This would implement actual anonymization logic
-        anonymization_data = {
-            "anonymized_events_count": 0,
-            "anonymization_timestamp": datetime.now().isoformat(),
-            "anonymization_level": request.anonymization_level
-        }
-
-        structured_logger.info(
-            "Audit data anonymization completed",
-            older_than_days=request.older_than_days,
-            level=request.anonymization_level
-        )
+    # This would implement actual anonymization logic
+    anonymization_data = {
+        "anonymized_events_count": 0,
+        "anonymization_timestamp": _now_iso(),
+        "anonymization_level": request.anonymization_level
+    }
 
-        return anonymization_data
+    structured_logger.info(
+        "Audit data anonymization completed",
+        older_than_days=request.older_than_days,
+        level=request.anonymization_level
+    )
 
-    except Exception as e:
-        structured_logger.error("Audit data anonymization failed", error=str(e))
-        raise HTTPException(status_code=500, detail="Audit data anonymization failed")
+    return anonymization_data
 
 
 # Dashboard endpoints
+DASHBOARD_SUMMARY_TEMPLATE = {
+    "key_metrics": {
+        "requests_per_minute": 0,
+        "avg_response_time_ms": 0,
+        "error_rate_percent": 0,
+        "active_users": 0
+    },
+    "recent_alerts": [],
+    "system_status": {
+        "uptime_seconds": 0,
+        "version": "1.0.0",
+        "environment": "production"
+    }
+}
+
+# Static dashboard payloads, pre-encoded together with their ETags
+DASHBOARD_ALERTS_BODY = _encode_with_etag({
+    "active_alerts": [],
+    "alert_history": [],
+    "alert_summary": {
+        "total_active": 0,
+        "critical": 0,
+        "warning": 0,
+        "info": 0
+    }
+})
+
+SERVICE_MAP_BODY = _encode_with_etag({
+    "services": [
+        {"name": "api_gateway", "status": "healthy", "type": "gateway"},
+        {"name": "triage_service", "status": "healthy", "type": "service"},
+        {"name": "hospital_search", "status": "healthy", "type": "service"},
+        {"name": "google_places", "status": "healthy", "type": "external"},
+        {"name": "database", "status": "healthy", "type": "storage"}
+    ],
+    "dependencies": [
+        {"from": "api_gateway", "to": "triage_service"},
+        {"from": "api_gateway", "to": "hospital_search"},
+        {"from": "hospital_search", "to": "google_places"},
+        {"from": "triage_service", "to": "database"}
+    ],
+    "health_status": "healthy"
+})
+
+DASHBOARD_CONFIG_BODY = _encode_with_etag({
+    "refresh_intervals": {
+        "health_check": 30,
+        "metrics": 60,
+        "alerts": 10
+    },
+    "alert_thresholds": {
+        "response_time_ms": 1000,
+        "error_rate_percent": 5,
+        "cpu_usage_percent": 80
+    },
+    "display_preferences": {
+        "theme": "light",
+        "timezone": "Asia/Taipei",
+        "language": "zh-TW"
+    }
+})
+
+ALERT_RULES_BODY = _encode_with_etag({
+    "rules": [],
+    "total_count": 0
+})
+
+
 @router.get("/dashboard", response_model=DashboardResponse)
+@logged_endpoint("Dashboard summary failed", success_msg="Dashboard summary generated")
 async def get_dashboard_summary():
     """Get monitoring dashboard summary."""
-    try:
-        # Get health status
-        health_data = await health_checker.check_health()
+    # Get health status
+    health_data = await _get_cached_health()
 
-        dashboard_data = {
-            "overall_health": health_data["status"],
-            "key_metrics": {
-                "requests_per_minute": 0,
-                "avg_response_time_ms": 0,
-                "error_rate_percent": 0,
-                "active_users": 0
-            },
-            "recent_alerts": [],
-            "system_status": {
-                "uptime_seconds": 0,
-                "version": "1.0.0",
-                "environment": "production"
-            }
-        }
-
-        structured_logger.info("Dashboard summary generated")
-        return dashboard_data
+    dashboard_data = {**DASHBOARD_SUMMARY_TEMPLATE, "overall_health": health_data["status"]}
 
-    except Exception as e:
-        structured_logger.error("Dashboard summary failed", error=str(e))
-        raise HTTPException(status_code=500, detail="Dashboard summary failed")
+    return dashboard_data
 
 
-@router.get("/dashboard/realtime")
+@router.get("/dashboard/realtime", response_model=RealtimeDashboardResponse)
+@logged_endpoint("Real-time dashboard failed", success_msg="Real-time dashboard accessed")
 async def get_realtime_dashboard():
     """Get real-time dashboard status."""
-    try:
-        realtime_data = {
-            "timestamp": datetime.now().isoformat(),
-            "health_status": "healthy",
-            "active_connections": 0,
-            "current_load": {
-                "cpu_percent": 0,
-                "memory_percent": 0,
-                "requests_per_second": 0
-            }
+    realtime_data = {
+        "timestamp": _now_iso(),
+        "health_status": "healthy",
+        "active_connections": 0,
+        "current_load": {
+            "cpu_percent": 0,
+            "memory_percent": 0,
+            "requests_per_second": 0
         }
+    }
 
-        structured_logger.info("Real-time dashboard accessed")
-        return realtime_data
-
-    except Exception as e:
-        structured_logger.error("Real-time dashboard failed", error=str(e))
-        raise HTTPException(status_code=500, detail="Real-time dashboard failed")
+    return realtime_data
 
 
 @router.get("/dashboard/alerts")
-async def get_dashboard_alerts():
+@logged_endpoint("Dashboard alerts failed", success_msg="Dashboard alerts accessed")
+async def get_dashboard_alerts(request: Request):
     """Get dashboard alerts."""
-    try:
-        alerts_data = {
-            "active_alerts": [],
-            "alert_history": [],
-            "alert_summary": {
-                "total_active": 0,
-                "critical": 0,
-                "warning": 0,
-                "info": 0
-            }
-        }
-
-        structured_logger.info("Dashboard alerts accessed")
-        return alerts_data
-
-    except Exception as e:
-        structured_logger.error("Dashboard alerts failed", error=str(e))
-        raise HTTPException(status_code=500, detail="Dashboard alerts failed")
+    return _etag_response(*DASHBOARD_ALERTS_BODY, request)
 
 
 @router.get("/dashboard/trends")
-async def get_performance_trends(period: str = Query("1h", pattern="^(1h|6h|24h|7d)$")):
+@logged_endpoint("Performance trends failed")
+def get_performance_trends(
+    request: Request,
+    period: str = Query("1h", pattern="^(1h|6h|24h|7d)$")
+):
     """Get performance trends for dashboard."""
-    try:
-        trends_data = {
-            "period": period,
-            "data_points": 60,  # Number of data points
-            "metrics": {
-                "response_time": {
-                    "values": [0] * 60,
-                    "timestamps": [datetime.now().isoformat()] * 60
-                },
-                "request_rate": {
-                    "values": [0] * 60,
-                    "timestamps": [datetime.now().isoformat()] * 60
-                },
-                "error_rate": {
-                    "values": [0] * 60,
-                    "timestamps": [datetime.now().isoformat()] * 60
-                }
+    # All series share one timestamp axis; format "now" once and reuse it
+    timestamps = [_now_iso()] * TREND_DATA_POINTS
+    values = [0] * TREND_DATA_POINTS
+
+    trends_data = {
+        "period": period,
+        "data_points": TREND_DATA_POINTS,
+        "metrics": {
+            "response_time": {
+                "values": values,
+                "timestamps": timestamps
+            },
+            "request_rate": {
+                "values": values,
+                "timestamps": timestamps
+            },
+            "error_rate": {
+                "values": values,
+                "timestamps": timestamps
             }
         }
+    }
 
-        structured_logger.info("Performance trends accessed", period=period)
-        return trends_data
+    # The ETag covers only the series content: the timestamps move every second
+    # and would otherwise change the tag on every revalidation
+    etag_source = orjson.dumps({"period": period, "metrics": {
+        name: series["values"] for name, series in trends_data["metrics"].items()
+    }})
+    etag = f'"{hashlib.blake2b(etag_source, digest_size=16).hexdigest()}"'
 
-    except Exception as e:
-        structured_logger.error("Performance trends failed", error=str(e))
-        raise HTTPException(status_code=500, detail="Performance trends failed")
+    structured_logger.info("Performance trends accessed", period=period)
+    return _etag_response(orjson.dumps(trends_data), etag, request)
 
 
 @router.get("/dashboard/service-map")
-async def get_service_map():
+@logged_endpoint("Service map failed", success_msg="Service map accessed")
+async def get_service_map(request: Request):
     """Get service dependency map."""
-    try:
-        service_map = {
-            "services": [
-                {"name": "api_gateway", "status": "healthy", "type": "gateway"},
-                {"name": "triage_service", "status": "healthy", "type": "service"},
-                {"name": "hospital_search", "status": "healthy", "type": "service"},
-                {"name": "google_places", "status": "healthy", "type": "external"},
-                {"name": "database", "status": "healthy", "type": "storage"}
-            ],
-            "dependencies": [
-                {"from": "api_gateway", "to": "triage_service"},
-                {"from": "api_gateway", "to": "hospital_search"},
-                {"from": "hospital_search", "to": "google_places"},
-                {"from": "triage_service", "to": "database"}
-            ],
-            "health_status": "healthy"
-        }
-
-        structured_logger.info("Service map accessed")
-        return service_map
-
-    except Exception as e:
-        structured_logger.error("Service map failed", error=str(e))
-        raise HTTPException(status_code=500, detail="Service map failed")
+    return _etag_response(*SERVICE_MAP_BODY, request)
 
 
 @router.get("/dashboard/config")
-async def get_dashboard_config():
+@logged_endpoint("Dashboard configuration failed", success_msg="Dashboard configuration accessed")
+async def get_dashboard_config(request: Request):
     """Get dashboard configuration."""
-    try:
-        config_data = {
-            "refresh_intervals": {
-                "health_check": 30,
-                "metrics": 60,
-                "alerts": 10
-            },
-            "alert_thresholds": {
-                "response_time_ms": 1000,
-                "error_rate_percent": 5,
-                "cpu_usage_percent": 80
-            },
-            "display_preferences": {
-                "theme": "light",
-                "timezone": "Asia/Taipei",
-                "language": "zh-TW"
-            }
-        }
-
-        structured_logger.info("Dashboard configuration accessed")
-        return config_data
-
-    except Exception as e:
-        structured_logger.error("Dashboard configuration failed", error=str(e))
-        raise HTTPException(status_code=500, detail="Dashboard configuration failed")
+    return _etag_response(*DASHBOARD_CONFIG_BODY, request)
 
 
 @router.get("/dashboard/export")
+@logged_endpoint("Dashboard export failed")
 async def export_dashboard_report(format: str = Query("pdf", pattern="^(pdf|json|csv)$")):
     """Export dashboard report."""
+    if format == "pdf":
+        # In real implementation, generate PDF
+        return JSONResponse(
+            content={
+                "export_id": "dashboard_export_001",
+                "status": "generating",
+                "estimated_completion": _now_iso()
+            },
+            status_code=202
+        )
+    else:
+        # Return JSON/CSV data
+        export_data = {
+            "export_timestamp": _now_iso(),
+            "format": format,
+            "data": {}
+        }
+
+        structured_logger.info("Dashboard report exported", format=format)
+        return export_data
+
+
+# Batched widgets are rendered for the batch response itself, not for the outer
+# POST, so they get a bare request without the caller's conditional headers
+_BATCH_WIDGET_REQUEST = Request({"type": "http", "method": "GET", "headers": []})
+
+# Dashboard widgets that can be fetched through /batch, keyed by full path
+BATCH_ROUTES = {
+    "/v1/monitoring/dashboard": lambda params: get_dashboard_summary(),
+    "/v1/monitoring/dashboard/realtime": lambda params: get_realtime_dashboard(),
+    "/v1/monitoring/dashboard/alerts": lambda params: get_dashboard_alerts(_BATCH_WIDGET_REQUEST),
+    # Sync handler: run in a worker thread, as FastAPI itself would
+    "/v1/monitoring/dashboard/trends": lambda params: asyncio.to_thread(
+        get_performance_trends, _BATCH_WIDGET_REQUEST, params.get("period", "1h")
+    ),
+    "/v1/monitoring/dashboard/service-map": lambda params: get_service_map(_BATCH_WIDGET_REQUEST),
+    "/v1/monitoring/dashboard/config": lambda params: get_dashboard_config(_BATCH_WIDGET_REQUEST),
+}
+TREND_PERIODS = ("1h", "6h", "24h", "7d")
+
+
+async def _run_batch_item(item: BatchRequestItem) -> Dict[str, Any]:
+    """Execute one batched dashboard request and capture its status and body."""
+    handler = BATCH_ROUTES.get(item.path)
+    if handler is None:
+        return {"status": 404, "body": {"detail": f"Unsupported batch path: {item.path}"}}
+    # Only the trends widget takes a period; other widgets ignore extra params
+    if (item.path == "/v1/monitoring/dashboard/trends"
+            and item.params.get("period", "1h") not in TREND_PERIODS):
+        return {"status": 422, "body": {"detail": f"Invalid period: {item.params['period']}"}}
+
     try:
-        if format == "pdf":
-            # In real implementation, generate PDF
-            return JSONResponse(
-                content={
-                    "export_id": "dashboard_export_001",
-                    "status": "generating",
-                    "estimated_completion": datetime.now().isoformat()
-                },
-                status_code=202
-            )
-        else:
-            # Return JSON/CSV data
-            export_data = {
-                "export_timestamp": datetime.now().isoformat(),
-                "format": format,
-                "data": {}
-            }
+        result = await handler(item.params)
+    except HTTPException as e:
+        return {"status": e.status_code, "body": {"detail": e.detail}}
 
-            structured_logger.info("Dashboard report exported", format=format)
-            return export_data
+    if isinstance(result, Response):
+        return {"status": result.status_code, "body": orjson.loads(result.body)}
+    return {"status": 200, "body": result}
 
-    except Exception as e:
-        structured_logger.error("Dashboard export failed", error=str(e))
-        raise HTTPException(status_code=500, detail="Dashboard export failed")
+
+@router.post("/batch")
+async def batch_dashboard_requests(batch: BatchRequest):
+    """
+    Fetch several dashboard widgets in one round trip.
+
+    Each entry is dispatched concurrently and the results are keyed by
+    the caller-supplied request id.
+    """
+    results = await asyncio.gather(
+        *(_run_batch_item(item) for item in batch.requests)
+    )
+    responses = {item.id: result for item, result in zip(batch.requests, results)}
+
+    structured_logger.info("Dashboard batch processed", request_count=len(batch.requests))
+    return {"responses": responses}
 
 
 # Alerting endpoints
 @router.get("/alerts/rules")
-async def get_alert_rules():
+@logged_endpoint("Alert rules access failed", success_msg="Alert rules accessed")
+async def get_alert_rules(request: Request):
     """Get alert rules configuration."""
-    try:
-        rules_data = {
-            "rules": [],
-            "total_count": 0
-        }
-
-        structured_logger.info("Alert rules accessed")
-        return rules_data
-
-    except Exception as e:
-        structured_logger.error("Alert rules access failed", error=str(e))
-        raise HTTPException(status_code=500, detail="Alert rules access failed")
+    return _etag_response(*ALERT_RULES_BODY, request)
 
 
 @router.post("/alerts/rules")
+@logged_endpoint("Alert rule creation failed")
 async def create_alert_rule(rule: AlertRule):
     """Create new alert rule."""
-    try:
-        created_rule = {
-            "rule_id": "rule_001",
-            "name": rule.name,
-            "condition": rule.condition,
-            "severity": rule.severity,
-            "notification_channels": rule.notification_channels,
-            "enabled": True,
-            "created_at": datetime.now().isoformat()
-        }
+    created_rule = {
+        "rule_id": "rule_001",
+        "name": rule.name,
+        "condition": rule.condition,
+        "severity": rule.severity,
+        "notification_channels": rule.notification_channels,
+        "enabled": True,
+        "created_at": _now_iso()
+    }
 
-        structured_logger.info("Alert rule created", rule_name=rule.name)
-        return created_rule
-
-    except Exception as e:
-        structured_logger.error("Alert rule creation failed", error=str(e))
-        raise HTTPException(status_code=500, detail="Alert rule creation failed")
+    structured_logger.info("Alert rule created", rule_name=rule.name)
+    return created_rule
 
 
 @router.get("/alerts/notifications")
+@logged_endpoint("Alert notifications access failed", success_msg="Alert notifications accessed")
 async def get_alert_notifications():
     """Get alert notifications."""
-    try:
-        notifications_data = {
-            "notifications": [],
-            "channels": ["email", "slack", "webhook"]
-        }
-
-        structured_logger.info("Alert notifications accessed")
-        return notifications_data
+    notifications_data = {
+        "notifications": [],
+        "channels": ["email", "slack", "webhook"]
+    }
 
-    except Exception as e:
-        structured_logger.error("Alert notifications access failed", error=str(e))
-        raise HTTPException(status_code=500, detail="Alert notifications access failed")
+    return notifications_data
 
 
 @router.post("/alerts/silence")
+@logged_endpoint("Alert silence creation failed")
 async def create_alert_silence(config: SilenceConfig):
     """Create alert silence."""
-    try:
-        silence_data = {
-            "silence_id": "silence_001",
-            "expires_at": (datetime.now() + timedelta(hours=config.duration_hours)).isoformat(),
-            "reason": config.reason,
-            "affected_services": config.affected_services
-        }
+    silence_data = {
+        "silence_id": "silence_001",
+        "expires_at": (datetime.now() + timedelta(hours=config.duration_hours)).isoformat(),
+        "reason": config.reason,
+        "affected_services": config.affected_services
+    }
 
-        structured_logger.info("Alert silence created", duration_hours=config.duration_hours)
-        return silence_data
-
-    except Exception as e:
-        structured_logger.error("Alert silence creation failed", error=str(e))
-        raise HTTPException(status_code=500, detail="Alert silence creation failed")
+    structured_logger.info("Alert silence created", duration_hours=config.duration_hours)
+    return silence_data
 
 
 @router.post("/webhooks/alerts")
+@logged_endpoint("Webhook alert processing failed")
 async def handle_webhook_alert(alert_data: Dict[str, Any]):
     """Handle incoming webhook alerts from external systems."""
-    try:
-        webhook_response = {
-            "received": True,
-            "alert_id": f"webhook_alert_{datetime.now().timestamp()}",
-            "processed_at": datetime.now().isoformat()
-        }
-
-        structured_logger.info("Webhook alert processed", source=alert_data.get("source"))
-        return webhook_response
+    webhook_response = {
+        "received": True,
+        # IDs need sub-second uniqueness; the display timestamp does not
+        "alert_id": f"webhook_alert_{time.time_ns()}",
+        "processed_at": _now_iso()
+    }
 
-    except Exception as e:
-        structured_logger.error("Webhook alert processing failed", error=str(e))
-        raise HTTPException(status_code=500, detail="Webhook alert processing failed")
+    structured_logger.info("Webhook alert processed", source=alert_data.get("source"))
+    return webhook_response
 
 
 # Note: Security headers should be added at the app level, not router level
@@ -3,10 +3,13 @@
 提供症狀評估與就醫建議服務
 """
 
+import asyncio
 from datetime import datetime, timezone
 from typing import Optional, List, Dict, Any
-import uuid
-from fastapi import APIRouter, HTTPException, Request, Query
+import unicodedata
+import orjson
+from secrets import token_hex
+from fastapi import APIRouter, HTTPException, Request, Query, Response
 from app.domain.models import (
     SymptomQuery,
     TriageRequest,
@@ -14,7 +17,9 @@ from app.domain.models import (
     TriageLevel
 )
 from app.domain.triage import rule_triage
-from app.services.places import nearby_hospitals
+from app.domain.rules_tw import get_emergency_keywords, get_mild_keywords
+from app.services.places import nearby_hospitals_async
+from app.services.cache import ResponseCache
 from app.config import get_settings
 
 router = APIRouter(prefix="/v1/triage", tags=["症狀分級"])
@@ -63,25 +68,34 @@ async def assess_symptoms(
             detail=str(e)
         )
 
+    # 如果需要附近醫院資訊，先在背景開始搜尋，與症狀分級同時進行
+    hospitals_task = None
+    if triage_request.include_nearby_hospitals and triage_request.location:
+        hospitals_task = asyncio.create_task(nearby_hospitals_async(
+            lat=triage_request.location.get("latitude"),
+            lng=triage_request.location.get("longitude"),
+            radius=5000,
+            max_results=5
+        ))
+        # 讓出一次事件迴圈，使搜尋任務先執行到送出 HTTP 請求；
+        # 否則任務要等到下方同步分級結束後的 await 才會開始
+        await asyncio.sleep(0)
+
     # 執行規則基礎的症狀分級
     try:
         triage_result = rule_triage(symptom_query)
     except Exception as e:
+        if hospitals_task is not None:
+            hospitals_task.cancel()
         raise HTTPException(
             status_code=500,
             detail=f"Triage assessment error: {str(e)}"
         )
 
-    # 如果需要附近醫院資訊
     nearby_hospitals_data = None
-    if triage_request.include_nearby_hospitals and triage_request.location:
+    if hospitals_task is not None:
         try:
-            hospitals = nearby_hospitals(
-                lat=triage_request.location["latitude"],
-                lng=triage_request.location["longitude"],
-                radius=5000,
-                max_results=5
-            )
+            hospitals = await hospitals_task
             # 格式化醫院資訊
             nearby_hospitals_data = [
                 {
@@ -98,7 +112,7 @@ async def assess_symptoms(
             nearby_hospitals_data = []
 
     # 生成請求ID和時間戳
-    request_id = f"triage_{uuid.uuid4().hex[:12]}"
+    request_id = f"triage_{token_hex(6)}"
     timestamp = datetime.now(timezone.utc).isoformat()
 
     # 建構回應
@@ -121,6 +135,10 @@ async def assess_symptoms(
     return response
 
 
+# 快速評估結果快取（常見的短症狀描述會重複出現）
+_QUICK_TRIAGE_CACHE = ResponseCache(ttl=3600)
+
+
 @router.post("/quick",
             summary="快速症狀評估",
             description="僅提供症狀文字的快速評估",
@@ -139,10 +157,18 @@ async def quick_assessment(
     Returns:
         Dict: 簡化的評估結果
     """
+    # 規則分級只取決於症狀文字：正規化後作為快取鍵，並以同一份文字進行分級
+    normalized_text = unicodedata.normalize("NFKC", symptom_text).strip()
+
+    cached = _QUICK_TRIAGE_CACHE.get(text=normalized_text)
+    if cached is not None:
+        cached.pop("cache_age", None)
+        return cached
+
     settings = get_settings()
 
     # 建立簡單查詢
-    symptom_query = SymptomQuery(symptom_text=symptom_text)
+    symptom_query = SymptomQuery(symptom_text=normalized_text)
 
     try:
         triage_result = rule_triage(symptom_query)
@@ -152,7 +178,7 @@ async def quick_assessment(
             detail=f"Quick assessment error: {str(e)}"
         )
 
-    return {
+    response = {
         "level": triage_result.level.value,
         "advice": triage_result.advice,
         "next_steps": triage_result.next_steps[:3],  # 只顯示前3個步驟
@@ -160,107 +186,127 @@ async def quick_assessment(
         "disclaimer": "本評估僅供參考，緊急狀況請撥打119。",
         "locale": "zh-TW"
     }
+    _QUICK_TRIAGE_CACHE.set(response, text=normalized_text)
+
+    return response
+
+
+# 症狀與科別資訊為靜態資料，於載入時建立並編碼為 JSON 一次，各請求直接回傳同一份位元組
+_EMERGENCY_KEYWORDS = get_emergency_keywords()
+_EMERGENCY_SYMPTOMS_BODY = orjson.dumps({
+    "emergency_symptoms": _EMERGENCY_KEYWORDS,
+    "total_count": len(_EMERGENCY_KEYWORDS),
+    "description": "出現這些症狀時應立即撥打119或前往急診",
+    "emergency_numbers": ["119", "112"],
+    "locale": "zh-TW"
+})
+
+_MILD_KEYWORDS = get_mild_keywords()
+_MILD_SYMPTOMS_BODY = orjson.dumps({
+    "mild_symptoms": _MILD_KEYWORDS,
+    "total_count": len(_MILD_KEYWORDS),
+    "description": "這些症狀通常可透過休息和自我照護改善",
+    "self_care_tips": [
+        "充分休息",
+        "多喝水",
+        "清淡飲食",
+        "觀察症狀變化",
+        "如症狀持續或惡化請就醫"
+    ],
+    "locale": "zh-TW"
+})
+
+_DEPARTMENT_INFO = {
+    "心臟內科": {
+        "symptoms": ["胸痛", "胸悶", "心悸", "心跳異常"],
+        "description": "心血管相關疾病"
+    },
+    "胸腔內科": {
+        "symptoms": ["呼吸困難", "咳嗽", "氣喘", "胸部不適"],
+        "description": "呼吸系統疾病"
+    },
+    "神經內科": {
+        "symptoms": ["頭痛", "頭暈", "麻痺", "手腳無力"],
+        "description": "神經系統疾病"
+    },
+    "腸胃內科": {
+        "symptoms": ["腹痛", "嘔吐", "腹瀉", "便秘"],
+        "description": "消化系統疾病"
+    },
+    "耳鼻喉科": {
+        "symptoms": ["喉嚨痛", "流鼻水", "鼻塞", "耳痛"],
+        "description": "耳鼻喉相關疾病"
+    },
+    "家醫科": {
+        "symptoms": ["發燒", "感冒", "疲倦", "一般不適"],
+        "description": "一般內科疾病、健康檢查"
+    },
+    "急診": {
+        "symptoms": ["意識不清", "大量出血", "嚴重創傷", "中毒"],
+        "description": "緊急醫療狀況"
+    }
+}
+
+_DEPARTMENT_MAPPING_BODY = orjson.dumps({
+    "departments": _DEPARTMENT_INFO,
+    "total_departments": len(_DEPARTMENT_INFO),
+    "note": "建議科別僅供參考，實際就診請依醫師專業判斷",
+    "locale": "zh-TW"
+})
+
+# 靜態資料允許瀏覽器與 CDN 快取
+_STATIC_CACHE_HEADERS = {"Cache-Control": "public, max-age=3600"}  # 1小時快取
 
 
 @router.get("/symptoms/emergency",
            summary="取得緊急症狀列表",
            description="返回系統識別的緊急症狀關鍵字",
            tags=["症狀資訊"])
-async def get_emergency_symptoms() -> Dict[str, Any]:
+async def get_emergency_symptoms() -> Response:
     """
     取得緊急症狀列表
 
     Returns:
-        Dict: 緊急症狀資訊
+        Response: 緊急症狀資訊
     """
-    from app.domain.rules_tw import get_emergency_keywords
-
-    keywords = get_emergency_keywords()
-
-    return {
-        "emergency_symptoms": keywords,
-        "total_count": len(keywords),
-        "description": "出現這些症狀時應立即撥打119或前往急診",
-        "emergency_numbers": ["119", "112"],
-        "locale": "zh-TW"
-    }
+    return Response(
+        content=_EMERGENCY_SYMPTOMS_BODY,
+        media_type="application/json",
+        headers=_STATIC_CACHE_HEADERS
+    )
 
 
 @router.get("/symptoms/mild",
            summary="取得輕微症狀列表",
            description="返回可自我照護的輕微症狀",
            tags=["症狀資訊"])
-async def get_mild_symptoms() -> Dict[str, Any]:
+async def get_mild_symptoms() -> Response:
     """
     取得輕微症狀列表
 
     Returns:
-        Dict: 輕微症狀資訊
+        Response: 輕微症狀資訊
     """
-    from app.domain.rules_tw import get_mild_keywords
-
-    keywords = get_mild_keywords()
-
-    return {
-        "mild_symptoms": keywords,
-        "total_count": len(keywords),
-        "description": "這些症狀通常可透過休息和自我照護改善",
-        "self_care_tips": [
-            "充分休息",
-            "多喝水",
-            "清淡飲食",
-            "觀察症狀變化",
-            "如症狀持續或惡化請就醫"
-        ],
-        "locale": "zh-TW"
-    }
+    return Response(
+        content=_MILD_SYMPTOMS_BODY,
+        media_type="application/json",
+        headers=_STATIC_CACHE_HEADERS
+    )
 
 
 @router.get("/departments",
            summary="取得推薦科別對照表",
            description="症狀與建議就診科別的對照資訊",
            tags=["症狀資訊"])
-async def get_department_mapping() -> Dict[str, Any]:
+async def get_department_mapping() -> Response:
     """
     取得症狀與科別對照表
 
     Returns:
-        Dict: 科別對照資訊
+        Response: 科別對照資訊
     """
-    department_info = {
-        "心臟內科": {
-            "symptoms": ["胸痛", "胸悶", "心悸", "心跳異常"],
-            "description": "心血管相關疾病"
-        },
-        "胸腔內科": {
-            "symptoms": ["呼吸困難", "咳嗽", "氣喘", "胸部不適"],
-            "description": "呼吸系統疾病"
-        },
-        "神經內科": {
-            "symptoms": ["頭痛", "頭暈", "麻痺", "手腳無力"],
-            "description": "神經系統疾病"
-        },
-        "腸胃內科": {
-            "symptoms": ["腹痛", "嘔吐", "腹瀉", "便秘"],
-            "description": "消化系統疾病"
-        },
-        "耳鼻喉科": {
-            "symptoms": ["喉嚨痛", "流鼻水", "鼻塞", "耳痛"],
-            "description": "耳鼻喉相關疾病"
-        },
-        "家醫科": {
-            "symptoms": ["發燒", "感冒", "疲倦", "一般不適"],
-            "description": "一般內科疾病、健康檢查"
-        },
-        "急診": {
-            "symptoms": ["意識不清", "大量出血", "嚴重創傷", "中毒"],
-            "description": "緊急醫療狀況"
-        }
-    }
-
-    return {
-        "departments": department_info,
-        "total_departments": len(department_info),
-        "note": "建議科別僅供參考，實際就診請依醫師專業判斷",
-        "locale": "zh-TW"
-    }
\ No newline at end of file
+    return Response(
+        content=_DEPARTMENT_MAPPING_BODY,
+        media_type="application/json",
+        headers=_STATIC_CACHE_HEADERS
+    )
\ No newline at end of file
@@ -5,16 +5,34 @@
 
 from .geocoding import (
     ip_geolocate,
+    ip_geolocate_async,
     geocode_address,
+    geocode_address_async,
+    geocode_addresses,
     IPLocationResult,
     GeocodeResult,
     GeocodeError
 )
+from .places import (
+    nearby_hospitals,
+    nearby_hospitals_async,
+    nearby_hospitals_batch,
+    PlaceResult,
+    PlacesAPIError
+)
 
 __all__ = [
     "ip_geolocate",
+    "ip_geolocate_async",
     "geocode_address",
+    "geocode_address_async",
+    "geocode_addresses",
     "IPLocationResult",
     "GeocodeResult",
-    "GeocodeError"
+    "GeocodeError",
+    "nearby_hospitals",
+    "nearby_hospitals_async",
+    "nearby_hospitals_batch",
+    "PlaceResult",
+    "PlacesAPIError"
 ]
\ No newline at end of file
@@ -3,74 +3,147 @@
 用於存儲和檢索降級時使用的快取資料
 """
 
+import asyncio
 import time
-from typing import Any, Optional, Dict
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Optional, Dict, Tuple
 from datetime import datetime, timedelta
-import json
 import hashlib
+import logging
+
+logger = logging.getLogger(__name__)
 
 
 class ResponseCache:
-    """回應快取"""
+    """回應快取（有容量上限的 LRU，過期項目於讀取時惰性移除）"""
 
-    def __init__(self, ttl: int = 300):
+    def __init__(self, ttl: int = 300, maxsize: int = 1024, stale_ttl: Optional[float] = None,
+                 refresh_backoff: float = 30.0):
         """
         初始化快取
 
         Args:
             ttl: 存活時間（秒）
+            maxsize: 最多保留的項目數，超過時淘汰最久未使用者
+            stale_ttl: 過期後仍可回傳舊資料並於背景更新的時間（秒），
+                預設與各項目的存活時間相同
+            refresh_backoff: 背景更新失敗（拋出例外或未寫回資料）後，
+                同一鍵暫停再次更新的時間（秒）
         """
         self.ttl = ttl
-        self._cache: Dict[str, Dict[str, Any]] = {}
-
-    def _get_key(self, **kwargs) -> str:
+        self.maxsize = maxsize
+        self.stale_ttl = stale_ttl
+        self.refresh_backoff = refresh_backoff
+        self._cache: "OrderedDict[bytes, Tuple[float, float, Dict[str, Any]]]" = OrderedDict()
+        # 進行中的背景更新（保留任務參照，避免被回收）
+        self._refreshing: Dict[bytes, "asyncio.Future[Any]"] = {}
+        # 背景更新失敗的鍵 → 可再次嘗試更新的時間，避免對失敗中的後端反覆觸發更新
+        self._refresh_retry_at: Dict[bytes, float] = {}
+
+    def _get_key(self, **kwargs) -> bytes:
         """生成快取鍵"""
-        # 將參數序列化並計算雜湊
-        key_data = json.dumps(kwargs, sort_keys=True)
-        return hashlib.md5(key_data.encode()).hexdigest()
-
-    def get(self, **kwargs) -> Optional[Dict[str, Any]]:
+        # 依參數名排序後以 BLAKE2b 雜湊 repr，免去 JSON 序列化；以分隔位元組避免欄位邊界混淆
+        h = hashlib.blake2b(digest_size=16)
+        for name in sorted(kwargs):
+            h.update(name.encode())
+            h.update(b"\x00")
+            h.update(repr(kwargs[name]).encode())
+            h.update(b"\x01")
+        return h.digest()
+
+    def get(
+        self,
+        on_stale: Optional[Callable[[], Awaitable[Any]]] = None,
+        **kwargs
+    ) -> Optional[Dict[str, Any]]:
         """
         獲取快取
 
+        Args:
+            on_stale: 背景更新函式（需在事件迴圈中呼叫）。提供時，剛過期的項目
+                會先以 stale=True 回傳，並排程此函式重新取得資料
+
         Returns:
             快取資料或 None
         """
         key = self._get_key(**kwargs)
 
-        if key not in self._cache:
+        entry = self._cache.get(key)
+        if entry is None:
             return None
 
-        cache_entry = self._cache[key]
-        cache_time = cache_entry["timestamp"]
-        cache_age = time.time() - cache_time
+        timestamp, ttl, data = entry
+        cache_age = time.time() - timestamp
+
+        if cache_age > ttl:
+            stale_ttl = ttl if self.stale_ttl is None else self.stale_ttl
+            if on_stale is None or cache_age > ttl + stale_ttl:
+                # 快取過期
+                del self._cache[key]
+                self._refresh_retry_at.pop(key, None)
+                return None
+
+            # stale-while-revalidate：先回傳舊資料，同一鍵只排程一次背景更新；
+            # 上次更新失敗時，退避期間內只回傳舊資料
+            if time.time() >= self._refresh_retry_at.get(key, 0.0):
+                self._schedule_refresh(key, entry, on_stale)
+            self._cache.move_to_end(key)
+            return data | {"cache_age": int(cache_age), "stale": True}
+
+        self._cache.move_to_end(key)
+        return data | {"cache_age": int(cache_age)}
+
+    def _schedule_refresh(self, key: bytes, entry: Tuple[float, float, Dict[str, Any]],
+                          on_stale: Callable[[], Awaitable[Any]]):
+        """排程背景更新，避免同一鍵同時有多個更新任務"""
+        if key in self._refreshing:
+            return
+
+        task = asyncio.ensure_future(on_stale())
+        self._refreshing[key] = task
+
+        def _done(finished: "asyncio.Future[Any]") -> None:
+            if self._refreshing.get(key) is finished:
+                del self._refreshing[key]
+            if not finished.cancelled() and finished.exception() is not None:
+                logger.warning(f"Background cache refresh failed: {finished.exception()}")
+            # 更新未寫回新資料（失敗或取得 None）：記錄退避時間，舊資料照常回傳
+            if self._cache.get(key) is entry:
+                self._refresh_retry_at[key] = time.time() + self.refresh_backoff
+
+        task.add_done_callback(_done)
+
+    def set(self, data: Dict[str, Any], ttl: Optional[float] = None, **kwargs):
+        """
+        存儲快取
 
-        if cache_age > self.ttl:
-            # 快取過期
-            del self._cache[key]
-            return None
+        Args:
+            data: 快取資料
+            ttl: 此項目的存活時間（秒），未指定時使用預設值
+        """
+        key = self._get_key(**kwargs)
+        self._cache[key] = (time.time(), self.ttl if ttl is None else ttl, data)
+        self._cache.move_to_end(key)
+        self._refresh_retry_at.pop(key, None)
 
-        return {
-            **cache_entry["data"],
-            "cache_age": int(cache_age)
-        }
+        while len(self._cache) > self.maxsize:
+            evicted_key, _ = self._cache.popitem(last=False)
+            self._refresh_retry_at.pop(evicted_key, None)
 
-    def set(self, data: Dict[str, Any], **kwargs):
-        """存儲快取"""
-        key = self._get_key(**kwargs)
-        self._cache[key] = {
-            "data": data,
-            "timestamp": time.time()
-        }
+    def clear(self):
+        """清空快取"""
+        self._cache.clear()
+        self._refreshing.clear()
+        self._refresh_retry_at.clear()
 
     def clear_expired(self):
-        """清理過期快取"""
+        """清理過期快取（選用；過期項目亦會在讀取時移除）"""
         current_time = time.time()
-        keys_to_delete = []
-
-        for key, entry in self._cache.items():
-            if current_time - entry["timestamp"] > self.ttl:
-                keys_to_delete.append(key)
+        expired = [
+            key for key, (timestamp, ttl, _) in self._cache.items()
+            if current_time - timestamp > ttl
+        ]
 
-        for key in keys_to_delete:
-            del self._cache[key]
\ No newline at end of file
+        for key in expired:
+            del self._cache[key]
+            self._refresh_retry_at.pop(key, None)
@@ -6,19 +6,82 @@
 - 台灣在地化處理與精度警告
 """
 
-import re
+import asyncio
+import atexit
+import importlib.util
+import ipaddress
+import threading
 import warnings
+from functools import lru_cache
 import httpx
-from typing import Optional, Union, Dict, Any, List
-from dataclasses import dataclass
+import orjson
+from typing import Optional, Union, Dict, Any, List, Tuple, Callable, Awaitable
+from dataclasses import dataclass, asdict
 import logging
 from app.config import get_settings
+from app.services.cache import ResponseCache
 from app.utils.resilience import exponential_backoff_retry
+from app.utils.http_client import LoopBoundAsyncClient
 
 logger = logging.getLogger(__name__)
 
+# 共用 HTTP 連線池：重用 TCP/TLS 連線，避免每次請求重新握手
+# HTTP/2 需要 h2 套件（httpx[http2]），未安裝時退回 HTTP/1.1 keep-alive
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+_HTTP_LIMITS = httpx.Limits(max_keepalive_connections=20, max_connections=50)
+_HTTP_CLIENT: Optional[httpx.Client] = None
+_HTTP_CLIENT_LOCK = threading.Lock()
 
-@dataclass
+
+def _get_http_client() -> httpx.Client:
+    """取得共用的 httpx.Client（首次使用時建立）"""
+    global _HTTP_CLIENT
+    client = _HTTP_CLIENT
+    if client is None or client.is_closed:
+        with _HTTP_CLIENT_LOCK:
+            client = _HTTP_CLIENT
+            if client is None or client.is_closed:
+                client = httpx.Client(
+                    http2=_HTTP2_AVAILABLE,
+                    limits=_HTTP_LIMITS,
+                    timeout=10.0,
+                    headers={"User-Agent": "nycu-med/1.0"}
+                )
+                _HTTP_CLIENT = client
+    return client
+
+
+def close_http_client() -> None:
+    """關閉共用 HTTP 連線池（應用程式關閉時呼叫）"""
+    global _HTTP_CLIENT
+    with _HTTP_CLIENT_LOCK:
+        if _HTTP_CLIENT is not None:
+            _HTTP_CLIENT.close()
+            _HTTP_CLIENT = None
+
+
+atexit.register(close_http_client)
+
+# 非同步連線池：依事件迴圈各自建立（見 app.utils.http_client）
+_ASYNC_HTTP_CLIENT = LoopBoundAsyncClient(
+    http2=_HTTP2_AVAILABLE,
+    limits=_HTTP_LIMITS,
+    timeout=10.0,
+    headers={"User-Agent": "nycu-med/1.0"}
+)
+
+
+def _get_async_http_client() -> httpx.AsyncClient:
+    """取得目前事件迴圈共用的 httpx.AsyncClient（首次使用時建立）"""
+    return _ASYNC_HTTP_CLIENT.get()
+
+
+async def close_async_http_client() -> None:
+    """關閉非同步連線池（應用程式關閉時呼叫）"""
+    await _ASYNC_HTTP_CLIENT.aclose()
+
+
+@dataclass(slots=True, frozen=True)
 class IPLocationResult:
     """IP 定位結果"""
     latitude: float
@@ -29,7 +92,7 @@ class IPLocationResult:
     source: str = "ip"  # "ip" 或 "manual"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class GeocodeResult:
     """地理編碼結果"""
     latitude: float
@@ -45,73 +108,115 @@ class GeocodeResult:
     place_id: str = ""
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class GeocodeError:
     """地理編碼錯誤"""
     status: str
     error_message: str = ""
 
 
+_IP_ACCURACY_NOTICE = (
+    "IP 定位精度有限，通常僅能提供城市級別的大致位置。"
+    "建議使用者手動確認或提供更精確的地址。"
+)
+
+
 def _validate_ip_accuracy() -> None:
     """驗證並警告 IP 定位精度限制"""
-    warnings.warn(
-        "IP 定位精度有限，通常僅能提供城市級別的大致位置。"
-        "建議使用者手動確認或提供更精確的地址。",
-        UserWarning
-    )
+    warnings.warn(_IP_ACCURACY_NOTICE, UserWarning)
+
+
+@lru_cache(maxsize=1)
+def _log_ip_accuracy_notice() -> None:
+    """記錄 IP 定位精度限制（每個行程僅記錄一次，不在請求路徑上發出 warnings）"""
+    logger.info(_IP_ACCURACY_NOTICE)
 
 
 def _is_private_ip(ip_address: str) -> bool:
-    """檢查是否為私有 IP 地址"""
+    """檢查是否為私有、回送、鏈路本地或保留 IP 地址（含 IPv6）；無法解析者視為不可定位"""
     if not ip_address:
         return True
 
-    # 私有 IP 範圍 patterns
-    private_patterns = [
-        r'^192\.168\.',      # 192.168.0.0/16
-        r'^10\.',            # 10.0.0.0/8
-        r'^172\.(1[6-9]|2[0-9]|3[01])\.',  # 172.16.0.0/12
-        r'^127\.',           # 127.0.0.0/8 (localhost)
-        r'^169\.254\.',      # 169.254.0.0/16 (link-local)
-    ]
+    try:
+        addr = ipaddress.ip_address(ip_address)
+    except ValueError:
+        return True
+
+    return addr.is_private or addr.is_loopback or addr.is_link_local or addr.is_reserved
+
+
+def _ipinfo_url(ip_address: str) -> str:
+    return f"https://ipinfo.io/{ip_address}/json" if ip_address else "https://ipinfo.io/json"
+
+
+def _ipapi_url(ip_address: str) -> str:
+    return f"https://ipapi.co/{ip_address}/json/" if ip_address else "https://ipapi.co/json/"
 
-    return any(re.match(pattern, ip_address) for pattern in private_patterns)
+
+def _parse_ipinfo_response(response: httpx.Response) -> Optional[IPLocationResult]:
+    """解析 ipinfo.io 回應"""
+    if response.status_code != 200:
+        return None
+
+    data = orjson.loads(response.content)
+
+    # 檢查是否有錯誤
+    if "error" in data:
+        return None
+
+    # 解析座標
+    loc = data.get("loc", "")
+    if "," not in loc:
+        return None
+
+    try:
+        lat_str, lng_str = loc.split(",", 1)
+        latitude = float(lat_str.strip())
+        longitude = float(lng_str.strip())
+    except (ValueError, IndexError):
+        return None
+
+    return IPLocationResult(
+        latitude=latitude,
+        longitude=longitude,
+        city=data.get("city", "Unknown"),
+        country=data.get("country", "Unknown"),
+        accuracy_radius_km=30,  # ipinfo.io 通常較準確
+        source="ip"
+    )
+
+
+def _parse_ipapi_response(response: httpx.Response) -> Optional[IPLocationResult]:
+    """解析 ipapi.co 回應"""
+    if response.status_code != 200:
+        return None
+
+    data = orjson.loads(response.content)
+
+    # 檢查是否有錯誤
+    if "error" in data:
+        return None
+
+    latitude = data.get("latitude")
+    longitude = data.get("longitude")
+
+    if latitude is None or longitude is None:
+        return None
+
+    return IPLocationResult(
+        latitude=float(latitude),
+        longitude=float(longitude),
+        city=data.get("city", "Unknown"),
+        country=data.get("country", "Unknown"),
+        accuracy_radius_km=50,  # ipapi.co 精度較低
+        source="ip"
+    )
 
 
 def _try_ipinfo_api(ip_address: str, client: httpx.Client) -> Optional[IPLocationResult]:
     """嘗試使用 ipinfo.io API"""
     try:
-        url = f"https://ipinfo.io/{ip_address}/json" if ip_address else "https://ipinfo.io/json"
-        response = client.get(url, timeout=5.0)
-
-        if response.status_code == 200:
-            data = response.json()
-
-            # 檢查是否有錯誤
-            if "error" in data:
-                return None
-
-            # 解析座標
-            loc = data.get("loc", "")
-            if "," not in loc:
-                return None
-
-            try:
-                lat_str, lng_str = loc.split(",", 1)
-                latitude = float(lat_str.strip())
-                longitude = float(lng_str.strip())
-            except (ValueError, IndexError):
-                return None
-
-            return IPLocationResult(
-                latitude=latitude,
-                longitude=longitude,
-                city=data.get("city", "Unknown"),
-                country=data.get("country", "Unknown"),
-                accuracy_radius_km=30,  # ipinfo.io 通常較準確
-                source="ip"
-            )
-
+        return _parse_ipinfo_response(client.get(_ipinfo_url(ip_address), timeout=5.0))
     except (httpx.RequestError, httpx.TimeoutException, ValueError, KeyError) as e:
         logger.debug(f"ipinfo.io API failed: {e}")
 
@@ -121,31 +226,27 @@ def _try_ipinfo_api(ip_address: str, client: httpx.Client) -> Optional[IPLocatio
 def _try_ipapi_api(ip_address: str, client: httpx.Client) -> Optional[IPLocationResult]:
     """嘗試使用 ipapi.co API (備援)"""
     try:
-        url = f"https://ipapi.co/{ip_address}/json/" if ip_address else "https://ipapi.co/json/"
-        response = client.get(url, timeout=5.0)
+        return _parse_ipapi_response(client.get(_ipapi_url(ip_address), timeout=5.0))
+    except (httpx.RequestError, httpx.TimeoutException, ValueError, KeyError) as e:
+        logger.debug(f"ipapi.co API failed: {e}")
 
-        if response.status_code == 200:
-            data = response.json()
+    return None
 
-            # 檢查是否有錯誤
-            if "error" in data:
-                return None
 
-            latitude = data.get("latitude")
-            longitude = data.get("longitude")
+async def _try_ipinfo_api_async(ip_address: str, client: httpx.AsyncClient) -> Optional[IPLocationResult]:
+    """嘗試使用 ipinfo.io API（非同步）"""
+    try:
+        return _parse_ipinfo_response(await client.get(_ipinfo_url(ip_address), timeout=5.0))
+    except (httpx.RequestError, httpx.TimeoutException, ValueError, KeyError) as e:
+        logger.debug(f"ipinfo.io API failed: {e}")
 
-            if latitude is None or longitude is None:
-                return None
+    return None
 
-            return IPLocationResult(
-                latitude=float(latitude),
-                longitude=float(longitude),
-                city=data.get("city", "Unknown"),
-                country=data.get("country", "Unknown"),
-                accuracy_radius_km=50,  # ipapi.co 精度較低
-                source="ip"
-            )
 
+async def _try_ipapi_api_async(ip_address: str, client: httpx.AsyncClient) -> Optional[IPLocationResult]:
+    """嘗試使用 ipapi.co API（非同步）"""
+    try:
+        return _parse_ipapi_response(await client.get(_ipapi_url(ip_address), timeout=5.0))
     except (httpx.RequestError, httpx.TimeoutException, ValueError, KeyError) as e:
         logger.debug(f"ipapi.co API failed: {e}")
 
@@ -190,43 +291,136 @@ def ip_geolocate(
         logger.debug(f"Skipping private or invalid IP: {ip_address}")
         return None
 
-    # 發出精度警告
-    _validate_ip_accuracy()
+    # 精度限制提示（僅首次記錄；精度半徑已隨結果回傳）
+    _log_ip_accuracy_notice()
 
-    # 嘗試多個 API（同步版本）
+    # 嘗試多個 API（同步版本，共用連線池）
     try:
-        with httpx.Client() as client:
-            # 首先嘗試 ipinfo.io
-            result = _try_ipinfo_api(ip_address, client)
-            if result:
-                return result
+        client = _get_http_client()
+
+        # 首先嘗試 ipinfo.io
+        result = _try_ipinfo_api(ip_address, client)
+        if result:
+            return result
 
-            # 備援：嘗試 ipapi.co
-            result = _try_ipapi_api(ip_address, client)
-            if result:
-                return result
+        # 備援：嘗試 ipapi.co
+        result = _try_ipapi_api(ip_address, client)
+        if result:
+            return result
 
-            return None
+        return None
     except Exception as e:
         logger.warning(f"IP geolocation failed: {e}")
         return None
 
 
-def geocode_address(address: Optional[str], language: str = "zh-TW") -> Optional[GeocodeResult]:
-    """
-    地址/地名 → 座標 (Google Geocoding API)
+# 進行中的 IP 定位請求（IP → Future），供相同 IP 的並行呼叫共用
+_IP_GEOLOCATE_INFLIGHT: Dict[str, "asyncio.Future[Optional[IPLocationResult]]"] = {}
 
-    Args:
-        address: 地址或地名
-        language: 語言代碼，預設 zh-TW
 
-    Returns:
-        GeocodeResult 或 None（編碼失敗）
+async def ip_geolocate_async(
+    ip_address: Optional[str] = None,
+    manual_latitude: Optional[float] = None,
+    manual_longitude: Optional[float] = None,
+    manual_city: Optional[str] = None
+) -> Optional[IPLocationResult]:
+    """
+    IP 地理定位（非同步版本）
 
-    Note:
-        使用 Google Geocoding API 進行地址編碼
-        強制使用 zh-TW 語言以確保台灣在地化
+    參數與回傳值同 ip_geolocate；先查詢 ipinfo.io，失敗時才改用 ipapi.co。
+    相同 IP 的並行查詢只發出一次請求。
     """
+    # 手動座標優先
+    if manual_latitude is not None and manual_longitude is not None:
+        return IPLocationResult(
+            latitude=manual_latitude,
+            longitude=manual_longitude,
+            city=manual_city or "User Specified",
+            country="Unknown",
+            accuracy_radius_km=0,  # 手動座標假設精確
+            source="manual"
+        )
+
+    # 檢查 IP 地址有效性
+    if not ip_address or _is_private_ip(ip_address):
+        logger.debug(f"Skipping private or invalid IP: {ip_address}")
+        return None
+
+    # 精度限制提示（僅首次記錄；精度半徑已隨結果回傳）
+    _log_ip_accuracy_notice()
+
+    # 相同 IP 的並行查詢共用同一個進行中的請求（single-flight）
+    pending = _IP_GEOLOCATE_INFLIGHT.get(ip_address)
+    if pending is None or pending.get_loop() is not asyncio.get_running_loop():
+        pending = asyncio.ensure_future(_query_ip_providers(ip_address))
+        _IP_GEOLOCATE_INFLIGHT[ip_address] = pending
+
+        def _forget(done: "asyncio.Future[Optional[IPLocationResult]]") -> None:
+            if _IP_GEOLOCATE_INFLIGHT.get(ip_address) is done:
+                del _IP_GEOLOCATE_INFLIGHT[ip_address]
+
+        pending.add_done_callback(_forget)
+
+    # shield：單一呼叫端取消時不影響其他等待同一結果的呼叫端
+    return await asyncio.shield(pending)
+
+
+async def _query_ip_providers(ip_address: str) -> Optional[IPLocationResult]:
+    """依序查詢 ipinfo.io（較精確）與備援 ipapi.co，與同步版本順序一致"""
+    try:
+        client = _get_async_http_client()
+
+        # 首先嘗試 ipinfo.io
+        result = await _try_ipinfo_api_async(ip_address, client)
+        if result:
+            return result
+
+        # 備援：嘗試 ipapi.co（僅在主要來源失敗時使用，避免消耗兩邊配額）
+        result = await _try_ipapi_api_async(ip_address, client)
+        if result:
+            return result
+
+        return None
+    except Exception as e:
+        logger.warning(f"IP geolocation failed: {e}")
+        return None
+
+
+# 地理編碼結果快取：TTL 依定位精度而定，精確結果可長期重用，概略結果較快過期
+_GEOCODE_CACHE_TTL_BY_CONFIDENCE = {
+    "ROOFTOP": 7 * 86400,
+    "RANGE_INTERPOLATED": 7 * 86400,
+    "GEOMETRIC_CENTER": 86400,
+    "APPROXIMATE": 3600,
+}
+_GEOCODE_CACHE_DEFAULT_TTL = 3600
+_GEO_CACHE = ResponseCache(ttl=7 * 86400)
+
+
+def _get_cached_geocode(
+    address: str,
+    language: str,
+    on_stale: Optional[Callable[[], Awaitable[Any]]] = None
+) -> Optional[GeocodeResult]:
+    """從快取取得地理編碼結果；提供 on_stale 時，剛過期的結果會先回傳並於背景更新"""
+    cached = _GEO_CACHE.get(on_stale=on_stale, addr=address, lang=language)
+    if cached is None:
+        return None
+    cached.pop("cache_age", None)
+    cached.pop("stale", None)
+    return GeocodeResult(**cached)
+
+
+def _cache_geocode(address: str, language: str, result: Optional[GeocodeResult]) -> None:
+    """快取成功的地理編碼結果（無結果者不快取）"""
+    if result is None:
+        return
+    ttl = _GEOCODE_CACHE_TTL_BY_CONFIDENCE.get(result.confidence, _GEOCODE_CACHE_DEFAULT_TTL)
+    _GEO_CACHE.set(asdict(result), ttl=ttl, addr=address, lang=language)
+
+
+def _build_geocode_params(address: Optional[str], language: str) -> Optional[Dict[str, str]]:
+    """驗證地址並建立 Geocoding API 請求參數；無效時回傳 None"""
     # 驗證輸入
     if not address or not address.strip():
         logger.debug("Empty address provided")
@@ -242,44 +436,75 @@ def geocode_address(address: Optional[str], language: str = "zh-TW") -> Optional
         return None
 
     # 構建請求參數
-    params = {
+    return {
         "address": address,
         "language": language,
         "region": "TW",  # 偏向台灣結果
         "key": api_key
     }
 
+
+def _parse_geocode_response(response: httpx.Response, address: str) -> Optional[GeocodeResult]:
+    """解析 Google Geocoding API 回應"""
+    if response.status_code != 200:
+        logger.warning(f"Geocoding API returned {response.status_code}")
+        return None
+
+    data = orjson.loads(response.content)
+    status = data.get("status", "UNKNOWN")
+
+    if status != "OK":
+        if status == "ZERO_RESULTS":
+            logger.debug(f"No results found for address: {address}")
+        else:
+            error_msg = data.get("error_message", f"API status: {status}")
+            logger.warning(f"Geocoding failed: {error_msg}")
+        return None
+
+    results = data.get("results", [])
+    if not results:
+        logger.debug("No results in API response")
+        return None
+
+    # 取第一個結果
+    result = results[0]
+    return _parse_geocoding_result(result)
+
+
+def geocode_address(address: Optional[str], language: str = "zh-TW") -> Optional[GeocodeResult]:
+    """
+    地址/地名 → 座標 (Google Geocoding API)
+
+    Args:
+        address: 地址或地名
+        language: 語言代碼，預設 zh-TW
+
+    Returns:
+        GeocodeResult 或 None（編碼失敗）
+
+    Note:
+        使用 Google Geocoding API 進行地址編碼
+        強制使用 zh-TW 語言以確保台灣在地化
+    """
+    params = _build_geocode_params(address, language)
+    if params is None:
+        return None
+    address = params["address"]
+
+    cached = _get_cached_geocode(address, language)
+    if cached is not None:
+        return cached
+
     try:
-        with httpx.Client() as client:
-            response = client.get(
-                "https://maps.googleapis.com/maps/api/geocode/json",
-                params=params,
-                timeout=10.0
-            )
-
-            if response.status_code != 200:
-                logger.warning(f"Geocoding API returned {response.status_code}")
-                return None
-
-            data = response.json()
-            status = data.get("status", "UNKNOWN")
-
-            if status != "OK":
-                if status == "ZERO_RESULTS":
-                    logger.debug(f"No results found for address: {address}")
-                else:
-                    error_msg = data.get("error_message", f"API status: {status}")
-                    logger.warning(f"Geocoding failed: {error_msg}")
-                return None
-
-            results = data.get("results", [])
-            if not results:
-                logger.debug("No results in API response")
-                return None
-
-            # 取第一個結果
-            result = results[0]
-            return _parse_geocoding_result(result)
+        client = _get_http_client()
+        response = client.get(
+            "https://maps.googleapis.com/maps/api/geocode/json",
+            params=params,
+            timeout=10.0
+        )
+        result = _parse_geocode_response(response, address)
+        _cache_geocode(address, language, result)
+        return result
 
     except httpx.TimeoutException:
         logger.warning(f"Geocoding request timeout for address: {address}")
@@ -292,6 +517,87 @@ def geocode_address(address: Optional[str], language: str = "zh-TW") -> Optional
         return None
 
 
+async def geocode_address_async(address: Optional[str], language: str = "zh-TW") -> Optional[GeocodeResult]:
+    """
+    地址/地名 → 座標（非同步版本）
+
+    參數與回傳值同 geocode_address，使用共用的 httpx.AsyncClient，
+    不會阻塞事件迴圈。快取剛過期時先回傳舊結果，並於背景重新查詢。
+    """
+    params = _build_geocode_params(address, language)
+    if params is None:
+        return None
+    address = params["address"]
+
+    cached = _get_cached_geocode(
+        address, language, on_stale=lambda: _fetch_geocode_async(params, language)
+    )
+    if cached is not None:
+        return cached
+
+    return await _fetch_geocode_async(params, language)
+
+
+async def _fetch_geocode_async(params: Dict[str, str], language: str) -> Optional[GeocodeResult]:
+    """呼叫 Google Geocoding API 並快取成功結果（非同步）"""
+    address = params["address"]
+
+    try:
+        client = _get_async_http_client()
+        response = await client.get(
+            "https://maps.googleapis.com/maps/api/geocode/json",
+            params=params,
+            timeout=10.0
+        )
+        result = _parse_geocode_response(response, address)
+        _cache_geocode(address, language, result)
+        return result
+
+    except httpx.TimeoutException:
+        logger.warning(f"Geocoding request timeout for address: {address}")
+        return None
+    except httpx.RequestError as e:
+        logger.warning(f"Geocoding request failed: {e}")
+        return None
+    except Exception as e:
+        logger.error(f"Unexpected error in geocoding: {e}")
+        return None
+
+
+async def geocode_addresses(
+    addresses: List[Optional[str]],
+    language: str = "zh-TW",
+    concurrency: int = 10
+) -> List[Optional[GeocodeResult]]:
+    """
+    批次地址 → 座標
+
+    Args:
+        addresses: 地址列表
+        language: 語言代碼，預設 zh-TW
+        concurrency: 同時進行的 API 請求上限（避免超出 Google 配額）
+
+    Returns:
+        與輸入順序對應的 GeocodeResult 或 None 列表
+
+    Note:
+        批次內重複的地址只查詢一次，已快取的地址不發出請求
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _geocode_one(address: Optional[str]) -> Optional[GeocodeResult]:
+        async with semaphore:
+            return await geocode_address_async(address, language=language)
+
+    unique_addresses = list(dict.fromkeys(
+        address.strip() if address else address for address in addresses
+    ))
+    results = await asyncio.gather(*(_geocode_one(address) for address in unique_addresses))
+    resolved = dict(zip(unique_addresses, results))
+
+    return [resolved[address.strip() if address else address] for address in addresses]
+
+
 def _parse_geocoding_result(result: Dict[str, Any]) -> Optional[GeocodeResult]:
     """
     解析 Google Geocoding API 結果
@@ -349,6 +655,17 @@ def _parse_geocoding_result(result: Dict[str, Any]) -> Optional[GeocodeResult]:
         return None
 
 
+# 地址組件類型 → (優先順序, 欄位)；同一組件符合多個類型時取優先順序最小者
+_ADDRESS_TYPE_FIELDS: Dict[str, Tuple[int, str]] = {
+    "country": (0, "country"),
+    "administrative_area_level_1": (1, "city"),  # 在台灣，這通常是縣市
+    "administrative_area_level_3": (2, "district"),  # 在台灣，這通常是區
+    "route": (3, "street"),  # 道路名稱
+    "street_number": (4, "street_number"),  # 門牌號碼
+    "postal_code": (5, "postal_code"),  # 郵遞區號
+}
+
+
 def _parse_address_components(components: List[Dict[str, Any]]) -> Dict[str, str]:
     """
     解析 Google Geocoding API 的地址組件
@@ -369,27 +686,15 @@ def _parse_address_components(components: List[Dict[str, Any]]) -> Dict[str, str
     }
 
     for component in components:
-        long_name = component.get("long_name", "")
-        types = component.get("types", [])
-
-        # 根據類型分類組件
-        if "country" in types:
-            parsed["country"] = long_name
-        elif "administrative_area_level_1" in types:
-            # 在台灣，這通常是縣市
-            parsed["city"] = long_name
-        elif "administrative_area_level_3" in types:
-            # 在台灣，這通常是區
-            parsed["district"] = long_name
-        elif "route" in types:
-            # 道路名稱
-            parsed["street"] = long_name
-        elif "street_number" in types:
-            # 門牌號碼
-            parsed["street_number"] = long_name
-        elif "postal_code" in types:
-            # 郵遞區號
-            parsed["postal_code"] = long_name
+        # 一個組件可能有多個類型，依 _ADDRESS_TYPE_FIELDS 的優先順序取最高者
+        best = None
+        for component_type in component.get("types", ()):
+            candidate = _ADDRESS_TYPE_FIELDS.get(component_type)
+            if candidate is not None and (best is None or candidate < best):
+                best = candidate
+
+        if best is not None:
+            parsed[best[1]] = component.get("long_name", "")
 
     return parsed
 
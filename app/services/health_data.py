@@ -5,10 +5,11 @@ Service for loading and managing health information from YAML data files
 
 import yaml
 import logging
+import time
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
-from functools import lru_cache
+from functools import lru_cache, wraps
 
 from app.domain.models_extended import (
     HealthTopic, HealthResource, VaccinationInfo, InsuranceInfo,
@@ -20,6 +21,29 @@ from app.domain.models_extended import (
 
 logger = logging.getLogger(__name__)
 
+# 優先使用 libyaml 的 C 解析器（輸出與 SafeLoader 相同，速度快數倍）
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+if _YAML_LOADER is yaml.SafeLoader:
+    logger.warning("PyYAML built without libyaml; falling back to the pure-Python SafeLoader")
+
+
+def _cached_response(builder):
+    """快取 get_* 方法建立的回應物件，於 _cache_timeout 秒內重複使用同一份"""
+    name = builder.__name__
+
+    @wraps(builder)
+    def wrapper(self):
+        now = time.monotonic()
+        cached = self._response_cache.get(name)
+        if cached is not None and now - cached[0] < self._cache_timeout:
+            return cached[1]
+
+        response = builder(self)
+        self._response_cache[name] = (now, response)
+        return response
+
+    return wrapper
+
 
 class HealthDataService:
     """健康資訊資料服務"""
@@ -38,8 +62,19 @@ class HealthDataService:
         else:
             self.data_path = Path(data_path)
 
+        # 已建立的回應物件快取（方法名稱 → (建立時間, 回應)）
         self._cache_timeout = 300  # 5分鐘快取
-        self._last_load_time = {}
+        self._response_cache: Dict[str, Tuple[float, Any]] = {}
+
+        # 資料檔為靜態內容，建構時一次載入（搭配單例，各請求共用同一份解析結果）
+        self._health_topics_data = self._load_yaml_file("health_topics.yaml")
+        self._health_resources_data = self._load_yaml_file("health_resources.yaml")
+        self._vaccination_data = self._load_yaml_file("vaccination_schedule.yaml")
+        self._nhi_data = self._load_yaml_file("nhi_info.yaml")
+
+        # 清單型資料於載入時一次驗證為模型，格式錯誤在啟動時即記錄，查詢時直接取用欄位
+        self._health_topics = self._parse_health_topics(self._health_topics_data)
+        self._health_resources = self._parse_health_resources(self._health_resources_data)
 
     def _load_yaml_file(self, filename: str) -> Dict[str, Any]:
         """載入YAML檔案"""
@@ -50,8 +85,9 @@ class HealthDataService:
             return {}
 
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = yaml.safe_load(f) or {}
+            # 以位元組讀取，由 libyaml 直接處理 UTF-8
+            with open(file_path, 'rb') as f:
+                data = yaml.load(f, Loader=_YAML_LOADER) or {}
                 logger.info(f"Loaded health data from {filename}")
                 return data
         except yaml.YAMLError as e:
@@ -71,30 +107,9 @@ class HealthDataService:
         else:
             return 3
 
-    @lru_cache(maxsize=32)
-    def _load_health_topics(self) -> Dict[str, Any]:
-        """載入健康主題資料"""
-        return self._load_yaml_file("health_topics.yaml")
-
-    @lru_cache(maxsize=32)
-    def _load_health_resources(self) -> Dict[str, Any]:
-        """載入健康資源資料"""
-        return self._load_yaml_file("health_resources.yaml")
-
-    @lru_cache(maxsize=32)
-    def _load_vaccination_schedule(self) -> Dict[str, Any]:
-        """載入疫苗接種資料"""
-        return self._load_yaml_file("vaccination_schedule.yaml")
-
-    @lru_cache(maxsize=32)
-    def _load_nhi_info(self) -> Dict[str, Any]:
-        """載入健保資訊"""
-        return self._load_yaml_file("nhi_info.yaml")
-
-    def get_health_topics(self) -> HealthTopicsResponse:
-        """取得健康主題清單"""
+    def _parse_health_topics(self, data: Dict[str, Any]) -> List[HealthTopic]:
+        """將健康主題 YAML 資料驗證為 HealthTopic 模型清單"""
         try:
-            data = self._load_health_topics()
             topics_data = data.get("health_topics", [])
 
             topics = []
@@ -109,37 +124,26 @@ class HealthDataService:
                     url=topic_data.get("url", ""),
                     category=topic_data.get("category", ""),
                     priority=priority_value,
-                    keywords=topic_data.get("keywords", []),
-                    content_points=topic_data.get("content_points", [])
+                    keywords=topic_data.get("keywords") or [],
+                    content_points=topic_data.get("content_points") or []
                 )
                 topics.append(topic)
 
-            return HealthTopicsResponse(
-                topics=topics,
-                total=len(topics),
-                language="zh-TW",
-                last_updated=datetime.now().isoformat()
-            )
+            return topics
 
         except Exception as e:
-            logger.error(f"Error getting health topics: {e}")
-            return HealthTopicsResponse(
-                topics=[],
-                total=0,
-                language="zh-TW",
-                last_updated=datetime.now().isoformat()
-            )
+            logger.error(f"Error parsing health topics: {e}")
+            return []
 
-    def get_health_resources(self) -> HealthResourcesResponse:
-        """取得健康資源清單"""
+    def _parse_health_resources(self, data: Dict[str, Any]) -> List[HealthResource]:
+        """將健康資源 YAML 資料驗證為 HealthResource 模型清單"""
         try:
-            data = self._load_health_resources()
-
             resources = []
-            categories = set()
+
+            resources_data = data.get("health_resources") or {}
 
             # Process government agencies
-            gov_agencies = data.get("health_resources", {}).get("government_agencies", [])
+            gov_agencies = resources_data.get("government_agencies") or []
             for agency_data in gov_agencies:
                 resource = HealthResource(
                     id=agency_data.get("id", ""),
@@ -149,14 +153,13 @@ class HealthDataService:
                     type="government",
                     language="zh-TW",
                     category=agency_data.get("category", "primary"),
-                    contact=agency_data.get("contact", {}),
-                    services=agency_data.get("services", [])
+                    contact=agency_data.get("contact") or {},
+                    services=agency_data.get("services") or []
                 )
                 resources.append(resource)
-                categories.add(resource.category)
 
             # Process medical institutions if present
-            medical_institutions = data.get("health_resources", {}).get("medical_institutions", [])
+            medical_institutions = resources_data.get("medical_institutions") or []
             for inst_data in medical_institutions:
                 resource = HealthResource(
                     id=inst_data.get("id", ""),
@@ -166,32 +169,44 @@ class HealthDataService:
                     type="medical",
                     language="zh-TW",
                     category=inst_data.get("category", "hospital"),
-                    contact=inst_data.get("contact", {}),
-                    services=inst_data.get("services", [])
+                    contact=inst_data.get("contact") or {},
+                    services=inst_data.get("services") or []
                 )
                 resources.append(resource)
-                categories.add(resource.category)
 
-            return HealthResourcesResponse(
-                resources=resources,
-                total=len(resources),
-                language="zh-TW",
-                categories=list(categories)
-            )
+            return resources
 
         except Exception as e:
-            logger.error(f"Error getting health resources: {e}")
-            return HealthResourcesResponse(
-                resources=[],
-                total=0,
-                language="zh-TW",
-                categories=[]
-            )
+            logger.error(f"Error parsing health resources: {e}")
+            return []
 
+    @_cached_response
+    def get_health_topics(self) -> HealthTopicsResponse:
+        """取得健康主題清單（主題已於載入時驗證，直接組裝回應不再重新驗證）"""
+        topics = list(self._health_topics)
+        return HealthTopicsResponse.model_construct(
+            topics=topics,
+            total=len(topics),
+            language="zh-TW",
+            last_updated=datetime.now().isoformat()
+        )
+
+    @_cached_response
+    def get_health_resources(self) -> HealthResourcesResponse:
+        """取得健康資源清單（資源已於載入時驗證，直接組裝回應不再重新驗證）"""
+        resources = list(self._health_resources)
+        return HealthResourcesResponse.model_construct(
+            resources=resources,
+            total=len(resources),
+            language="zh-TW",
+            categories=list({resource.category for resource in resources})
+        )
+
+    @_cached_response
     def get_vaccinations(self) -> VaccinationsResponse:
         """取得疫苗接種資訊"""
         try:
-            data = self._load_vaccination_schedule()
+            data = self._vaccination_data
             vaccination_schedules = data.get("vaccination_schedules", {})
 
             vaccinations = {}
@@ -272,10 +287,11 @@ class HealthDataService:
                 disclaimer="疫苗接種建議可能因個人健康狀況而異，請諮詢醫療專業人員"
             )
 
+    @_cached_response
     def get_insurance_info(self) -> InsuranceResponse:
         """取得健保資訊"""
         try:
-            data = self._load_nhi_info()
+            data = self._nhi_data
             nhi_data = data.get("nhi_general_info", {})
 
             # Basic info
@@ -395,6 +411,7 @@ class HealthDataService:
 
 
 # Dependency injection function
+@lru_cache(maxsize=1)
 def get_health_data_service() -> HealthDataService:
-    """獲取健康資料服務實例（用於依賴注入）"""
+    """獲取健康資料服務實例（用於依賴注入，全行程共用單一實例）"""
     return HealthDataService()
\ No newline at end of file
@@ -4,17 +4,48 @@
 用於驗證 Google Places 結果是否為健保特約院所
 """
 
+import hashlib
 import json
+import os
+import pickle
 import re
 import unicodedata
+from collections import Counter
 from dataclasses import dataclass
-from typing import List, Optional, Dict, Any
+from functools import lru_cache
+from typing import List, Optional, Dict, Any, Tuple, FrozenSet
 from pathlib import Path
 
 
-@dataclass
+# 預先編譯的正規表示式（正規化與地址關鍵字擷取在比對迴圈中大量呼叫）
+_WHITESPACE_RE = re.compile(r'\s+')
+_PUNCTUATION_RE = re.compile(r'[（）()【】\[\]「」""''、，。！？：；]')
+_AREA_RE = re.compile(r'([\u4e00-\u9fff]+[区市])')
+_ROAD_RE = re.compile(r'([\u4e00-\u9fff]+[路街道巷弄])')
+_SECTION_RE = re.compile(r'([一二三四五六七八九十\d]+段)')
+
+# 各正規表示式的結尾字元；地址不含這些字元時不必執行對應的 regex
+_AREA_SUFFIXES = frozenset('区市')
+_ROAD_SUFFIXES = frozenset('路街道巷弄')
+
+# 簡化的繁簡轉換對應表（str.translate 用）
+_TRADITIONAL_TO_SIMPLIFIED = str.maketrans({
+    '臺': '台', '醫': '医', '學': '学', '國': '国', '總': '总',
+    '區': '区', '號': '号', '榮': '荣', '軍': '军', '內': '内',
+    '灣': '湾', '診': '诊', '療': '疗', '縣': '县', '鄉': '乡',
+    '鎮': '镇', '義': '义', '設': '设'
+})
+
+# 預先解析快取指紋：取自本模組原始碼（正規化程式與常數）及 Unicode 資料版本，
+# 任一改變即令舊快取失效，不必手動遞增版本號
+_REGISTRY_CACHE_VERSION = hashlib.sha256(
+    Path(__file__).read_bytes() + unicodedata.unidata_version.encode('ascii')
+).hexdigest()
+
+
+@dataclass(slots=True, frozen=True)
 class NHIARegistryEntry:
-    """健保特約醫療院所記錄"""
+    """健保特約醫療院所記錄（載入後不可變，以 __slots__ 省去每筆 __dict__）"""
     hospital_code: str
     hospital_name: str
     address: str
@@ -24,6 +55,36 @@ class NHIARegistryEntry:
     is_contracted: bool = True
 
 
+class NHIARegistry(list):
+    """
+    健保院所名冊（list 子類別，建立後視為唯讀）
+
+    - normalized_names / normalized_addresses: 與名冊逐筆對應的正規化名稱與地址
+      欄位（平行陣列），比對迴圈只讀取這兩欄，最佳結果再依索引取回院所記錄
+    - address_keywords: 與名冊逐筆對應的地址關鍵字，比對時不必逐筆重新擷取
+    - exact_index: 「正規化名稱 + 正規化地址」→ 院所的精確比對索引；名稱與地址
+      皆完全符合即為最高分 1.0，比對時可直接命中而不必逐筆計分
+    """
+
+    def __init__(self, entries=()):
+        super().__init__(entries)
+        self.normalized_names: List[str] = [
+            normalize_hospital_name(entry.hospital_name) for entry in self
+        ]
+        self.normalized_addresses: List[str] = [
+            normalize_address(entry.address) for entry in self
+        ]
+        self.address_keywords: List[Tuple[str, ...]] = [
+            _extract_keywords_from_normalized(norm_addr) for norm_addr in self.normalized_addresses
+        ]
+        self.exact_index: Dict[Tuple[str, str], NHIARegistryEntry] = {}
+        for entry, norm_name, norm_addr in zip(self, self.normalized_names, self.normalized_addresses):
+            if entry.address:
+                key = (norm_name, norm_addr)
+                # 同分時逐筆掃描取名冊中較前者，索引保持一致
+                self.exact_index.setdefault(key, entry)
+
+
 def normalize_text(text: str) -> str:
     """
     文字正規化處理
@@ -36,33 +97,23 @@ def normalize_text(text: str) -> str:
         return ""
 
     # 移除多餘空白
-    text = re.sub(r'\s+', '', text)
+    text = _WHITESPACE_RE.sub('', text)
 
     # 移除常見標點符號和括號內容
-    text = re.sub(r'[（）()【】\[\]「」""''、，。！？：；]', '', text)
+    text = _PUNCTUATION_RE.sub('', text)
 
     # 轉為小寫
     text = text.lower()
 
-    # Unicode 正規化 (NFD -> NFC)
-    text = unicodedata.normalize('NFC', text)
-
-    # 簡化的繁簡轉換對應表
-    traditional_to_simplified = {
-        '臺': '台', '醫': '医', '學': '学', '國': '国', '總': '总',
-        '區': '区', '號': '号', '榮': '荣', '軍': '军', '湖': '湖',
-        '內': '内', '灣': '湾', '診': '诊', '療': '疗', '院': '院',
-        '民': '民', '路': '路', '段': '段', '巷': '巷', '弄': '弄',
-        '市': '市', '縣': '县', '鄉': '乡', '鎮': '镇', '村': '村',
-        '義': '义', '設': '设', '附': '附', '立': '立', '灣': '湾'
-    }
+    # Unicode 正規化 (NFD -> NFC)；名冊資料多半已是 NFC，先檢查以免複製字串
+    if not unicodedata.is_normalized('NFC', text):
+        text = unicodedata.normalize('NFC', text)
 
-    for trad, simp in traditional_to_simplified.items():
-        text = text.replace(trad, simp)
-
-    return text
+    # 繁簡轉換（單次掃描）
+    return text.translate(_TRADITIONAL_TO_SIMPLIFIED)
 
 
+@lru_cache(maxsize=8192)
 def normalize_hospital_name(name: str) -> str:
     """
     醫院名稱正規化
@@ -98,6 +149,7 @@ def normalize_hospital_name(name: str) -> str:
     return normalized
 
 
+@lru_cache(maxsize=8192)
 def normalize_address(address: str) -> str:
     """
     地址正規化
@@ -106,48 +158,77 @@ def normalize_address(address: str) -> str:
     if not address:
         return ""
 
-    # 基本正規化
-    normalized = normalize_text(address)
-
-    # 地址特定轉換
-    address_mappings = {
-        '台北市': '台北市',
-        '新北市': '新北市',
-        '桃园市': '桃园市',
-        '台中市': '台中市',
-        '台南市': '台南市',
-        '高雄市': '高雄市'
-    }
-
-    for variant, standard in address_mappings.items():
-        normalized = normalized.replace(variant, standard)
-
-    return normalized
+    # 基本正規化（縣市名稱已由繁簡轉換統一，無需額外對應）
+    return normalize_text(address)
 
 
-def extract_address_keywords(address: str) -> List[str]:
+def extract_address_keywords(address: str) -> Tuple[str, ...]:
     """
-    提取地址關鍵字用於比對
+    提取地址關鍵字用於比對（回傳 tuple 以便安全地快取共用）
     """
-    normalized = normalize_address(address)
+    return _extract_keywords_from_normalized(normalize_address(address))
 
+
+@lru_cache(maxsize=8192)
+def _extract_keywords_from_normalized(normalized: str) -> Tuple[str, ...]:
+    """自已正規化的地址提取關鍵字（呼叫端已正規化時直接使用，免重複正規化）"""
     # 提取關鍵詞：區域、路名、段號等
     keywords = []
 
     # 區域名稱 (XX區、XX市)
-    area_match = re.search(r'([\u4e00-\u9fff]+[区市])', normalized)
-    if area_match:
-        keywords.append(area_match.group(1))
+    if not _AREA_SUFFIXES.isdisjoint(normalized):
+        area_match = _AREA_RE.search(normalized)
+        if area_match:
+            keywords.append(area_match.group(1))
 
     # 路名 (XX路、XX街)
-    road_matches = re.findall(r'([\u4e00-\u9fff]+[路街道巷弄])', normalized)
-    keywords.extend(road_matches)
+    if not _ROAD_SUFFIXES.isdisjoint(normalized):
+        keywords.extend(_ROAD_RE.findall(normalized))
 
     # 段號
-    section_matches = re.findall(r'([一二三四五六七八九十\d]+段)', normalized)
-    keywords.extend(section_matches)
+    if '段' in normalized:
+        keywords.extend(_SECTION_RE.findall(normalized))
+
+    return tuple(keywords)
+
 
-    return keywords
+# 比對分數上限（名稱 0.6 + 地址 0.4），供掃描時剪枝
+_MAX_ADDRESS_SCORE = 0.4
+_MAX_MATCH_SCORE = 0.6 + _MAX_ADDRESS_SCORE
+
+
+def _name_match_score(norm_place_name: str, norm_registry_name: str) -> float:
+    """名稱比對分數（權重 0.6），輸入為已正規化的名稱"""
+    if norm_place_name == norm_registry_name:
+        return 0.6  # 完全符合
+    if norm_place_name in norm_registry_name or norm_registry_name in norm_place_name:
+        return 0.4  # 部分符合
+    if any(word in norm_registry_name for word in norm_place_name.split() if len(word) > 1):
+        return 0.2  # 關鍵字符合
+    return 0.0
+
+
+def _address_match_score(norm_place_addr: str, place_keywords: Tuple[str, ...],
+                         place_keyword_set: FrozenSet[str],
+                         norm_registry_addr: str, registry_keywords: Tuple[str, ...]) -> float:
+    """
+    地址比對分數（權重 0.4）
+
+    輸入為已正規化的地址與預先擷取的關鍵字；查詢端關鍵字集合於整次掃描共用
+    """
+    if not (norm_place_addr and norm_registry_addr):
+        return 0.0
+
+    if norm_place_addr == norm_registry_addr:
+        return 0.4  # 完全符合
+
+    # 檢查關鍵字符合
+    if place_keywords and registry_keywords:
+        common_count = len(place_keyword_set.intersection(registry_keywords))
+        keyword_ratio = common_count / max(len(place_keywords), len(registry_keywords))
+        return 0.4 * keyword_ratio
+
+    return 0.0
 
 
 def calculate_match_score(place_name: str, place_address: str,
@@ -164,37 +245,57 @@ def calculate_match_score(place_name: str, place_address: str,
     Returns:
         float: 比對分數，1.0 為完全符合
     """
-    score = 0.0
-
-    # 名稱比對 (權重 0.6)
-    norm_place_name = normalize_hospital_name(place_name)
-    norm_registry_name = normalize_hospital_name(registry_name)
-
-    if norm_place_name == norm_registry_name:
-        score += 0.6  # 完全符合
-    elif norm_place_name in norm_registry_name or norm_registry_name in norm_place_name:
-        score += 0.4  # 部分符合
-    elif any(word in norm_registry_name for word in norm_place_name.split() if len(word) > 1):
-        score += 0.2  # 關鍵字符合
-
-    # 地址比對 (權重 0.4)
-    if place_address and registry_address:
-        norm_place_addr = normalize_address(place_address)
-        norm_registry_addr = normalize_address(registry_address)
+    name_score = _name_match_score(
+        normalize_hospital_name(place_name),
+        normalize_hospital_name(registry_name)
+    )
+    norm_place_addr = normalize_address(place_address)
+    norm_registry_addr = normalize_address(registry_address)
+    place_keywords = _extract_keywords_from_normalized(norm_place_addr)
+    return name_score + _address_match_score(
+        norm_place_addr, place_keywords, frozenset(place_keywords),
+        norm_registry_addr, _extract_keywords_from_normalized(norm_registry_addr)
+    )
+
+
+def _registry_cache_path(path: Path) -> Path:
+    """名冊預先解析快取檔路徑（與 JSON 同目錄）"""
+    return path.with_name(path.name + ".pkl")
+
+
+def _load_registry_cache(path: Path) -> Optional[NHIARegistry]:
+    """讀取比 JSON 新的預先解析快取；不存在、過期或損毀時回傳 None"""
+    cache_path = _registry_cache_path(path)
+    try:
+        if cache_path.stat().st_mtime_ns <= path.stat().st_mtime_ns:
+            return None
+        # 快取檔由本服務自行寫入，與名冊 JSON 位於同一受信任目錄
+        with open(cache_path, 'rb') as f:
+            cached = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError,
+            TypeError, ValueError):
+        return None
 
-        if norm_place_addr == norm_registry_addr:
-            score += 0.4  # 完全符合
-        else:
-            # 檢查關鍵字符合
-            place_keywords = extract_address_keywords(place_address)
-            registry_keywords = extract_address_keywords(registry_address)
+    if not (isinstance(cached, tuple) and len(cached) == 2
+            and cached[0] == _REGISTRY_CACHE_VERSION
+            and isinstance(cached[1], NHIARegistry)):
+        return None
+    return cached[1]
 
-            if place_keywords and registry_keywords:
-                common_keywords = set(place_keywords) & set(registry_keywords)
-                keyword_ratio = len(common_keywords) / max(len(place_keywords), len(registry_keywords))
-                score += 0.4 * keyword_ratio
 
-    return score
+def _write_registry_cache(path: Path, registry: NHIARegistry) -> None:
+    """寫入預先解析快取（先寫暫存檔再替換；目錄不可寫時略過）"""
+    cache_path = _registry_cache_path(path)
+    tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, 'wb') as f:
+            pickle.dump((_REGISTRY_CACHE_VERSION, registry), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
 
 
 def load_nhia_registry(file_path: str) -> List[NHIARegistryEntry]:
@@ -205,11 +306,17 @@ def load_nhia_registry(file_path: str) -> List[NHIARegistryEntry]:
         file_path: JSON 格式的名冊檔案路徑
 
     Returns:
-        List[NHIARegistryEntry]: 健保院所記錄列表
+        List[NHIARegistryEntry]: 健保院所記錄列表（NHIARegistry，含精確比對索引）
     """
     try:
-        if not Path(file_path).exists():
-            return []
+        path = Path(file_path)
+        if not path.exists():
+            return NHIARegistry()
+
+        # JSON 未更新時直接載入預先解析的名冊與索引
+        cached = _load_registry_cache(path)
+        if cached is not None:
+            return cached
 
         with open(file_path, 'r', encoding='utf-8') as f:
             data = json.load(f)
@@ -231,11 +338,28 @@ def load_nhia_registry(file_path: str) -> List[NHIARegistryEntry]:
                 # 跳過格式錯誤的記錄
                 continue
 
+        registry = NHIARegistry(registry)
+        _write_registry_cache(path, registry)
         return registry
 
     except (FileNotFoundError, json.JSONDecodeError, UnicodeDecodeError):
         # 檔案不存在、JSON 格式錯誤或編碼錯誤時返回空列表
-        return []
+        return NHIARegistry()
+
+
+@lru_cache(maxsize=4)
+def _load_registry_for_version(file_path: str, mtime_ns: int) -> NHIARegistry:
+    """依檔案路徑與修改時間快取已載入的名冊（mtime 改變即視為新版本）"""
+    return load_nhia_registry(file_path)
+
+
+def _get_registry(file_path: str) -> NHIARegistry:
+    """取得名冊；JSON 未更新時重用已載入的名冊，不必每次請求重新讀檔"""
+    try:
+        mtime_ns = os.stat(file_path).st_mtime_ns
+    except OSError:
+        return NHIARegistry()
+    return _load_registry_for_version(file_path, mtime_ns)
 
 
 def match_from_registry(place: 'PlaceResult', registry: List[NHIARegistryEntry],
@@ -254,22 +378,49 @@ def match_from_registry(place: 'PlaceResult', registry: List[NHIARegistryEntry],
     if not registry:
         return None
 
-    best_match = None
+    if not isinstance(registry, NHIARegistry):
+        registry = NHIARegistry(registry)
+
+    norm_place_name = normalize_hospital_name(place.name)
+    norm_place_addr = normalize_address(place.address) if place.address else ""
+
+    # 快速路徑：名稱與地址皆完全符合（最高分）時直接由索引命中
+    if place.address and threshold <= 1.0:
+        exact_match = registry.exact_index.get((norm_place_name, norm_place_addr))
+        if exact_match is not None:
+            return exact_match
+
+    # 查詢端地址關鍵字整次掃描只擷取一次
+    place_keywords = _extract_keywords_from_normalized(norm_place_addr)
+    place_keyword_set = frozenset(place_keywords)
+
+    best_index = None
     best_score = 0.0
 
-    for entry in registry:
-        score = calculate_match_score(
-            place.name,
-            place.address,
-            entry.hospital_name,
-            entry.address
+    # 只掃描預先正規化的名稱與地址欄位，最後才取回最佳院所記錄
+    for i, (norm_registry_name, norm_registry_addr) in enumerate(
+        zip(registry.normalized_names, registry.normalized_addresses)
+    ):
+        name_score = _name_match_score(norm_place_name, norm_registry_name)
+
+        # 地址最多再加 0.4；上限仍達不到門檻或無法超越目前最佳者時略過地址比對
+        upper_bound = name_score + _MAX_ADDRESS_SCORE
+        if upper_bound < threshold or upper_bound <= best_score:
+            continue
+
+        score = name_score + _address_match_score(
+            norm_place_addr, place_keywords, place_keyword_set,
+            norm_registry_addr, registry.address_keywords[i]
         )
 
         if score > best_score and score >= threshold:
             best_score = score
-            best_match = entry
+            best_index = i
+            if best_score >= _MAX_MATCH_SCORE:
+                # 已達最高分，後續同分者不會取代
+                break
 
-    return best_match
+    return registry[best_index] if best_index is not None else None
 
 
 def enhance_places_with_nhia_info(places: List['PlaceResult'],
@@ -289,50 +440,39 @@ def enhance_places_with_nhia_info(places: List['PlaceResult'],
         # 使用預設的健保名冊檔案路徑
         registry_file_path = "data/nhia_registry.json"
 
-    registry = load_nhia_registry(registry_file_path)
+    registry = _get_registry(registry_file_path)
 
     enhanced_results = []
     for place in places:
-        # 基本場所資訊
-        result = {
+        # 嘗試健保比對（失敗不影響主要功能）
+        try:
+            nhia_match = match_from_registry(place, registry)
+        except Exception:
+            nhia_match = None
+
+        phone = place.phone or (nhia_match.phone if nhia_match else None)
+
+        # 基本場所資訊、可選欄位與健保資訊一次建構
+        enhanced_results.append({
             "id": place.id,
             "name": place.name,
             "address": place.address,
             "latitude": place.latitude,
             "longitude": place.longitude,
-            "distance_meters": place.distance_meters
-        }
-
-        # 可選欄位
-        if place.phone:
-            result["phone"] = place.phone
-        if place.rating is not None:
-            result["rating"] = place.rating
-        if place.is_open_now is not None:
-            result["is_open_now"] = place.is_open_now
-        if place.opening_hours:
-            result["opening_hours"] = place.opening_hours
-        if place.business_status != "UNKNOWN":
-            result["business_status"] = place.business_status
-
-        # 嘗試健保比對
-        try:
-            nhia_match = match_from_registry(place, registry)
-            if nhia_match:
-                result["is_contracted"] = nhia_match.is_contracted
-                result["hospital_code"] = nhia_match.hospital_code
-                result["nhia_type"] = nhia_match.type
-                result["nhia_department"] = nhia_match.department
-                if nhia_match.phone and not place.phone:
-                    result["phone"] = nhia_match.phone
-            else:
-                result["is_contracted"] = None
-
-        except Exception:
-            # 健保比對失敗不影響主要功能
-            result["is_contracted"] = None
-
-        enhanced_results.append(result)
+            "distance_meters": place.distance_meters,
+            **({"phone": phone} if phone else {}),
+            **({"rating": place.rating} if place.rating is not None else {}),
+            **({"is_open_now": place.is_open_now} if place.is_open_now is not None else {}),
+            **({"opening_hours": place.opening_hours} if place.opening_hours else {}),
+            **({"business_status": place.business_status}
+               if place.business_status != "UNKNOWN" else {}),
+            **({
+                "is_contracted": nhia_match.is_contracted,
+                "hospital_code": nhia_match.hospital_code,
+                "nhia_type": nhia_match.type,
+                "nhia_department": nhia_match.department
+            } if nhia_match else {"is_contracted": None})
+        })
 
     return enhanced_results
 
@@ -355,23 +495,20 @@ def get_nhia_statistics(registry: List[NHIARegistryEntry]) -> Dict[str, Any]:
             "contracted_count": 0
         }
 
-    # 按類型統計
-    type_counts = {}
-    for entry in registry:
-        type_counts[entry.type] = type_counts.get(entry.type, 0) + 1
-
-    # 按科別統計
-    dept_counts = {}
+    # 單次掃描同時統計類型、科別與特約院所數量
+    type_counts = Counter()
+    dept_counts = Counter()
+    contracted_count = 0
     for entry in registry:
-        dept_counts[entry.department] = dept_counts.get(entry.department, 0) + 1
-
-    # 特約院所數量
-    contracted_count = sum(1 for entry in registry if entry.is_contracted)
+        type_counts[entry.type] += 1
+        dept_counts[entry.department] += 1
+        if entry.is_contracted:
+            contracted_count += 1
 
     return {
         "total_count": len(registry),
-        "by_type": type_counts,
-        "by_department": dept_counts,
+        "by_type": dict(type_counts),
+        "by_department": dict(dept_counts),
         "contracted_count": contracted_count,
         "contract_ratio": contracted_count / len(registry) if registry else 0
     }
\ No newline at end of file
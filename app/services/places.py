@@ -4,19 +4,28 @@ Google Places API 服務模組
 包含台灣在地化設定與錯誤處理
 """
 
-import json
+import asyncio
+import heapq
+import importlib.util
 import math
-from dataclasses import dataclass
-from typing import List, Optional, Dict, Any
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+from operator import attrgetter
+from typing import List, Optional, Dict, Any, Sequence, Tuple, Union
 import httpx
+import orjson
 from app.config import get_settings
-from app.utils.resilience import exponential_backoff_retry, CircuitBreaker
+from app.utils.resilience import exponential_backoff_retry_async, AIMDConcurrencyLimiter
+from app.utils.http_client import LoopBoundAsyncClient
 from app.services.cache import ResponseCache
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class PlaceResult:
-    """醫療院所搜尋結果模型"""
+    """醫療院所搜尋結果模型（不可變；距離於建立時一併填入）"""
     id: str
     name: str
     address: str
@@ -25,22 +34,23 @@ class PlaceResult:
     phone: Optional[str] = None
     rating: Optional[float] = None
     is_open_now: Optional[bool] = None
-    opening_hours: List[str] = None
+    opening_hours: List[str] = field(default_factory=list)
     business_status: str = "UNKNOWN"
     distance_meters: Optional[int] = None
 
-    def __post_init__(self):
-        """後處理初始化"""
-        if self.opening_hours is None:
-            self.opening_hours = []
-
 
 class PlacesAPIError(Exception):
     """Places API 相關錯誤"""
-    def __init__(self, message: str, status_code: int = None, error_type: str = None):
+    def __init__(self, message: str, status_code: int = None, error_type: str = None,
+                 retry_after: Optional[float] = None):
         super().__init__(message)
         self.status_code = status_code
         self.error_type = error_type
+        self.retry_after = retry_after
+
+
+# 地球半徑（公尺）
+_EARTH_RADIUS_METERS = 6371000
 
 
 def calculate_distance(lat1: float, lng1: float, lat2: float, lng2: float) -> int:
@@ -62,12 +72,35 @@ def calculate_distance(lat1: float, lng1: float, lat2: float, lng2: float) -> in
     c = 2 * math.asin(math.sqrt(a))
 
     # 地球半徑（公尺）
-    earth_radius = 6371000
-    distance = earth_radius * c
+    distance = _EARTH_RADIUS_METERS * c
 
     return int(distance)
 
 
+def calculate_distances(lat: float, lng: float,
+                        points: Sequence[Tuple[float, float]]) -> List[int]:
+    """
+    批次計算起點到多個座標的直線距離（公尺）
+
+    與逐一呼叫 calculate_distance 結果相同；起點的弧度與 cos 值只計算一次
+    """
+    lat_rad = math.radians(lat)
+    lng_rad = math.radians(lng)
+    cos_lat = math.cos(lat_rad)
+
+    distances = []
+    for point_lat, point_lng in points:
+        point_lat_rad = math.radians(point_lat)
+        dlat = point_lat_rad - lat_rad
+        dlng = math.radians(point_lng) - lng_rad
+        a = (math.sin(dlat / 2)**2 +
+             cos_lat * math.cos(point_lat_rad) * math.sin(dlng / 2)**2)
+        c = 2 * math.asin(math.sqrt(a))
+        distances.append(int(_EARTH_RADIUS_METERS * c))
+
+    return distances
+
+
 def validate_coordinates(lat: float, lng: float) -> None:
     """驗證座標有效性"""
     if not (-90 <= lat <= 90):
@@ -93,6 +126,332 @@ def parse_opening_hours(opening_hours_data: Dict[str, Any]) -> tuple[Optional[bo
     return is_open_now, weekday_descriptions
 
 
+_PLACES_NEARBY_URL = "https://places.googleapis.com/v1/places:searchNearby"
+_PLACES_FIELD_MASK = (
+    "places.id,places.displayName,places.formattedAddress,"
+    "places.internationalPhoneNumber,places.rating,places.location,"
+    "places.currentOpeningHours,places.businessStatus"
+)
+# 固定標頭設為 client 預設標頭，每次請求只帶 API 金鑰
+_PLACES_STATIC_HEADERS = {
+    "Content-Type": "application/json",
+    "X-Goog-FieldMask": _PLACES_FIELD_MASK
+}
+
+# 非同步連線池：重用到 places.googleapis.com 的 TCP/TLS 連線（有 h2 時走 HTTP/2 多工），
+# 依事件迴圈各自建立（見 app.utils.http_client）
+# 閒置連線保留 5 分鐘：查詢間隔較長時仍可重用，免去 DNS 解析與 TCP/TLS 交握
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+_ASYNC_HTTP_KEEPALIVE_EXPIRY = 300
+_ASYNC_HTTP_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=32,
+                                  keepalive_expiry=_ASYNC_HTTP_KEEPALIVE_EXPIRY)
+_ASYNC_HTTP_TIMEOUT = httpx.Timeout(10.0, connect=2.0)
+_ASYNC_HTTP_CLIENT = LoopBoundAsyncClient(
+    http2=_HTTP2_AVAILABLE,
+    limits=_ASYNC_HTTP_LIMITS,
+    timeout=_ASYNC_HTTP_TIMEOUT,
+    headers=_PLACES_STATIC_HEADERS
+)
+
+# 同時送往 Places API 的請求數以 AIMD 動態控制：順利時逐步放寬，429／5xx／逾時即減半
+_PLACES_CONCURRENCY = AIMDConcurrencyLimiter(initial_limit=4, min_limit=1, max_limit=32)
+
+# 連線／讀取逾時以完全抖動的指數退避重試（Nearby Search 為唯讀查詢，可安全重送）
+_ASYNC_RETRY_MAX = 2
+_ASYNC_RETRY_BASE_DELAY = 0.25
+_ASYNC_RETRY_MAX_DELAY = 2.0
+
+
+def _get_async_http_client() -> httpx.AsyncClient:
+    """取得目前事件迴圈共用的 httpx.AsyncClient（首次使用時建立）"""
+    return _ASYNC_HTTP_CLIENT.get()
+
+
+async def close_async_http_client() -> None:
+    """關閉非同步連線池（應用程式關閉時呼叫）"""
+    await _ASYNC_HTTP_CLIENT.aclose()
+
+
+# 搜尋座標量化至小數第 3 位（約 110 公尺網格）：同一網格的查詢送出相同的搜尋圓心，
+# 結果與快取（見 _NEARBY_CACHE）一致，序列化後的請求內容也可重用
+_NEARBY_GRID_DECIMALS = 3
+
+
+@lru_cache(maxsize=1024)
+def _nearby_request_body(grid_lat: float, grid_lng: float, radius: int, max_result_count: int) -> bytes:
+    """序列化 Nearby Search 請求內容（依量化座標、半徑與結果數重用）"""
+    return orjson.dumps({
+        "includedTypes": ["hospital"],
+        "maxResultCount": max_result_count,
+        "locationRestriction": {
+            "circle": {
+                "center": {
+                    "latitude": grid_lat,
+                    "longitude": grid_lng
+                },
+                "radius": radius
+            }
+        },
+        "languageCode": "zh-TW",
+        "regionCode": "TW"
+    })
+
+
+def _build_nearby_request(lat: float, lng: float, radius: int,
+                          max_results: int) -> Tuple[Dict[str, str], bytes]:
+    """驗證參數並建立 Nearby Search 請求標頭與內容（同步與非同步版本共用；固定標頭見 _PLACES_STATIC_HEADERS）"""
+    # 驗證輸入參數
+    validate_coordinates(lat, lng)
+
+    if radius <= 0 or radius > 50000:
+        raise ValueError(f"Invalid radius: {radius}. Must be between 1 and 50000 meters.")
+
+    settings = get_settings()
+    api_key = settings.google_places_api_key
+
+    # 請求內容（API 限制最多 20 個結果）
+    body = _nearby_request_body(
+        round(lat, _NEARBY_GRID_DECIMALS),
+        round(lng, _NEARBY_GRID_DECIMALS),
+        radius,
+        min(max_results, 20)
+    )
+
+    # 請求標頭（Content-Type 與 FieldMask 由 client 預設標頭提供）
+    headers = {"X-Goog-Api-Key": api_key}
+
+    return headers, body
+
+
+# 配額標頭：Google 前端與代理層使用的名稱不一，依序檢查
+_QUOTA_REMAINING_HEADERS = ("x-goog-quota-remaining", "x-ratelimit-remaining", "ratelimit-remaining")
+_QUOTA_LIMIT_HEADERS = ("x-goog-quota-limit", "x-ratelimit-limit", "ratelimit-limit")
+# 剩餘配額低於上限的此比例時主動暫停，避免送出必定 429 的請求
+_LOW_QUOTA_RATIO = 0.1
+_LOW_QUOTA_PAUSE_SECONDS = 1.0
+# 429 未附 Retry-After 時的暫停秒數
+_DEFAULT_RETRY_AFTER_SECONDS = 1.0
+
+# 暫停送出請求直到此時間點（time.monotonic()）
+_pause_until = 0.0
+
+
+# 傳輸與解析錯誤轉換表：依例外類別的 MRO 查找，子類別（如 ConnectTimeout）對應到最接近的項目
+_TRANSPORT_ERRORS: Dict[type, Tuple[str, str]] = {
+    httpx.TimeoutException: ("Request timeout while connecting to Places API", "TIMEOUT"),
+    httpx.RequestError: ("Network error while connecting to Places API: {error}", "NETWORK_ERROR"),
+    orjson.JSONDecodeError: ("Invalid JSON response from Places API", "INVALID_RESPONSE"),
+}
+_TRANSPORT_ERROR_TYPES = tuple(_TRANSPORT_ERRORS)
+
+
+def _to_places_api_error(error: Exception) -> PlacesAPIError:
+    """將 httpx 傳輸錯誤或 JSON 解析錯誤轉為 PlacesAPIError"""
+    for cls in type(error).__mro__:
+        entry = _TRANSPORT_ERRORS.get(cls)
+        if entry is not None:
+            message, error_type = entry
+            return PlacesAPIError(message.format(error=error), error_type=error_type)
+    raise TypeError(f"Unexpected error type: {type(error).__name__}")
+
+
+def _parse_retry_after(value: str) -> Optional[float]:
+    """解析 Retry-After 標頭（秒數或 HTTP 日期），無法解析時回傳 None"""
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+def _quota_header(headers: httpx.Headers, names: Sequence[str]) -> Optional[float]:
+    """讀取第一個可解析為數值的配額標頭"""
+    for name in names:
+        value = headers.get(name)
+        if value is None:
+            continue
+        try:
+            return float(value)
+        except ValueError:
+            continue
+    return None
+
+
+def _note_rate_limit_headers(response: httpx.Response) -> Optional[float]:
+    """
+    依回應標頭更新暫停時間
+
+    Retry-After 優先；429 未附標頭時暫停預設秒數；否則剩餘配額低於上限 10% 時短暫暫停。
+
+    Returns:
+        本次設定的暫停秒數，未暫停時為 None
+    """
+    global _pause_until
+
+    pause = None
+    retry_after = response.headers.get("retry-after")
+    if retry_after is not None:
+        pause = _parse_retry_after(retry_after)
+    if pause is None and response.status_code == 429:
+        pause = _DEFAULT_RETRY_AFTER_SECONDS
+    if pause is None:
+        remaining = _quota_header(response.headers, _QUOTA_REMAINING_HEADERS)
+        limit = _quota_header(response.headers, _QUOTA_LIMIT_HEADERS)
+        if remaining is not None and limit and remaining <= limit * _LOW_QUOTA_RATIO:
+            pause = _LOW_QUOTA_PAUSE_SECONDS
+
+    if pause:
+        _pause_until = max(_pause_until, time.monotonic() + pause)
+    return pause
+
+
+def _raise_if_throttled() -> None:
+    """暫停期間不送出請求，直接回報配額耗盡"""
+    remaining = _pause_until - time.monotonic()
+    if remaining > 0:
+        raise PlacesAPIError(
+            f"Places API requests paused for {remaining:.1f}s to respect rate limits",
+            status_code=429,
+            error_type="RESOURCE_EXHAUSTED",
+            retry_after=remaining
+        )
+
+
+def _parse_nearby_response(response: httpx.Response) -> List[Dict[str, Any]]:
+    """處理 Nearby Search 回應：HTTP 錯誤轉為 PlacesAPIError，成功時轉換為院所欄位 dict（尚未計算距離）"""
+    pause = _note_rate_limit_headers(response)
+
+    # 處理 HTTP 錯誤
+    if response.status_code == 401:
+        raise PlacesAPIError(
+            "API key not valid. Please pass a valid API key.",
+            status_code=401,
+            error_type="UNAUTHENTICATED"
+        )
+    elif response.status_code == 429:
+        raise PlacesAPIError(
+            "Quota exceeded. Please check your API usage limits.",
+            status_code=429,
+            error_type="RESOURCE_EXHAUSTED",
+            retry_after=pause
+        )
+    elif response.status_code != 200:
+        error_data = orjson.loads(response.content) if response.content else {}
+        error_message = error_data.get("error", {}).get("message", f"HTTP {response.status_code}")
+        raise PlacesAPIError(
+            f"Places API error: {error_message}",
+            status_code=response.status_code,
+            retry_after=pause
+        )
+
+    # 解析回應
+    data = orjson.loads(response.content)
+    places_data = data.get("places", [])
+
+    # 轉換為 PlaceResult 欄位（距離依查詢座標另行批次計算後才建立物件）
+    results = []
+    for place_data in places_data:
+        try:
+            # 取得基本資訊
+            place_id = place_data.get("id", "")
+            display_name = place_data.get("displayName", {})
+            name = display_name.get("text", "未知醫院")
+            address = place_data.get("formattedAddress", "")
+            phone = place_data.get("internationalPhoneNumber")
+            rating = place_data.get("rating")
+            business_status = place_data.get("businessStatus", "UNKNOWN")
+
+            # 取得位置資訊
+            location = place_data.get("location", {})
+            place_lat = location.get("latitude")
+            place_lng = location.get("longitude")
+
+            if place_lat is None or place_lng is None:
+                continue  # 跳過沒有座標的結果
+
+            float(place_lat), float(place_lng)  # 座標須為數值
+
+            # 解析營業時間
+            opening_hours_data = place_data.get("currentOpeningHours", {})
+            is_open_now, weekday_descriptions = parse_opening_hours(opening_hours_data)
+
+            results.append({
+                "id": place_id,
+                "name": name,
+                "address": address,
+                "latitude": place_lat,
+                "longitude": place_lng,
+                "phone": phone,
+                "rating": rating,
+                "is_open_now": is_open_now,
+                "opening_hours": weekday_descriptions,
+                "business_status": business_status
+            })
+
+        except (KeyError, TypeError, ValueError) as e:
+            # 跳過有問題的資料項目，記錄但不中斷
+            continue
+
+    return results
+
+
+_BY_DISTANCE = attrgetter("distance_meters")
+
+
+def _rank_by_distance(places: List[Dict[str, Any]], lat: float, lng: float,
+                      max_results: int) -> List[PlaceResult]:
+    """一次批次計算到查詢座標的距離，建立 PlaceResult 後依距離排序並限制數量"""
+    points = [(float(place["latitude"]), float(place["longitude"])) for place in places]
+    results = [
+        PlaceResult(**place, distance_meters=distance)
+        for place, distance in zip(places, calculate_distances(lat, lng, points))
+    ]
+
+    # 取距離最近的 max_results 筆（O(N log k)，等同穩定排序後截斷）
+    return heapq.nsmallest(max_results, results, key=_BY_DISTANCE)
+
+
+# 搜尋結果快取：座標量化至與請求圓心相同的網格，鄰近使用者共用同一次 API 呼叫；
+# 快取的是院所清單，距離與排序依各自的實際座標重新計算。營業中狀態具時效性，故存活時間較短
+_NEARBY_CACHE_TTL = 900
+_NEARBY_CACHE = ResponseCache(ttl=_NEARBY_CACHE_TTL)
+
+
+def _nearby_cache_key(lat: float, lng: float, radius: int, max_results: int) -> Dict[str, Any]:
+    """量化座標後的快取鍵參數"""
+    return {
+        "lat": round(lat, _NEARBY_GRID_DECIMALS),
+        "lng": round(lng, _NEARBY_GRID_DECIMALS),
+        "radius": radius,
+        "max_results": min(max_results, 20)
+    }
+
+
+def _get_cached_nearby(lat: float, lng: float, radius: int,
+                       max_results: int) -> Optional[List[PlaceResult]]:
+    """取得同一網格的快取搜尋結果，並依實際座標重新計算距離與排序"""
+    cached = _NEARBY_CACHE.get(**_nearby_cache_key(lat, lng, radius, max_results))
+    if cached is None:
+        return None
+    return _rank_by_distance(cached["places"], lat, lng, max_results)
+
+
+def _cache_nearby(lat: float, lng: float, radius: int, max_results: int,
+                  places: List[Dict[str, Any]]) -> None:
+    """快取解析後的院所欄位（命中時依各自座標建立 PlaceResult 並填入距離）"""
+    _NEARBY_CACHE.set(
+        {"places": places},
+        **_nearby_cache_key(lat, lng, radius, max_results)
+    )
+
+
 def nearby_hospitals(lat: float, lng: float, radius: int = 3000, max_results: int = 20) -> List[PlaceResult]:
     """
     搜尋指定座標附近的醫院
@@ -105,156 +464,121 @@ def nearby_hospitals(lat: float, lng: float, radius: int = 3000, max_results: in
 
     Returns:
         List[PlaceResult]: 醫院搜尋結果列表，按距離排序
+            （同一約 110 公尺網格內的查詢於快取期限內共用 API 結果）
 
     Raises:
         ValueError: 座標無效
-        PlacesAPIError: API 請求錯誤
+        PlacesAPIError: API 請求錯誤；依回應標頭（Retry-After、剩餘配額）暫停期間
+            不送出請求，直接以 status_code=429 拋出
     """
-    # 驗證輸入參數
-    validate_coordinates(lat, lng)
+    headers, body = _build_nearby_request(lat, lng, radius, max_results)
 
-    if radius <= 0 or radius > 50000:
-        raise ValueError(f"Invalid radius: {radius}. Must be between 1 and 50000 meters.")
-
-    settings = get_settings()
-    api_key = settings.google_places_api_key
+    cached = _get_cached_nearby(lat, lng, radius, max_results)
+    if cached is not None:
+        return cached
 
-    # 構建請求 URL
-    url = "https://places.googleapis.com/v1/places:searchNearby"
-
-    # 構建請求資料
-    request_data = {
-        "includedTypes": ["hospital"],
-        "maxResultCount": min(max_results, 20),  # API 限制最多 20 個結果
-        "locationRestriction": {
-            "circle": {
-                "center": {
-                    "latitude": lat,
-                    "longitude": lng
-                },
-                "radius": radius
-            }
-        },
-        "languageCode": "zh-TW",
-        "regionCode": "TW"
-    }
-
-    # 請求標頭
-    headers = {
-        "Content-Type": "application/json",
-        "X-Goog-Api-Key": api_key,
-        "X-Goog-FieldMask": (
-            "places.id,places.displayName,places.formattedAddress,"
-            "places.internationalPhoneNumber,places.rating,places.location,"
-            "places.currentOpeningHours,places.businessStatus"
-        )
-    }
+    _raise_if_throttled()
 
     try:
         # 發送請求
-        with httpx.Client(timeout=30.0) as client:
+        with httpx.Client(timeout=30.0, headers=_PLACES_STATIC_HEADERS) as client:
             response = client.post(
-                url,
+                _PLACES_NEARBY_URL,
                 headers=headers,
-                content=json.dumps(request_data)
+                content=body
             )
 
-        # 處理 HTTP 錯誤
-        if response.status_code == 401:
-            raise PlacesAPIError(
-                "API key not valid. Please pass a valid API key.",
-                status_code=401,
-                error_type="UNAUTHENTICATED"
-            )
-        elif response.status_code == 429:
-            raise PlacesAPIError(
-                "Quota exceeded. Please check your API usage limits.",
-                status_code=429,
-                error_type="RESOURCE_EXHAUSTED"
-            )
-        elif response.status_code != 200:
-            error_data = response.json() if response.content else {}
-            error_message = error_data.get("error", {}).get("message", f"HTTP {response.status_code}")
-            raise PlacesAPIError(
-                f"Places API error: {error_message}",
-                status_code=response.status_code
-            )
+        places = _parse_nearby_response(response)
+        _cache_nearby(lat, lng, radius, max_results, places)
+        return _rank_by_distance(places, lat, lng, max_results)
 
-        # 解析回應
-        data = response.json()
-        places_data = data.get("places", [])
-
-        # 轉換為 PlaceResult 物件
-        results = []
-        for place_data in places_data:
-            try:
-                # 取得基本資訊
-                place_id = place_data.get("id", "")
-                display_name = place_data.get("displayName", {})
-                name = display_name.get("text", "未知醫院")
-                address = place_data.get("formattedAddress", "")
-                phone = place_data.get("internationalPhoneNumber")
-                rating = place_data.get("rating")
-                business_status = place_data.get("businessStatus", "UNKNOWN")
-
-                # 取得位置資訊
-                location = place_data.get("location", {})
-                place_lat = location.get("latitude")
-                place_lng = location.get("longitude")
-
-                if place_lat is None or place_lng is None:
-                    continue  # 跳過沒有座標的結果
-
-                # 計算距離
-                distance = calculate_distance(lat, lng, place_lat, place_lng)
-
-                # 解析營業時間
-                opening_hours_data = place_data.get("currentOpeningHours", {})
-                is_open_now, weekday_descriptions = parse_opening_hours(opening_hours_data)
-
-                # 建立結果物件
-                result = PlaceResult(
-                    id=place_id,
-                    name=name,
-                    address=address,
-                    latitude=place_lat,
-                    longitude=place_lng,
-                    phone=phone,
-                    rating=rating,
-                    is_open_now=is_open_now,
-                    opening_hours=weekday_descriptions,
-                    business_status=business_status,
-                    distance_meters=distance
-                )
-
-                results.append(result)
-
-            except (KeyError, TypeError, ValueError) as e:
-                # 跳過有問題的資料項目，記錄但不中斷
-                continue
-
-        # 按距離排序
-        results.sort(key=lambda x: x.distance_meters if x.distance_meters is not None else float('inf'))
-
-        # 限制結果數量
-        return results[:max_results]
+    except _TRANSPORT_ERROR_TYPES as e:
+        raise _to_places_api_error(e) from e
 
+
+async def _post_nearby_async(headers: Dict[str, str], body: bytes) -> httpx.Response:
+    """送出一次 Nearby Search 請求：持有並行許可，並依結果調整 AIMD 並行上限"""
+    try:
+        async with _PLACES_CONCURRENCY:
+            response = await _get_async_http_client().post(
+                _PLACES_NEARBY_URL,
+                headers=headers,
+                content=body
+            )
     except httpx.TimeoutException:
-        raise PlacesAPIError(
-            "Request timeout while connecting to Places API",
-            error_type="TIMEOUT"
-        )
-    except httpx.RequestError as e:
-        raise PlacesAPIError(
-            f"Network error while connecting to Places API: {str(e)}",
-            error_type="NETWORK_ERROR"
-        )
-    except json.JSONDecodeError:
-        raise PlacesAPIError(
-            "Invalid JSON response from Places API",
-            error_type="INVALID_RESPONSE"
+        _PLACES_CONCURRENCY.record_failure()
+        raise
+
+    if response.status_code == 429 or response.status_code >= 500:
+        _PLACES_CONCURRENCY.record_failure()
+    elif response.status_code == 200:
+        _PLACES_CONCURRENCY.record_success()
+    return response
+
+
+async def nearby_hospitals_async(lat: float, lng: float, radius: int = 3000,
+                                 max_results: int = 20) -> List[PlaceResult]:
+    """
+    搜尋指定座標附近的醫院（非同步版本）
+
+    使用共用的 AsyncClient 連線池，不阻塞事件迴圈；同時送出的請求數受 AIMD 並行上限控制，
+    連線／讀取逾時以非同步指數退避重試。參數、回傳值、快取與例外同 nearby_hospitals
+    """
+    headers, body = _build_nearby_request(lat, lng, radius, max_results)
+
+    cached = _get_cached_nearby(lat, lng, radius, max_results)
+    if cached is not None:
+        return cached
+
+    _raise_if_throttled()
+
+    try:
+        response = await exponential_backoff_retry_async(
+            lambda: _post_nearby_async(headers, body),
+            max_retries=_ASYNC_RETRY_MAX,
+            base_delay=_ASYNC_RETRY_BASE_DELAY,
+            max_delay=_ASYNC_RETRY_MAX_DELAY,
+            full_jitter=True
         )
 
+        places = _parse_nearby_response(response)
+        _cache_nearby(lat, lng, radius, max_results, places)
+        return _rank_by_distance(places, lat, lng, max_results)
+
+    except _TRANSPORT_ERROR_TYPES as e:
+        raise _to_places_api_error(e) from e
+
+
+async def nearby_hospitals_batch(
+    points: Sequence[Tuple[float, float, int]],
+    max_results: int = 20
+) -> List[Union[List[PlaceResult], Exception]]:
+    """
+    批次搜尋多個座標附近的醫院（並行送出）
+
+    Args:
+        points: (緯度, 經度, 搜尋半徑) 列表
+        max_results: 每個座標的最大結果數量
+
+    Returns:
+        與輸入順序對應的結果列表；個別查詢失敗時該位置為例外物件（ValueError 或 PlacesAPIError），
+        不影響其他查詢
+
+    Note:
+        同時送出的請求數由 nearby_hospitals_async 的 AIMD 並行上限控制；批次內重複的查詢只送出一次
+    """
+    unique_points = list(dict.fromkeys(points))
+    results = await asyncio.gather(
+        *(nearby_hospitals_async(lat, lng, radius, max_results) for lat, lng, radius in unique_points),
+        return_exceptions=True
+    )
+    resolved = dict(zip(unique_points, results))
+
+    return [
+        list(resolved[point]) if isinstance(resolved[point], list) else resolved[point]
+        for point in points
+    ]
+
 
 def format_hospital_results(results: List[PlaceResult], include_emergency_info: bool = True) -> Dict[str, Any]:
     """
@@ -362,10 +686,10 @@ def nearby_hospitals_with_fallback(
 
         return result
 
-    except httpx.HTTPStatusError as e:
-        if e.response.status_code == 429:
-            # 速率限制
-            return {
+    except PlacesAPIError as e:
+        if e.status_code == 429:
+            # 速率限制：附上建議重試秒數
+            result = {
                 "status": "degraded",
                 "results": [],
                 "message": "系統繁忙，請稍後再試",
@@ -373,21 +697,19 @@ def nearby_hospitals_with_fallback(
                 "emergency_guidance": "如需緊急就醫，請直接撥打 119 或前往最近的急診室",
                 "locale": "zh-TW"
             }
-        elif e.response.status_code >= 500:
-            # 服務錯誤
-            if enable_cascade:
-                return _fallback_to_static_hospitals(lat, lng)
-
-    except (httpx.ConnectTimeout, httpx.ReadTimeout):
-        # 連線問題
-        return {
-            "status": "degraded",
-            "results": [],
-            "message": "連線逾時，請檢查網路",
-            "offline_guidance": "請前往最近的醫療院所或急診室",
-            "emergency_numbers": settings.emergency_numbers,
-            "locale": "zh-TW"
-        }
+            if e.retry_after is not None:
+                result["retry_after"] = math.ceil(e.retry_after)
+            return result
+        elif e.error_type in ("TIMEOUT", "NETWORK_ERROR"):
+            # 連線問題
+            return {
+                "status": "degraded",
+                "results": [],
+                "message": "連線逾時，請檢查網路",
+                "offline_guidance": "請前往最近的醫療院所或急診室",
+                "emergency_numbers": settings.emergency_numbers,
+                "locale": "zh-TW"
+            }
 
     # 最終降級：返回靜態醫院列表
     if enable_cascade:
@@ -402,25 +724,43 @@ def nearby_hospitals_with_fallback(
     }
 
 
+# 台灣主要醫學中心列表（靜態降級用，載入時建立一次；回傳時另建含距離的 dict，不修改原資料）
+_STATIC_HOSPITALS: Tuple[Dict[str, Any], ...] = (
+    {"name": "臺大醫院", "address": "台北市中正區中山南路7號", "emergency": True, "phone": "02-23123456",
+     "latitude": 25.0408, "longitude": 121.5190},
+    {"name": "台北榮總", "address": "台北市北投區石牌路二段201號", "emergency": True, "phone": "02-28712121",
+     "latitude": 25.1205, "longitude": 121.5201},
+    {"name": "三軍總醫院", "address": "台北市內湖區成功路二段325號", "emergency": True, "phone": "02-87923311",
+     "latitude": 25.0713, "longitude": 121.5910},
+    {"name": "長庚醫院林口院區", "address": "桃園市龜山區復興街5號", "emergency": True, "phone": "03-3281200",
+     "latitude": 25.0617, "longitude": 121.3676},
+    {"name": "中國醫藥大學附設醫院", "address": "台中市北區育德路2號", "emergency": True, "phone": "04-22052121",
+     "latitude": 24.1570, "longitude": 120.6806},
+    {"name": "成大醫院", "address": "台南市北區勝利路138號", "emergency": True, "phone": "06-2353535",
+     "latitude": 22.9971, "longitude": 120.2196},
+    {"name": "高雄醫學大學附設醫院", "address": "高雄市三民區自由一路100號", "emergency": True, "phone": "07-3121101",
+     "latitude": 22.6465, "longitude": 120.3094},
+    {"name": "花蓮慈濟醫院", "address": "花蓮市中央路三段707號", "emergency": True, "phone": "03-8561825",
+     "latitude": 23.9955, "longitude": 121.5922}
+)
+_STATIC_HOSPITAL_POINTS: Tuple[Tuple[float, float], ...] = tuple(
+    (hospital["latitude"], hospital["longitude"]) for hospital in _STATIC_HOSPITALS
+)
+_STATIC_FALLBACK_LIMIT = 5
+_STATIC_EMERGENCY_NUMBERS = ("119", "110", "112")
+
+
 def _fallback_to_static_hospitals(lat: float, lng: float) -> Dict[str, Any]:
-    """靜態醫院列表降級"""
-    # 台灣主要醫學中心列表
-    static_hospitals = [
-        {"name": "臺大醫院", "address": "台北市中正區中山南路7號", "emergency": True, "phone": "02-23123456"},
-        {"name": "台北榮總", "address": "台北市北投區石牌路二段201號", "emergency": True, "phone": "02-28712121"},
-        {"name": "三軍總醫院", "address": "台北市內湖區成功路二段325號", "emergency": True, "phone": "02-87923311"},
-        {"name": "長庚醫院林口院區", "address": "桃園市龜山區復興街5號", "emergency": True, "phone": "03-3281200"},
-        {"name": "中國醫藥大學附設醫院", "address": "台中市北區育德路2號", "emergency": True, "phone": "04-22052121"},
-        {"name": "成大醫院", "address": "台南市北區勝利路138號", "emergency": True, "phone": "06-2353535"},
-        {"name": "高雄醫學大學附設醫院", "address": "高雄市三民區自由一路100號", "emergency": True, "phone": "07-3121101"},
-        {"name": "花蓮慈濟醫院", "address": "花蓮市中央路三段707號", "emergency": True, "phone": "03-8561825"}
-    ]
+    """靜態醫院列表降級：依與使用者的直線距離取最近的 5 家"""
+    distances = calculate_distances(lat, lng, _STATIC_HOSPITAL_POINTS)
+    nearest = heapq.nsmallest(_STATIC_FALLBACK_LIMIT, range(len(_STATIC_HOSPITALS)),
+                              key=distances.__getitem__)
 
     return {
         "status": "static_fallback",
-        "results": static_hospitals[:5],  # 返回前5家
+        "results": [{**_STATIC_HOSPITALS[i], "distance_meters": distances[i]} for i in nearest],
         "data_source": "static_emergency_list",
         "message": "使用預設醫院列表（實際距離可能有差異）",
-        "emergency_numbers": ["119", "110", "112"],
+        "emergency_numbers": list(_STATIC_EMERGENCY_NUMBERS),
         "locale": "zh-TW"
-    }
\ No newline at end of file
+    }
@@ -0,0 +1,59 @@
+"""
+共用非同步 HTTP 連線池
+httpx.AsyncClient 的連線綁定建立它的事件迴圈，故依迴圈各自建立，
+迴圈改變時先關閉舊的連線池再建立新的
+"""
+
+import asyncio
+import logging
+from typing import Any, Optional
+import httpx
+
+logger = logging.getLogger(__name__)
+
+
+class LoopBoundAsyncClient:
+    """
+    每個事件迴圈一個共用的 httpx.AsyncClient（首次使用時建立）
+
+    Args:
+        **client_kwargs: 建立 httpx.AsyncClient 時的參數（連線上限、逾時、預設標頭等）
+    """
+
+    def __init__(self, **client_kwargs: Any):
+        self._client_kwargs = client_kwargs
+        self._client: Optional[httpx.AsyncClient] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def get(self) -> httpx.AsyncClient:
+        """取得目前事件迴圈共用的 client；迴圈改變時關閉舊 client"""
+        loop = asyncio.get_running_loop()
+        client = self._client
+        if client is None or client.is_closed or self._loop is not loop:
+            if client is not None and not client.is_closed:
+                self._close_on_own_loop(client, self._loop)
+            client = httpx.AsyncClient(**self._client_kwargs)
+            self._client = client
+            self._loop = loop
+        return client
+
+    async def aclose(self) -> None:
+        """關閉目前的連線池（應用程式關閉時呼叫）"""
+        client = self._client
+        self._client = None
+        self._loop = None
+        if client is not None:
+            await client.aclose()
+
+    @staticmethod
+    def _close_on_own_loop(client: httpx.AsyncClient,
+                           loop: Optional[asyncio.AbstractEventLoop]) -> None:
+        """在建立 client 的事件迴圈上排程關閉，釋放其連線"""
+        # 連線的傳輸層屬於舊迴圈，只能在該迴圈上關閉；舊迴圈已關閉時
+        # 其連線無法再使用，隨舊 client 一併回收
+        if loop is None or loop.is_closed():
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+        except RuntimeError as e:
+            logger.debug(f"Could not schedule close of previous AsyncClient: {e}")
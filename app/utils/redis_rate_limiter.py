@@ -4,9 +4,27 @@ Redis 基礎的分散式速率限制器
 """
 
 from typing import Optional
+from secrets import token_hex
 import time
 
 
+# 修剪過期記錄、計數與條件式新增在 Redis 內以單一腳本原子執行：
+# 一次往返，且並行請求不會在計數與新增之間插隊而超出上限
+_SLIDING_WINDOW_LUA = """
+local key = KEYS[1]
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local limit = tonumber(ARGV[3])
+redis.call('ZREMRANGEBYSCORE', key, 0, now - window)
+if redis.call('ZCARD', key) >= limit then
+    return 0
+end
+redis.call('ZADD', key, now, ARGV[4])
+redis.call('EXPIRE', key, window * 2)
+return 1
+"""
+
+
 class RedisRateLimiter:
     """Redis 速率限制器"""
 
@@ -27,6 +45,8 @@ class RedisRateLimiter:
         self.redis = redis_client
         self.max_requests = max_requests
         self.window_seconds = window_seconds
+        # register_script 以 EVALSHA 執行，伺服器尚未快取腳本（NOSCRIPT）時自動改用 EVAL 載入
+        self._sliding_window_script = redis_client.register_script(_SLIDING_WINDOW_LUA)
 
     def check_rate_limit(self, client_id: str) -> bool:
         """
@@ -40,35 +60,15 @@ class RedisRateLimiter:
         """
         key = f"rate_limit:{client_id}"
         current_time = int(time.time())
-        window_start = current_time - self.window_seconds
+        # 成員需唯一，同一秒內的多個請求才會各自計數
+        member = f"{current_time}:{token_hex(4)}"
 
         try:
-            # 使用 Redis 管線優化
-            pipe = self.redis.pipeline()
-
-            # 移除過期記錄
-            pipe.zremrangebyscore(key, 0, window_start)
-
-            # 計算當前窗口內的請求數
-            pipe.zcount(key, window_start, current_time)
-
-            # 添加當前請求
-            pipe.zadd(key, {str(current_time): current_time})
-
-            # 設定過期時間
-            pipe.expire(key, self.window_seconds * 2)
-
-            results = pipe.execute()
-
-            # 檢查是否超過限制
-            request_count = results[1]
-
-            if request_count >= self.max_requests:
-                # 移除剛添加的記錄
-                self.redis.zrem(key, str(current_time))
-                return False
-
-            return True
+            allowed = self._sliding_window_script(
+                keys=[key],
+                args=[current_time, self.window_seconds, self.max_requests, member]
+            )
+            return bool(int(allowed))
 
         except Exception:
             # Redis 錯誤時降級為允許
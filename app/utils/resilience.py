@@ -3,16 +3,44 @@
 包含指數退避、熔斷器、降級等模式
 """
 
+import asyncio
 import time
 import random
 import logging
-from typing import Callable, Any, Optional, Dict, List
+from collections import OrderedDict, deque
+from typing import Awaitable, Callable, Any, Optional, Deque, Dict, List
 from datetime import datetime, timedelta
 from enum import Enum
 import httpx
 
 logger = logging.getLogger(__name__)
 
+# 計時一律使用 time.monotonic_ns()（整數奈秒，不受系統時鐘調整影響）
+_NS_PER_SECOND = 1_000_000_000
+
+
+def _default_should_retry(exception: Exception) -> bool:
+    """預設重試條件：429、502/503/504 與連線／讀取逾時"""
+    if isinstance(exception, httpx.HTTPStatusError):
+        return exception.response.status_code in [429, 502, 503, 504]
+    elif isinstance(exception, (httpx.ConnectTimeout, httpx.ReadTimeout)):
+        return True
+    return False
+
+
+def _backoff_delay(attempt: int, base_delay: float, max_delay: float,
+                   jitter: bool, full_jitter: bool) -> float:
+    """計算第 attempt 次重試前的延遲（秒）"""
+    delay = min(base_delay * (2 ** attempt), max_delay)
+
+    if full_jitter:
+        # 完全抖動：[0, delay] 均勻分布，避免大量客戶端同步重試
+        return random.uniform(0, delay)
+    if jitter:
+        # 加入隨機抖動 [0.5 * delay, 1.5 * delay]
+        return delay * (0.5 + random.random())
+    return delay
+
 
 def exponential_backoff_retry(
     func: Callable,
@@ -21,11 +49,15 @@ def exponential_backoff_retry(
     max_delay: float = 60.0,
     jitter: bool = False,
     retry_condition: Optional[Callable[[Exception], bool]] = None,
-    on_retry: Optional[Callable[[int, float, Exception], None]] = None
+    on_retry: Optional[Callable[[int, float, Exception], None]] = None,
+    full_jitter: bool = False
 ) -> Any:
     """
     指數退避重試機制
 
+    以 time.sleep 等待，僅供同步程式（背景工作）使用；
+    事件迴圈中請改用 exponential_backoff_retry_async
+
     Args:
         func: 要執行的函數
         max_retries: 最大重試次數
@@ -34,6 +66,7 @@ def exponential_backoff_retry(
         jitter: 是否加入隨機抖動
         retry_condition: 自定義重試條件
         on_retry: 重試回調函數
+        full_jitter: 延遲改為 [0, 退避值] 均勻取樣（優先於 jitter）
 
     Returns:
         函數執行結果
@@ -41,17 +74,7 @@ def exponential_backoff_retry(
     Raises:
         最後一次執行的例外
     """
-    def should_retry(exception: Exception) -> bool:
-        if retry_condition:
-            return retry_condition(exception)
-
-        # 預設：429 和 5xx 錯誤重試
-        if isinstance(exception, httpx.HTTPStatusError):
-            return exception.response.status_code in [429, 502, 503, 504]
-        elif isinstance(exception, (httpx.ConnectTimeout, httpx.ReadTimeout)):
-            return True
-        return False
-
+    should_retry = retry_condition or _default_should_retry
     last_exception = None
 
     for attempt in range(max_retries + 1):
@@ -68,12 +91,7 @@ def exponential_backoff_retry(
                 # 不可重試的錯誤
                 raise e
 
-            # 計算延遲
-            delay = min(base_delay * (2 ** attempt), max_delay)
-
-            if jitter:
-                # 加入隨機抖動 [0.5 * delay, 1.5 * delay]
-                delay = delay * (0.5 + random.random())
+            delay = _backoff_delay(attempt, base_delay, max_delay, jitter, full_jitter)
 
             if on_retry:
                 on_retry(attempt + 1, delay, e)
@@ -84,6 +102,45 @@ def exponential_backoff_retry(
     raise last_exception
 
 
+async def exponential_backoff_retry_async(
+    func: Callable[[], Awaitable[Any]],
+    max_retries: int = 3,
+    base_delay: float = 1.0,
+    max_delay: float = 60.0,
+    jitter: bool = False,
+    retry_condition: Optional[Callable[[Exception], bool]] = None,
+    on_retry: Optional[Callable[[int, float, Exception], None]] = None,
+    full_jitter: bool = False
+) -> Any:
+    """
+    指數退避重試機制（非同步版本）
+
+    func 為回傳 awaitable 的函數，每次嘗試重新呼叫；以 asyncio.sleep 等待，不阻塞事件迴圈。
+    參數、重試條件與例外同 exponential_backoff_retry
+    """
+    should_retry = retry_condition or _default_should_retry
+    last_exception = None
+
+    for attempt in range(max_retries + 1):
+        try:
+            return await func()
+        except Exception as e:
+            last_exception = e
+
+            if attempt == max_retries or not should_retry(e):
+                raise e
+
+            delay = _backoff_delay(attempt, base_delay, max_delay, jitter, full_jitter)
+
+            if on_retry:
+                on_retry(attempt + 1, delay, e)
+
+            logger.warning(f"Retry attempt {attempt + 1}/{max_retries} after {delay:.2f}s: {str(e)}")
+            await asyncio.sleep(delay)
+
+    raise last_exception
+
+
 class CircuitBreakerState(Enum):
     """熔斷器狀態"""
     CLOSED = "closed"       # 關閉（正常）
@@ -130,7 +187,8 @@ class CircuitBreaker:
 
         self._state = CircuitBreakerState.CLOSED
         self._failure_count = 0
-        self._last_failure_time = None
+        self._last_failure_time = None  # 牆上時鐘，僅供統計顯示
+        self._last_failure_ns: Optional[int] = None
         self._success_count = 0
         self._total_calls = 0
         self._total_failures = 0  # Track total failures for statistics
@@ -149,9 +207,9 @@ class CircuitBreaker:
     def _check_state(self):
         """檢查並更新狀態"""
         if self._state == CircuitBreakerState.OPEN:
-            if self._last_failure_time:
-                time_since_failure = time.time() - self._last_failure_time
-                if time_since_failure >= self.recovery_timeout:
+            if self._last_failure_ns is not None:
+                time_since_failure_ns = time.monotonic_ns() - self._last_failure_ns
+                if time_since_failure_ns >= self.recovery_timeout * _NS_PER_SECOND:
                     self._transition_to(CircuitBreakerState.HALF_OPEN)
 
     def _transition_to(self, new_state: CircuitBreakerState):
@@ -182,6 +240,7 @@ class CircuitBreaker:
         """記錄失敗"""
         self._failure_count += 1
         self._total_failures += 1  # Track total failures
+        self._last_failure_ns = time.monotonic_ns()
         self._last_failure_time = time.time()
 
         if self._failure_count >= self.failure_threshold:
@@ -266,7 +325,8 @@ class RateLimiter:
         default_max_requests: Optional[int] = None,
         tier_limits: Optional[Dict[str, Dict]] = None,
         key_func: Optional[Callable] = None,
-        cleanup_interval: int = 300
+        cleanup_interval: int = 300,
+        max_clients: int = 100_000
     ):
         """
         初始化速率限制器
@@ -283,6 +343,7 @@ class RateLimiter:
             tier_limits: 用戶層級限制
             key_func: 自定義鍵函數
             cleanup_interval: 清理間隔（秒）
+            max_clients: 最多追蹤的鍵數，超過時淘汰最久未存取者
         """
         self.max_requests = max_requests
         self.window_seconds = window_seconds
@@ -295,9 +356,12 @@ class RateLimiter:
         self.tier_limits = tier_limits or {}
         self.key_func = key_func
         self.cleanup_interval = cleanup_interval
+        self.max_clients = max_clients
 
-        self._request_history = {}
-        self._last_cleanup = time.time()
+        # 每個鍵的請求時間戳（monotonic 奈秒）依時間先後排列，過期者由左端 O(1) 移除；
+        # 鍵依最近存取排序（LRU），清理與容量淘汰都只需處理最前端
+        self._request_history: "OrderedDict[str, Deque[int]]" = OrderedDict()
+        self._last_cleanup = time.monotonic_ns()
 
     def _get_key(self, client_id: str, endpoint: Optional[str] = None) -> str:
         """生成限流鍵"""
@@ -333,37 +397,43 @@ class RateLimiter:
             window = self.window_seconds
 
         key = self._get_key(client_id, endpoint)
-        current_time = time.time()
-
-        if key not in self._request_history:
-            self._request_history[key] = []
+        current_time = time.monotonic_ns()
+        window_ns = window * _NS_PER_SECOND
+
+        history = self._request_history.get(key)
+        if history is None:
+            history = self._request_history[key] = deque()
+            if len(self._request_history) > self.max_clients:
+                self._request_history.popitem(last=False)
+        else:
+            self._request_history.move_to_end(key)
 
         # 清理過期請求
         if self.sliding_window:
-            self._request_history[key] = [
-                t for t in self._request_history[key]
-                if current_time - t < window
-            ]
+            while history and current_time - history[0] >= window_ns:
+                history.popleft()
         else:
             # 固定窗口
-            if self._request_history[key] and current_time - self._request_history[key][0] >= window:
-                self._request_history[key] = []
+            if history and current_time - history[0] >= window_ns:
+                history.clear()
 
-        # 檢查突發限制
+        # 檢查突發限制（由最新一筆往回數，最多檢查 burst_size 筆）
         if self.burst_size and self.burst_window:
-            recent_requests = [
-                t for t in self._request_history[key]
-                if current_time - t < self.burst_window
-            ]
-            if len(recent_requests) >= self.burst_size:
-                return False
+            burst_window_ns = self.burst_window * _NS_PER_SECOND
+            recent_count = 0
+            for t in reversed(history):
+                if current_time - t >= burst_window_ns:
+                    break
+                recent_count += 1
+                if recent_count >= self.burst_size:
+                    return False
 
         # 檢查總限制
-        if len(self._request_history[key]) >= max_req:
+        if len(history) >= max_req:
             return False
 
         # 記錄請求
-        self._request_history[key].append(current_time)
+        history.append(current_time)
         return True
 
     def check_rate_limit_request(self, request) -> bool:
@@ -407,38 +477,127 @@ class RateLimiter:
         if key not in self._request_history or not self._request_history[key]:
             return 0
 
-        oldest_request = min(self._request_history[key])
-        time_elapsed = time.time() - oldest_request
+        oldest_request = self._request_history[key][0]
+        elapsed_ns = time.monotonic_ns() - oldest_request
 
         if endpoint and endpoint in self.endpoint_limits:
             window = self.endpoint_limits[endpoint].get("window", self.window_seconds)
         else:
             window = self.window_seconds
 
-        retry_after = max(0, int(window - time_elapsed))
+        retry_after = max(0, int((window * _NS_PER_SECOND - elapsed_ns) // _NS_PER_SECOND))
         return retry_after
 
     def cleanup_expired(self):
-        """清理過期記錄"""
-        current_time = time.time()
-        keys_to_delete = []
-
-        for key, timestamps in self._request_history.items():
-            # 保留最近的記錄
-            self._request_history[key] = [
-                t for t in timestamps
-                if current_time - t < self.window_seconds * 2  # 保留2倍窗口時間
-            ]
+        """
+        清理過期記錄
 
-            if not self._request_history[key]:
-                keys_to_delete.append(key)
+        鍵依最近存取排序，由最久未存取者開始移除最後請求已超過 2 倍窗口時間的鍵，
+        遇到仍在使用中的鍵即停止，成本只與過期鍵數成正比
+        """
+        current_time = time.monotonic_ns()
+        expiry = self.window_seconds * 2 * _NS_PER_SECOND
 
-        for key in keys_to_delete:
+        while self._request_history:
+            key, timestamps = next(iter(self._request_history.items()))
+            if timestamps and current_time - timestamps[-1] < expiry:
+                break
             del self._request_history[key]
 
         self._last_cleanup = current_time
 
     def _cleanup_if_needed(self):
         """按需清理"""
-        if time.time() - self._last_cleanup > self.cleanup_interval:
-            self.cleanup_expired()
\ No newline at end of file
+        if time.monotonic_ns() - self._last_cleanup > self.cleanup_interval * _NS_PER_SECOND:
+            self.cleanup_expired()
+
+
+class AIMDConcurrencyLimiter:
+    """
+    AIMD（加性增、乘性減）並行上限控制
+
+    以 ``async with`` 取得許可；呼叫端依結果回報 record_success / record_failure：
+    每累積「目前上限」次成功上限加 1，任一失敗（429、5xx、逾時）上限減半。
+    上限調降時不中斷進行中的請求，待其完成後自然收斂。
+    """
+
+    def __init__(self, initial_limit: int = 4, min_limit: int = 1, max_limit: int = 32):
+        """
+        初始化並行控制器
+
+        Args:
+            initial_limit: 初始並行上限
+            min_limit: 並行上限下限
+            max_limit: 並行上限上限
+        """
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self._limit = max(min_limit, min(initial_limit, max_limit))
+        self._in_flight = 0
+        self._successes = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    @property
+    def limit(self) -> int:
+        """目前並行上限"""
+        return self._limit
+
+    @property
+    def in_flight(self) -> int:
+        """進行中的請求數"""
+        return self._in_flight
+
+    async def acquire(self):
+        """取得許可（超過上限時依先後順序等待）"""
+        if self._in_flight < self._limit and not self._waiters:
+            self._in_flight += 1
+            return
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # 已取得許可後才被取消，交還給下一位
+                self.release()
+            raise
+
+    def release(self):
+        """釋放許可"""
+        self._in_flight -= 1
+        self._wake_waiters()
+
+    def record_success(self):
+        """回報成功：每累積目前上限次成功，上限加 1"""
+        self._successes += 1
+        if self._successes >= self._limit:
+            self._successes = 0
+            if self._limit < self.max_limit:
+                self._limit += 1
+                self._wake_waiters()
+
+    def record_failure(self):
+        """回報失敗：上限減半"""
+        self._successes = 0
+        new_limit = max(self.min_limit, self._limit // 2)
+        if new_limit != self._limit:
+            logger.warning(f"AIMD concurrency limit decreased: {self._limit} -> {new_limit}")
+            self._limit = new_limit
+
+    def _wake_waiters(self):
+        """在上限內依序喚醒等待者，許可直接轉交"""
+        while self._waiters and self._in_flight < self._limit:
+            waiter = self._waiters.popleft()
+            if waiter.done():
+                continue
+            self._in_flight += 1
+            waiter.set_result(None)
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self.release()
+        return False
@@ -9,11 +9,25 @@ import sys
 import os
 import json
 import yaml
+from functools import lru_cache
 from pathlib import Path
 
 # Add app directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+OPENAPI_YAML_PATH = Path(__file__).parent / "openapi.yaml"
+
+# 優先使用 libyaml 的 C 解析器（需以 libyaml 編譯的 PyYAML；未安裝時退回純 Python 的 SafeLoader）
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+@lru_cache(maxsize=1)
+def _load_openapi_yaml():
+    """讀取並解析 OpenAPI YAML（只讀檔、解析一次，供各驗證共用）"""
+    raw_bytes = OPENAPI_YAML_PATH.read_bytes()
+    return raw_bytes, yaml.load(raw_bytes, Loader=_YAML_LOADER)
+
+
 def validate_openapi_config():
     """驗證 OpenAPI 配置"""
     try:
@@ -58,14 +72,13 @@ def validate_router_docs():
 
 def validate_openapi_yaml():
     """驗證 OpenAPI YAML 檔案"""
-    yaml_path = Path(__file__).parent / "openapi.yaml"
+    yaml_path = OPENAPI_YAML_PATH
 
     if not yaml_path.exists():
         return False, f"OpenAPI YAML file not found: {yaml_path}"
 
     try:
-        with open(yaml_path, 'r', encoding='utf-8') as file:
-            yaml_content = yaml.safe_load(file)
+        raw_bytes, yaml_content = _load_openapi_yaml()
 
         # Check required OpenAPI fields
         required_fields = ["openapi", "info", "paths", "components"]
@@ -83,7 +96,7 @@ def validate_openapi_yaml():
         component_count = len(yaml_content.get("components", {}).get("schemas", {}))
 
         return True, {
-            "file_size": yaml_path.stat().st_size,
+            "file_size": len(raw_bytes),
             "openapi_version": yaml_content["openapi"],
             "api_title": yaml_content["info"]["title"],
             "api_version": yaml_content["info"]["version"],
@@ -95,36 +108,29 @@ def validate_openapi_yaml():
         return False, str(e)
 
 
+# 台灣特色功能關鍵字：符合任一組（組內關鍵字須全部出現）即視為具備；
+# 預先編碼為 UTF-8，直接在原始位元組中比對，免去解碼
+_TAIWAN_FEATURE_KEYWORDS = {
+    feature: tuple(tuple(keyword.encode('utf-8') for keyword in group) for group in groups)
+    for feature, groups in {
+        "traditional_chinese": (("台灣",), ("繁體中文",)),
+        "emergency_numbers": (("119", "110"),),
+        "taiwan_addresses": (("台北市",), ("高雄市",)),
+        "medical_disclaimers": (("醫療免責",), ("僅供參考",)),
+        "pdpa_compliance": (("PDPA",), ("個人資料保護",)),
+    }.items()
+}
+
+
 def validate_taiwan_specific_features():
     """驗證台灣特色功能"""
-    features = {
-        "traditional_chinese": False,
-        "emergency_numbers": False,
-        "taiwan_addresses": False,
-        "medical_disclaimers": False,
-        "pdpa_compliance": False
-    }
-
     try:
-        yaml_path = Path(__file__).parent / "openapi.yaml"
-        with open(yaml_path, 'r', encoding='utf-8') as file:
-            content = file.read()
-
-        # Check for Taiwan-specific content
-        if "台灣" in content or "繁體中文" in content:
-            features["traditional_chinese"] = True
-
-        if "119" in content and "110" in content:
-            features["emergency_numbers"] = True
+        raw_bytes, _ = _load_openapi_yaml()
 
-        if "台北市" in content or "高雄市" in content:
-            features["taiwan_addresses"] = True
-
-        if "醫療免責" in content or "僅供參考" in content:
-            features["medical_disclaimers"] = True
-
-        if "PDPA" in content or "個人資料保護" in content:
-            features["pdpa_compliance"] = True
+        features = {
+            feature: any(all(keyword in raw_bytes for keyword in group) for group in groups)
+            for feature, groups in _TAIWAN_FEATURE_KEYWORDS.items()
+        }
 
         return True, features
     except Exception as e:
@@ -140,7 +146,8 @@ def generate_validation_report():
 
     # Test 1: OpenAPI Configuration
     print("1. OpenAPI Configuration")
-    success, result = validate_openapi_config()
+    config_check = validate_openapi_config()
+    success, result = config_check
     if success:
         print("   Status: PASS")
         print(f"   Title: {result['title']}")
@@ -154,7 +161,8 @@ def generate_validation_report():
 
     # Test 2: Router Documentation
     print("2. Router Documentation")
-    success, result = validate_router_docs()
+    router_check = validate_router_docs()
+    success, result = router_check
     if success:
         print("   Status: PASS")
         print(f"   Routers: {', '.join(result['routers'])}")
@@ -166,7 +174,8 @@ def generate_validation_report():
 
     # Test 3: OpenAPI YAML File
     print("3. OpenAPI YAML File")
-    success, result = validate_openapi_yaml()
+    yaml_check = validate_openapi_yaml()
+    success, result = yaml_check
     if success:
         print("   Status: PASS")
         print(f"   File size: {result['file_size']:,} bytes")
@@ -183,7 +192,8 @@ def generate_validation_report():
 
     # Test 4: Taiwan-specific Features
     print("4. Taiwan-specific Features")
-    success, result = validate_taiwan_specific_features()
+    taiwan_check = validate_taiwan_specific_features()
+    success, result = taiwan_check
     if success:
         print("   Status: PASS")
         for feature, enabled in result.items():
@@ -199,12 +209,7 @@ def generate_validation_report():
     print("VALIDATION SUMMARY")
     print("=" * 60)
 
-    tests = [
-        validate_openapi_config(),
-        validate_router_docs(),
-        validate_openapi_yaml(),
-        validate_taiwan_specific_features()
-    ]
+    tests = [config_check, router_check, yaml_check, taiwan_check]
 
     passed = sum(1 for success, _ in tests if success)
     total = len(tests)
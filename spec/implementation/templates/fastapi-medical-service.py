@@ -33,6 +33,8 @@ EMERGENCY_KEYWORDS = [
     "胸痛", "呼吸困難", "麻痺", "劇烈頭痛", "意識不清",
     "大量出血", "嚴重外傷", "中毒", "過敏反應", "心悸"
 ]
+# Single-pass matcher for the keyword list (keywords are CJK, so no case folding is needed)
+EMERGENCY_KEYWORD_PATTERN = re.compile("|".join(map(re.escape, EMERGENCY_KEYWORDS)))
 
 MEDICAL_DISCLAIMER = """
 ⚠️ 重要聲明：
@@ -116,8 +118,7 @@ class MedicalSafetyService:
     @staticmethod
     def check_emergency_keywords(text: str) -> bool:
         """Check for emergency keywords in symptom text"""
-        text_lower = text.lower()
-        return any(keyword in text_lower for keyword in EMERGENCY_KEYWORDS)
+        return EMERGENCY_KEYWORD_PATTERN.search(text) is not None
 
     @staticmethod
     def get_emergency_response() -> TriageResponse:
@@ -221,4 +221,21 @@ def pytest_collection_modifyitems(config, items):
 
         # Mark Traditional Chinese tests
         if "traditional_chinese" in item.name or "zh_TW" in item.name:
-            item.add_marker(pytest.mark.traditional_chinese)
\ No newline at end of file
+            item.add_marker(pytest.mark.traditional_chinese)
+
+
+@pytest.fixture(autouse=True)
+def clear_geocode_cache():
+    """Clear cached geocoding results so each test sees its own mocked API responses"""
+    from app.services.geocoding import _GEO_CACHE
+    _GEO_CACHE.clear()
+    yield
+
+
+@pytest.fixture(autouse=True)
+def reset_places_state():
+    """Clear cached nearby-search results and any Places rate-limit pause between tests"""
+    from app.services import places
+    places._NEARBY_CACHE.clear()
+    places._pause_until = 0.0
+    yield
@@ -3,6 +3,7 @@ E2E tests for monitoring API endpoints.
 Tests complete monitoring dashboard functionality with real API integration.
 """
 
+import asyncio
 import json
 import time
 from datetime import datetime, timedelta
@@ -112,6 +113,26 @@ class TestHealthMonitoringEndpoints:
         assert "database" in health_data["checks"]
         assert health_data["checks"]["database"]["status"] == "unhealthy"
 
+    def test_health_check_summary_is_cached(self):
+        """Test bursts of summary health checks share one probe run."""
+        from app.routers import monitoring
+
+        monitoring._health_cache = None
+        health_data = {
+            "status": "healthy",
+            "timestamp": datetime.now().isoformat(),
+            "checks": {}
+        }
+        with patch.object(
+            monitoring.health_checker, "check_health", return_value=health_data
+        ) as mock_check:
+            self.client.get("/v1/monitoring/health")
+            self.client.get("/v1/monitoring/health")
+            self.client.get("/v1/monitoring/dashboard")
+        monitoring._health_cache = None
+
+        assert mock_check.call_count == 1
+
     def test_health_check_includes_correlation_id(self):
         """Test that health check includes correlation ID in response."""
         correlation_id = "test-correlation-123"
@@ -236,6 +257,22 @@ class TestMetricsEndpoints:
             if line.strip():
                 assert line.startswith('http_')
 
+    def test_metrics_prometheus_output_is_cached(self):
+        """Test repeated scrapes within the TTL share one render."""
+        from app.routers import monitoring
+
+        monitoring._metrics_cache.clear()
+        with patch.object(
+            monitoring.metrics_collector, "collect_system_metrics"
+        ) as mock_collect:
+            first = self.client.get("/v1/monitoring/metrics?name_pattern=system_*")
+            second = self.client.get("/v1/monitoring/metrics?name_pattern=system_*")
+
+        assert first.status_code == 200
+        assert second.status_code == 200
+        assert first.text == second.text
+        assert mock_collect.call_count == 1
+
     def test_business_metrics_endpoint(self):
         """Test business-specific metrics endpoint."""
         response = self.client.get("/v1/monitoring/metrics/business")
@@ -301,6 +338,51 @@ class TestMetricsEndpoints:
         assert "update_interval_seconds" in stream_data
         assert "stream_id" in stream_data
 
+    @pytest.mark.asyncio
+    async def test_real_time_metrics_sse_broadcast(self):
+        """Test SSE subscribers share one encoded payload per tick."""
+        from app.routers.monitoring import MetricsBroadcaster
+
+        broadcaster = MetricsBroadcaster(interval=0.2)
+        first = broadcaster.subscribe()
+        second = broadcaster.subscribe()
+
+        frame = await first.__anext__()
+        assert frame.startswith(b"data: ") and frame.endswith(b"\n\n")
+        assert isinstance(json.loads(frame[len(b"data: "):]), dict)
+        assert await second.__anext__() is frame
+
+        # Both subscribers receive the same object on the next tick
+        next_first = await first.__anext__()
+        next_second = await second.__anext__()
+        assert next_first is next_second
+
+        await first.aclose()
+        await second.aclose()
+        assert broadcaster._subscribers == 0
+
+    @pytest.mark.asyncio
+    async def test_real_time_metrics_sse_survives_snapshot_errors(self):
+        """Test a failing tick is skipped and a stopped broadcaster closes subscribers."""
+        from app.routers.monitoring import MetricsBroadcaster
+
+        broadcaster = MetricsBroadcaster(interval=0.05)
+        subscriber = broadcaster.subscribe()
+        await subscriber.__anext__()
+
+        # One failing snapshot must not kill the broadcast task
+        good_frame = b"data: {}\n\n"
+        with patch.object(MetricsBroadcaster, "_encode",
+                          side_effect=[RuntimeError("boom"), good_frame]):
+            frame = await asyncio.wait_for(subscriber.__anext__(), timeout=2)
+        assert frame is good_frame
+
+        # A broadcaster that stops wakes its subscribers instead of stranding them
+        broadcaster._task.cancel()
+        with pytest.raises(StopAsyncIteration):
+            await asyncio.wait_for(subscriber.__anext__(), timeout=2)
+        assert broadcaster._subscribers == 0
+
 
 class TestAuditLoggingEndpoints:
     """Test audit logging API endpoints."""
@@ -335,6 +417,13 @@ class TestAuditLoggingEndpoints:
             assert "user_email" not in event
             assert "phone_number" not in event
 
+    def test_audit_events_invalid_type_is_client_error(self):
+        """Test an unknown event type is reported as 400, not wrapped as 500."""
+        response = self.client.get("/v1/monitoring/audit/events?event_type=not_a_type")
+
+        assert response.status_code == 400
+        assert "Invalid event type" in response.json()["detail"]
+
     def test_audit_events_by_correlation_id(self):
         """Test querying audit events by correlation ID."""
         correlation_id = "test-correlation-456"
@@ -439,6 +528,23 @@ class TestAuditLoggingEndpoints:
         assert "legal_basis_breakdown" in compliance_data
         assert "data_subject_rights_requests" in compliance_data
 
+    def test_compliance_reporter_dependency_override(self):
+        """Test audit components are injected and can be overridden."""
+        from unittest.mock import AsyncMock
+        from app.routers.monitoring import get_compliance_reporter
+
+        reporter = Mock()
+        reporter.generate_pdpa_report = AsyncMock(return_value={"data_processing_events": 7})
+        app.dependency_overrides[get_compliance_reporter] = lambda: reporter
+        try:
+            response = self.client.get("/v1/monitoring/audit/compliance/pdpa")
+        finally:
+            app.dependency_overrides.pop(get_compliance_reporter, None)
+
+        assert response.status_code == 200
+        assert response.json()["data_processing_events"] == 7
+        reporter.generate_pdpa_report.assert_awaited_once()
+
     def test_security_audit_report_endpoint(self):
         """Test security audit reporting endpoint."""
         response = self.client.get("/v1/monitoring/audit/security")
@@ -560,6 +666,20 @@ class TestMonitoringDashboardEndpoints:
             assert "timestamps" in metric_data
             assert len(metric_data["values"]) == len(metric_data["timestamps"])
 
+    def test_dashboard_trends_etag_ignores_timestamps(self):
+        """Test trends revalidate with 304 after the timestamps have moved on."""
+        with freeze_time("2024-01-15 10:30:00") as frozen:
+            first = self.client.get("/v1/monitoring/dashboard/trends?period=1h")
+            frozen.tick(10)
+            revalidated = self.client.get(
+                "/v1/monitoring/dashboard/trends?period=1h",
+                headers={"If-None-Match": first.headers["ETag"]}
+            )
+            other_period = self.client.get("/v1/monitoring/dashboard/trends?period=6h")
+
+        assert revalidated.status_code == 304
+        assert other_period.headers["ETag"] != first.headers["ETag"]
+
     def test_dashboard_service_map(self):
         """Test service dependency map endpoint."""
         response = self.client.get("/v1/monitoring/dashboard/service-map")
@@ -588,6 +708,88 @@ class TestMonitoringDashboardEndpoints:
         assert "alert_thresholds" in config_data
         assert "display_preferences" in config_data
 
+    def test_dashboard_config_conditional_get(self):
+        """Test ETag revalidation returns 304 without a body."""
+        response = self.client.get("/v1/monitoring/dashboard/config")
+
+        assert response.status_code == 200
+        etag = response.headers["ETag"]
+        assert "max-age" in response.headers["Cache-Control"]
+
+        cached = self.client.get(
+            "/v1/monitoring/dashboard/config",
+            headers={"If-None-Match": etag}
+        )
+
+        assert cached.status_code == 304
+        assert cached.content == b""
+        assert cached.headers["ETag"] == etag
+
+    def test_dashboard_batch_endpoint(self):
+        """Test fetching several dashboard widgets in one request."""
+        response = self.client.post("/v1/monitoring/batch", json={
+            "requests": [
+                {"id": "summary", "path": "/v1/monitoring/dashboard"},
+                {"id": "trends", "path": "/v1/monitoring/dashboard/trends",
+                 "params": {"period": "6h"}},
+                {"id": "unknown", "path": "/v1/monitoring/audit/events"}
+            ]
+        })
+
+        assert response.status_code == 200
+        responses = response.json()["responses"]
+
+        assert responses["summary"]["status"] == 200
+        assert "overall_health" in responses["summary"]["body"]
+        assert responses["trends"]["status"] == 200
+        assert responses["trends"]["body"]["period"] == "6h"
+        assert responses["unknown"]["status"] == 404
+
+    def test_dashboard_batch_ignores_outer_conditional_headers(self):
+        """Test an If-None-Match on the batch POST does not turn widgets into empty 304s."""
+        etag = self.client.get("/v1/monitoring/dashboard/config").headers["ETag"]
+
+        response = self.client.post(
+            "/v1/monitoring/batch",
+            json={"requests": [{"id": "config", "path": "/v1/monitoring/dashboard/config"}]},
+            headers={"If-None-Match": etag}
+        )
+
+        assert response.status_code == 200
+        config = response.json()["responses"]["config"]
+        assert config["status"] == 200
+        assert config["body"]
+
+    def test_dashboard_batch_validates_period_only_for_trends(self):
+        """Test period is validated for the trends widget only."""
+        response = self.client.post("/v1/monitoring/batch", json={
+            "requests": [
+                {"id": "summary", "path": "/v1/monitoring/dashboard",
+                 "params": {"period": "2h"}},
+                {"id": "trends", "path": "/v1/monitoring/dashboard/trends",
+                 "params": {"period": "2h"}}
+            ]
+        })
+
+        assert response.status_code == 200
+        responses = response.json()["responses"]
+        assert responses["summary"]["status"] == 200
+        assert responses["trends"]["status"] == 422
+
+    def test_response_timestamps_cached_per_second(self):
+        """Test response timestamps are formatted at most once per second."""
+        from app.routers import monitoring
+
+        with freeze_time("2024-01-01 08:00:00.100000") as frozen:
+            first = monitoring._now_iso()
+            assert first == "2024-01-01T08:00:00.100000"
+
+            frozen.tick(0.5)
+            assert monitoring._now_iso() == first
+
+            frozen.tick(1)
+            assert monitoring._now_iso() == "2024-01-01T08:00:01.600000"
+
     def test_dashboard_export_report(self):
         """Test dashboard report export functionality."""
         response = self.client.get("/v1/monitoring/dashboard/export?format=pdf")
@@ -841,10 +1043,15 @@ class TestMonitoringIntegrationTests:
 
     def test_monitoring_rate_limiting(self):
         """Test rate limiting on monitoring endpoints."""
-        # Monitoring endpoints should have higher rate limits
-        # but should still be protected
+        # Health results are cached, so a rapid burst lands inside a single
+        # rate-limit window; monitoring endpoints share the default limit
+        from app.middlewares.rate_limit import RateLimitMiddleware
 
         endpoint = "/v1/monitoring/health"
+        self.client.get("/healthz")  # builds the middleware stack and its limiter
+        limiter = RateLimitMiddleware.rate_limiter
+        # Start from an empty window regardless of earlier tests' traffic
+        limiter._request_history.pop(limiter._get_key("testclient", endpoint), None)
 
         # Make many requests rapidly
         responses = []
@@ -852,9 +1059,10 @@ class TestMonitoringIntegrationTests:
             response = self.client.get(endpoint)
             responses.append(response)
 
-        # Should eventually hit rate limit
         status_codes = [r.status_code for r in responses]
+        allowed = limiter.max_requests
 
-        # Most should succeed, but may have some rate limiting
-        success_rate = sum(1 for code in status_codes if code == 200) / len(status_codes)
-        assert success_rate > 0.8  # At least 80% should succeed
\ No newline at end of file
+        # The first requests up to the limit succeed, the rest are throttled
+        assert status_codes[:allowed] == [200] * allowed
+        assert status_codes[allowed:] == [429] * (len(status_codes) - allowed)
+        assert "Retry-After" in responses[-1].headers
\ No newline at end of file
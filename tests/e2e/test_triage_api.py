@@ -7,7 +7,9 @@
 - 完整請求與快速評估端點
 """
 
+import re
 import pytest
+from unittest.mock import patch
 from fastapi.testclient import TestClient
 from app.main import app
 
@@ -57,6 +59,7 @@ class TestTriageAPI:
 
         # 驗證其他必要欄位
         assert data["request_id"] is not None
+        assert re.fullmatch(r"triage_[0-9a-f]{12}", data["request_id"])
         assert data["timestamp"] is not None
         assert data["locale"] == "zh-TW"
 
@@ -122,6 +125,41 @@ class TestTriageAPI:
         data = response.json()
         assert "triage_level" in data
 
+    def test_triage_runs_hospital_search_as_async_task(self, client):
+        """測試附近醫院搜尋在症狀分級完成前即已開始，結果併入回應"""
+        import asyncio
+        from types import SimpleNamespace
+        from app.routers import triage as triage_router
+
+        events = []
+
+        async def fake_nearby_hospitals_async(lat, lng, radius, max_results):
+            events.append("search_started")
+            # 模擬等待 Places API 回應
+            await asyncio.sleep(0)
+            return [SimpleNamespace(name="臺大醫院", address="台北市中正區", phone="02-23123456",
+                                    distance_meters=800, rating=4.2)]
+
+        real_rule_triage = triage_router.rule_triage
+
+        def recording_rule_triage(query):
+            result = real_rule_triage(query)
+            events.append("triage_done")
+            return result
+
+        with patch.object(triage_router, "nearby_hospitals_async", side_effect=fake_nearby_hospitals_async), \
+                patch.object(triage_router, "rule_triage", side_effect=recording_rule_triage):
+            response = client.post("/v1/triage", json={
+                "symptom_text": "頭很痛",
+                "include_nearby_hospitals": True,
+                "location": {"latitude": 25.0339, "longitude": 121.5645}
+            })
+
+        assert response.status_code == 200
+        assert response.json()["nearby_hospitals"][0]["name"] == "臺大醫院"
+        # 搜尋須在分級返回前就已開始，兩者才會重疊
+        assert events == ["search_started", "triage_done"]
+
     def test_quick_assessment(self, client):
         """測試快速評估端點"""
         response = client.post(
@@ -152,11 +190,27 @@ class TestTriageAPI:
         assert data["level"] == "emergency"
         assert "119" in data["emergency_numbers"]
 
+    def test_quick_assessment_reuses_cached_result(self, client):
+        """測試快速評估以正規化文字快取結果，全形空白等差異不會重新分級"""
+        from app.routers import triage as triage_router
+
+        # 清除其他測試留下的快取，確保第一次請求會實際分級
+        triage_router._QUICK_TRIAGE_CACHE.clear()
+        with patch.object(triage_router, "rule_triage", wraps=triage_router.rule_triage) as spy:
+            first = client.post("/v1/triage/quick", params={"symptom_text": "胸痛冒冷汗"})
+            second = client.post("/v1/triage/quick", params={"symptom_text": "\u3000胸痛冒冷汗 "})
+
+        assert first.status_code == second.status_code == 200
+        assert first.json() == second.json()
+        assert "cache_age" not in second.json()
+        assert spy.call_count == 1
+
     def test_get_emergency_symptoms_list(self, client):
         """測試取得緊急症狀列表"""
         response = client.get("/v1/triage/symptoms/emergency")
 
         assert response.status_code == 200
+        assert response.headers["cache-control"] == "public, max-age=3600"
         data = response.json()
 
         assert "emergency_symptoms" in data
@@ -176,6 +230,7 @@ class TestTriageAPI:
         response = client.get("/v1/triage/symptoms/mild")
 
         assert response.status_code == 200
+        assert response.headers["cache-control"] == "public, max-age=3600"
         data = response.json()
 
         assert "mild_symptoms" in data
@@ -196,9 +251,11 @@ class TestTriageAPI:
         response = client.get("/v1/triage/departments")
 
         assert response.status_code == 200
+        assert response.headers["cache-control"] == "public, max-age=3600"
         data = response.json()
 
         assert "departments" in data
+        assert data["total_departments"] == len(data["departments"])
         departments = data["departments"]
 
         # 驗證科別資訊
@@ -8,6 +8,7 @@
 """
 
 import pytest
+import dataclasses
 import json
 import tempfile
 import os
@@ -75,11 +76,12 @@ class TestNHIARegistry:
 
         yield temp_file_path
 
-        # 清理臨時檔案
-        try:
-            os.unlink(temp_file_path)
-        except OSError:
-            pass
+        # 清理臨時檔案（含名冊預先解析快取）
+        for path in (temp_file_path, temp_file_path + ".pkl"):
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
 
     def test_normalize_hospital_name(self):
         """測試醫院名稱正規化"""
@@ -112,6 +114,101 @@ class TestNHIARegistry:
         # 測試空白移除
         assert normalize_address("台北市　中正區　中山南路　7號") == "台北市中正区中山南路7号"
 
+    def test_extract_address_keywords(self):
+        """測試地址關鍵字擷取（區域、路名、段號；缺少者略過）"""
+        from app.services.nhia_registry import extract_address_keywords
+
+        assert extract_address_keywords("臺北市北投區石牌路二段201號") == (
+            "台北市北投区", "台北市北投区石牌路", "二段"
+        )
+        assert extract_address_keywords("台北市中正區中山南路7號") == (
+            "台北市中正区", "台北市中正区中山南路"
+        )
+        assert extract_address_keywords("7號") == ()
+
+    def test_normalize_text_composes_decomposed_input(self):
+        """測試分解形式（NFD）輸入會組合為 NFC，已是 NFC 者原樣保留"""
+        from app.services.nhia_registry import normalize_text
+
+        assert normalize_text("Cafe\u0301 診所") == "caf\u00e9诊所"
+        assert normalize_text("caf\u00e9診所") == "caf\u00e9诊所"
+
+    def test_registry_names_normalized_once_at_load(self, temp_registry_file):
+        """測試名冊名稱、地址與關鍵字於載入時預先處理，比對時只處理查詢端；地址關鍵字以不可變 tuple 快取"""
+        from app.services import nhia_registry
+        from app.services.nhia_registry import extract_address_keywords
+
+        registry = load_nhia_registry(temp_registry_file)
+        place = PlaceResult(
+            id="memo_test",
+            name="測試快取醫院",
+            address="臺北市北投區測試路一段1號",
+            latitude=25.1172,
+            longitude=121.5240
+        )
+
+        normalize_hospital_name.cache_clear()
+        nhia_registry._extract_keywords_from_normalized.cache_clear()
+        match_from_registry(place, registry)
+
+        info = normalize_hospital_name.cache_info()
+        assert info.misses + info.hits == 1
+        keyword_info = nhia_registry._extract_keywords_from_normalized.cache_info()
+        assert keyword_info.misses + keyword_info.hits == 1
+        assert registry.normalized_names == [
+            normalize_hospital_name(entry.hospital_name) for entry in registry
+        ]
+        assert registry.normalized_addresses == [
+            normalize_address(entry.address) for entry in registry
+        ]
+        assert registry.address_keywords == [
+            extract_address_keywords(entry.address) for entry in registry
+        ]
+        assert isinstance(extract_address_keywords(place.address), tuple)
+
+    def test_exact_name_and_address_hit_skips_scoring(self, temp_registry_file):
+        """測試名稱與地址皆完全符合時由索引直接命中，不逐筆計分"""
+        from unittest.mock import patch
+        from app.services import nhia_registry
+
+        registry = load_nhia_registry(temp_registry_file)
+        place = PlaceResult(
+            id="exact_test",
+            name="台北榮民總醫院",
+            address="台北市北投区石牌路二段201号",
+            latitude=25.1172,
+            longitude=121.5240
+        )
+
+        with patch.object(nhia_registry, "_address_match_score") as scorer:
+            match = match_from_registry(place, registry)
+
+        scorer.assert_not_called()
+        assert match.hospital_code == "1117050026"
+        assert match_from_registry(place, list(registry)).hospital_code == "1117050026"
+
+    def test_scan_skips_address_scoring_when_name_cannot_reach_threshold(self, temp_registry_file):
+        """測試名稱分數加上地址上限仍未達門檻時略過地址比對"""
+        from unittest.mock import patch
+        from app.services import nhia_registry
+
+        registry = load_nhia_registry(temp_registry_file)
+        place = PlaceResult(
+            id="prune_test",
+            name="完全無關的診所",
+            address="台北市中正区中山南路7号",
+            latitude=25.0,
+            longitude=121.5
+        )
+
+        with patch.object(
+            nhia_registry, "_address_match_score", wraps=nhia_registry._address_match_score
+        ) as scorer:
+            match = match_from_registry(place, registry, threshold=0.5)
+
+        assert match is None
+        scorer.assert_not_called()
+
     def test_load_nhia_registry(self, temp_registry_file):
         """測試載入健保名冊"""
         registry = load_nhia_registry(temp_registry_file)
@@ -265,6 +362,42 @@ class TestNHIARegistry:
         # 應該能根據地址關鍵字和名稱變體找到
         assert match is not None
 
+    def test_load_nhia_registry_uses_parsed_cache_until_json_changes(self, tmp_path, sample_nhia_data):
+        """測試名冊載入後寫入預先解析快取，JSON 更新後快取失效"""
+        from unittest.mock import patch
+        from app.services import nhia_registry
+
+        registry_path = tmp_path / "nhia_registry.json"
+        registry_path.write_text(json.dumps(sample_nhia_data, ensure_ascii=False), encoding="utf-8")
+
+        first = load_nhia_registry(str(registry_path))
+        assert (tmp_path / "nhia_registry.json.pkl").exists()
+
+        with patch.object(nhia_registry.json, "load", side_effect=AssertionError("JSON re-parsed")):
+            cached = load_nhia_registry(str(registry_path))
+        assert cached == first
+        assert cached.exact_index.keys() == first.exact_index.keys()
+
+        registry_path.write_text(json.dumps(sample_nhia_data[:1], ensure_ascii=False), encoding="utf-8")
+        cache_mtime = (tmp_path / "nhia_registry.json.pkl").stat().st_mtime_ns
+        os.utime(registry_path, ns=(cache_mtime + 1, cache_mtime + 1))
+
+        assert len(load_nhia_registry(str(registry_path))) == 1
+
+    def test_load_nhia_registry_ignores_cache_from_other_code_version(self, tmp_path, sample_nhia_data):
+        """測試正規化程式改變（快取指紋不同）時不沿用舊的預先解析快取"""
+        from unittest.mock import patch
+        from app.services import nhia_registry
+
+        registry_path = tmp_path / "nhia_registry.json"
+        registry_path.write_text(json.dumps(sample_nhia_data, ensure_ascii=False), encoding="utf-8")
+        with patch.object(nhia_registry, "_REGISTRY_CACHE_VERSION", "old-fingerprint"):
+            load_nhia_registry(str(registry_path))
+
+        assert nhia_registry._load_registry_cache(registry_path) is None
+        assert len(load_nhia_registry(str(registry_path))) == len(sample_nhia_data)
+        assert nhia_registry._load_registry_cache(registry_path) is not None
+
     def test_load_nhia_registry_file_not_found(self):
         """測試檔案不存在的處理"""
         registry = load_nhia_registry("non_existent_file.json")
@@ -298,6 +431,11 @@ class TestNHIARegistry:
         assert entry.hospital_name == "台大醫院"
         assert entry.is_contracted is True
 
+        # 名冊記錄不可變且不帶 __dict__
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            entry.is_contracted = False
+        assert not hasattr(entry, "__dict__")
+
     def test_integration_with_places_result(self, temp_registry_file):
         """測試與 Places 結果的整合"""
         registry = load_nhia_registry(temp_registry_file)
@@ -361,4 +499,96 @@ class TestNHIARegistry:
 
         # 第二個可能也有比對 (根據名稱變體)
         result2 = enhanced_results[1]
-        assert "is_contracted" in result2
\ No newline at end of file
+        assert "is_contracted" in result2
+
+    def test_enhance_places_reuses_loaded_registry_until_json_changes(self, tmp_path, sample_nhia_data):
+        """測試增強健保資訊時重用已載入名冊，JSON 修改時間改變後重新載入"""
+        from unittest.mock import patch
+        from app.services import nhia_registry
+        from app.services.nhia_registry import enhance_places_with_nhia_info
+
+        registry_path = tmp_path / "nhia_registry.json"
+        registry_path.write_text(json.dumps(sample_nhia_data, ensure_ascii=False), encoding="utf-8")
+        place = PlaceResult(
+            id="reuse_test",
+            name="台大醫院",
+            address="台北市中正區中山南路7號",
+            latitude=25.0408,
+            longitude=121.5149
+        )
+
+        with patch.object(
+            nhia_registry, "load_nhia_registry", wraps=nhia_registry.load_nhia_registry
+        ) as loader:
+            first = enhance_places_with_nhia_info([place], str(registry_path))
+            second = enhance_places_with_nhia_info([place], str(registry_path))
+            assert loader.call_count == 1
+
+            mtime_ns = registry_path.stat().st_mtime_ns
+            os.utime(registry_path, ns=(mtime_ns + 1_000_000, mtime_ns + 1_000_000))
+            enhance_places_with_nhia_info([place], str(registry_path))
+            assert loader.call_count == 2
+
+        assert first == second
+        assert first[0]["is_contracted"] is True
+
+    def test_enhance_places_result_fields(self, temp_registry_file):
+        """測試增強結果只含有值的可選欄位，並以健保名冊電話補足"""
+        from app.services.nhia_registry import enhance_places_with_nhia_info
+
+        places = [
+            PlaceResult(
+                id="matched",
+                name="台大醫院",
+                address="台北市中正區中山南路7號",
+                latitude=25.0408,
+                longitude=121.5149,
+                rating=4.2
+            ),
+            PlaceResult(
+                id="unmatched",
+                name="完全無關的診所",
+                address="高雄市前金區中正四路1號",
+                latitude=22.6273,
+                longitude=120.2966,
+                phone="07-1234567",
+                business_status="OPERATIONAL"
+            )
+        ]
+
+        matched, unmatched = enhance_places_with_nhia_info(places, temp_registry_file)
+
+        assert matched["phone"] == "02-23123456"
+        assert matched["rating"] == 4.2
+        assert matched["is_contracted"] is True
+        assert matched["nhia_type"] == "醫學中心"
+        assert "is_open_now" not in matched and "business_status" not in matched
+
+        assert unmatched["phone"] == "07-1234567"
+        assert unmatched["business_status"] == "OPERATIONAL"
+        assert unmatched["is_contracted"] is None
+        assert "rating" not in unmatched and "hospital_code" not in unmatched
+
+    def test_get_nhia_statistics(self, temp_registry_file):
+        """測試健保名冊統計"""
+        from app.services.nhia_registry import get_nhia_statistics
+
+        registry = load_nhia_registry(temp_registry_file)
+        stats = get_nhia_statistics(registry)
+
+        # 測試名冊共 4 筆，皆為健保特約的醫學中心、綜合科別
+        assert stats == {
+            "total_count": 4,
+            "by_type": {"醫學中心": 4},
+            "by_department": {"綜合": 4},
+            "contracted_count": 4,
+            "contract_ratio": 1.0
+        }
+        assert type(stats["by_type"]) is dict
+
+        assert get_nhia_statistics([]) == {
+            "total_count": 0,
+            "by_type": {},
+            "by_department": {},
+            "contracted_count": 0
+        }
@@ -9,6 +9,8 @@ Google Places Nearby Search 整合測試
 - 距離排序與評分排序
 """
 
+import json
+
 import pytest
 import httpx
 import respx
@@ -107,19 +109,18 @@ class TestPlacesNearbySearch:
 
             # 驗證請求參數
             assert request_captured is not None
-            request_body = request_captured.content.decode('utf-8')
+            request_body = json.loads(request_captured.content)
 
             # 驗證台灣在地化參數
-            assert '"languageCode": "zh-TW"' in request_body
-            assert '"regionCode": "TW"' in request_body
-            assert '"includedTypes": ["hospital"]' in request_body
+            assert request_body["languageCode"] == "zh-TW"
+            assert request_body["regionCode"] == "TW"
+            assert request_body["includedTypes"] == ["hospital"]
 
             # 驗證位置限制
-            assert '"circle"' in request_body
-            assert '"center"' in request_body
-            assert '"latitude": 25.0339' in request_body
-            assert '"longitude": 121.5645' in request_body
-            assert '"radius": 5000' in request_body
+            circle = request_body["locationRestriction"]["circle"]
+            # 圓心量化至約 110 公尺網格（與搜尋結果快取相同）
+            assert circle["center"] == {"latitude": round(25.0339, 3), "longitude": round(121.5645, 3)}
+            assert circle["radius"] == 5000
 
     def test_nearby_hospitals_missing_fields_handling(self):
         """測試缺少欄位的處理"""
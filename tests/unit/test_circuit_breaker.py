@@ -297,4 +297,21 @@ class TestCircuitBreaker:
         breaker.call(mock_func)
 
         assert ("open", "half_open") in state_changes
-        assert ("half_open", "closed") in state_changes
\ No newline at end of file
+        assert ("half_open", "closed") in state_changes
+
+    def test_recovery_uses_monotonic_clock(self):
+        """測試恢復計時不受系統時鐘調整影響"""
+        clock = [5 * 10**9]
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=10.0)
+
+        with patch("app.utils.resilience.time.monotonic_ns", side_effect=lambda: clock[0]), \
+                patch("app.utils.resilience.time.time", return_value=0.0):
+            with pytest.raises(httpx.ConnectTimeout):
+                breaker.call(Mock(side_effect=httpx.ConnectTimeout("Timeout")))
+            assert breaker.state == "open"
+
+            # 牆上時鐘停滯（或倒退）不影響，依 monotonic 經過時間恢復
+            clock[0] += 9 * 10**9
+            assert breaker.state == "open"
+            clock[0] += 1 * 10**9
+            assert breaker.state == "half_open"
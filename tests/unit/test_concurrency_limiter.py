@@ -0,0 +1,101 @@
+"""
+測試 AIMD 並行上限控制
+測試重點：
+- 超過上限的請求依序等待
+- 成功時加性增加上限
+- 失敗時乘性減少上限
+- 等待中被取消不佔用許可
+"""
+
+import asyncio
+import pytest
+from app.utils.resilience import AIMDConcurrencyLimiter
+
+
+class TestAIMDConcurrencyLimiter:
+    """AIMD 並行控制測試"""
+
+    @pytest.mark.asyncio
+    async def test_caps_concurrent_holders(self):
+        """測試同時持有許可的數量不超過上限"""
+        limiter = AIMDConcurrencyLimiter(initial_limit=2)
+        active = 0
+        peak = 0
+
+        async def worker():
+            nonlocal active, peak
+            async with limiter:
+                active += 1
+                peak = max(peak, active)
+                await asyncio.sleep(0.01)
+                active -= 1
+
+        await asyncio.gather(*(worker() for _ in range(6)))
+
+        assert peak == 2
+        assert limiter.in_flight == 0
+
+    def test_additive_increase_and_multiplicative_decrease(self):
+        """測試每累積上限次成功加 1，失敗減半且不低於下限"""
+        limiter = AIMDConcurrencyLimiter(initial_limit=4, min_limit=1, max_limit=5)
+
+        for _ in range(4):
+            limiter.record_success()
+        assert limiter.limit == 5
+
+        for _ in range(10):
+            limiter.record_success()
+        assert limiter.limit == 5
+
+        limiter.record_failure()
+        assert limiter.limit == 2
+        limiter.record_failure()
+        limiter.record_failure()
+        assert limiter.limit == 1
+
+    @pytest.mark.asyncio
+    async def test_increase_wakes_waiters_and_decrease_drains(self):
+        """測試上限提高時喚醒等待者；調降時進行中的請求不受影響"""
+        limiter = AIMDConcurrencyLimiter(initial_limit=1, max_limit=4)
+        await limiter.acquire()
+
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        assert not waiter.done()
+
+        limiter.record_success()
+        await asyncio.sleep(0)
+        assert waiter.done()
+        assert limiter.in_flight == 2
+
+        limiter.record_failure()
+        assert limiter.limit == 1
+        assert limiter.in_flight == 2
+
+        blocked = asyncio.create_task(limiter.acquire())
+        limiter.release()
+        await asyncio.sleep(0)
+        assert not blocked.done()
+        limiter.release()
+        await asyncio.sleep(0)
+        assert blocked.done()
+        limiter.release()
+        assert limiter.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_does_not_leak_permit(self):
+        """測試等待中被取消的請求不佔用許可"""
+        limiter = AIMDConcurrencyLimiter(initial_limit=1)
+        await limiter.acquire()
+
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+        limiter.release()
+        assert limiter.in_flight == 0
+
+        async with limiter:
+            assert limiter.in_flight == 1
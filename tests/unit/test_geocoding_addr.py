@@ -13,6 +13,7 @@ import httpx
 import respx
 from typing import Optional
 from unittest.mock import patch
+from freezegun import freeze_time
 from app.services.geocoding import geocode_address, GeocodeResult, GeocodeError
 
 
@@ -317,4 +318,133 @@ class TestGoogleGeocoding:
         assert result is None
 
         result = geocode_address(None, language="zh-TW")
-        assert result is None
\ No newline at end of file
+        assert result is None
+
+    @respx.mock
+    def test_geocoding_reuses_shared_http_client(self):
+        """測試多次地理編碼共用同一個 HTTP 連線池，關閉後會重新建立"""
+        from app.services import geocoding
+
+        respx.get("https://maps.googleapis.com/maps/api/geocode/json").mock(
+            return_value=httpx.Response(200, json={"results": [], "status": "ZERO_RESULTS"})
+        )
+
+        geocode_address("臺北市信義區", language="zh-TW")
+        first_client = geocoding._HTTP_CLIENT
+        geocode_address("臺中市西屯區", language="zh-TW")
+
+        assert first_client is not None
+        assert geocoding._HTTP_CLIENT is first_client
+        assert len(respx.calls) == 2
+
+        geocoding.close_http_client()
+        assert first_client.is_closed
+        assert geocoding._HTTP_CLIENT is None
+
+    @respx.mock
+    def test_geocoding_results_cached_by_confidence(self):
+        """測試地理編碼結果會被快取，TTL 依定位精度（ROOFTOP 7 天、APPROXIMATE 1 小時）"""
+        def geocode_payload(location_type):
+            return {
+                "results": [{
+                    "address_components": [
+                        {"long_name": "台灣", "short_name": "TW", "types": ["country"]}
+                    ],
+                    "formatted_address": "台灣台北市",
+                    "geometry": {
+                        "location": {"lat": 25.0330, "lng": 121.5654},
+                        "location_type": location_type
+                    },
+                    "place_id": "test_place"
+                }],
+                "status": "OK"
+            }
+
+        route = respx.get("https://maps.googleapis.com/maps/api/geocode/json").mock(
+            side_effect=lambda request: httpx.Response(200, json=geocode_payload(
+                "ROOFTOP" if "100" in request.url.params["address"] else "APPROXIMATE"
+            ))
+        )
+
+        with freeze_time("2024-01-15 10:00:00") as frozen:
+            precise = geocode_address("台北市信義區松仁路100號", language="zh-TW")
+            rough = geocode_address("台北市", language="zh-TW")
+            assert geocode_address(" 台北市信義區松仁路100號 ", language="zh-TW") == precise
+            assert geocode_address("台北市", language="zh-TW") == rough
+            assert route.call_count == 2
+
+            frozen.tick(2 * 3600)
+            assert geocode_address("台北市信義區松仁路100號", language="zh-TW") == precise
+            assert geocode_address("台北市", language="zh-TW") == rough
+            assert route.call_count == 3
+
+    def test_address_components_use_type_priority(self):
+        """測試組件含多個類型時依優先順序對應欄位，未知類型則忽略"""
+        from app.services.geocoding import _parse_address_components
+
+        parsed = _parse_address_components([
+            {"long_name": "台灣", "types": ["political", "country"]},
+            {"long_name": "110", "types": ["postal_code", "administrative_area_level_3"]},
+            {"long_name": "臺北市", "types": ["administrative_area_level_1", "political"]},
+            {"long_name": "忠孝東路", "types": ["route"]},
+            {"long_name": "信義商圈", "types": ["neighborhood"]}
+        ])
+
+        assert parsed == {
+            "country": "台灣",
+            "city": "臺北市",
+            "district": "110",
+            "street": "忠孝東路",
+            "street_number": "",
+            "postal_code": ""
+        }
+
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_batch_geocoding_dedupes_and_bounds_concurrency(self):
+        """測試批次地理編碼保留輸入順序、重複地址只查詢一次，且同時請求數不超過上限"""
+        import asyncio
+        from app.services.geocoding import geocode_addresses
+
+        in_flight = 0
+        peak = 0
+
+        async def respond(request):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            address = request.url.params["address"]
+            if address == "無效地址":
+                return httpx.Response(200, json={"results": [], "status": "ZERO_RESULTS"})
+            return httpx.Response(200, json={
+                "results": [{
+                    "address_components": [],
+                    "formatted_address": address,
+                    "geometry": {"location": {"lat": 25.0, "lng": 121.5}, "location_type": "ROOFTOP"}
+                }],
+                "status": "OK"
+            })
+
+        route = respx.get("https://maps.googleapis.com/maps/api/geocode/json").mock(side_effect=respond)
+
+        addresses = [f"台北市中正區{i}號" for i in range(6)] + ["台北市中正區0號 ", "無效地址", ""]
+        results = await geocode_addresses(addresses, concurrency=2)
+
+        assert [r.formatted_address if r else None for r in results] == (
+            [f"台北市中正區{i}號" for i in range(6)] + ["台北市中正區0號", None, None]
+        )
+        assert route.call_count == 7
+        assert peak <= 2
+
+    def test_geocode_result_is_immutable_and_slotted(self):
+        """測試地理編碼結果不可變更，可安全地在快取中共用"""
+        import dataclasses
+
+        result = GeocodeResult(latitude=25.0, longitude=121.5, formatted_address="台北市", country="台灣")
+
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            result.latitude = 0.0
+        assert not hasattr(result, "__dict__")
+        assert dataclasses.replace(result, city="臺北市").city == "臺北市"
@@ -179,6 +179,17 @@ class TestIPGeolocation:
         # 應該直接回傳 None，不嘗試 API 呼叫
         assert result is None
 
+    @pytest.mark.parametrize("ip_address", [
+        "10.0.0.8", "172.20.1.1", "127.0.0.1", "169.254.10.10",
+        "::1", "fe80::1", "fd12:3456::1", "testclient", "not-an-ip"
+    ])
+    def test_non_routable_or_invalid_ip_skips_lookup(self, ip_address):
+        """測試回送、鏈路本地、IPv6 私有位址與無法解析的字串都不會查詢外部 API"""
+        from app.services.geocoding import _is_private_ip
+
+        assert _is_private_ip(ip_address) is True
+        assert _is_private_ip("140.113.17.1") is False
+
     @respx.mock
     def test_api_rate_limiting_fallback(self):
         """測試 API 限流時的備援機制"""
@@ -234,4 +245,88 @@ class TestIPGeolocation:
         assert result.city == "Hsinchu"
         assert result.country == "TW"
         assert 24.0 <= result.latitude <= 25.5  # 台灣緯度範圍
-        assert 120.0 <= result.longitude <= 122.0  # 台灣經度範圍
\ No newline at end of file
+        assert 120.0 <= result.longitude <= 122.0  # 台灣經度範圍
+
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_async_geolocation_prefers_primary_provider(self):
+        """測試非同步版本先查詢 ipinfo.io，成功時不呼叫備援 API"""
+        from app.services.geocoding import ip_geolocate_async
+
+        ipinfo_route = respx.get("https://ipinfo.io/140.113.17.1/json").mock(
+            return_value=httpx.Response(200, json={"city": "Hsinchu", "country": "TW", "loc": "24.7877,120.9976"})
+        )
+        ipapi_route = respx.get("https://ipapi.co/140.113.17.1/json/").mock(
+            return_value=httpx.Response(200, json={
+                "city": "Taipei",
+                "country": "TW",
+                "latitude": 25.0330,
+                "longitude": 121.5654
+            })
+        )
+
+        result = await ip_geolocate_async("140.113.17.1")
+
+        assert ipinfo_route.called and not ipapi_route.called
+        assert result.city == "Hsinchu"
+        assert result.accuracy_radius_km == 30
+
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_async_geolocation_falls_back_to_ipapi(self):
+        """測試非同步版本在 ipinfo.io 失敗時改用 ipapi.co"""
+        from app.services.geocoding import ip_geolocate_async
+
+        ipinfo_route = respx.get("https://ipinfo.io/203.69.113.0/json").mock(
+            return_value=httpx.Response(429, json={"error": "Rate limited"})
+        )
+        ipapi_route = respx.get("https://ipapi.co/203.69.113.0/json/").mock(
+            return_value=httpx.Response(200, json={
+                "city": "Taipei",
+                "country": "TW",
+                "latitude": 25.0330,
+                "longitude": 121.5654
+            })
+        )
+
+        result = await ip_geolocate_async("203.69.113.0")
+
+        assert ipinfo_route.called and ipapi_route.called
+        assert result is not None
+        assert result.latitude == 25.0330
+        assert result.accuracy_radius_km == 50
+        assert await ip_geolocate_async("192.168.1.1") is None
+
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_async_geolocation_coalesces_concurrent_lookups(self):
+        """測試相同 IP 的並行查詢共用同一個請求"""
+        import asyncio
+        from app.services import geocoding
+
+        async def slow_ipinfo(request):
+            await asyncio.sleep(0.02)
+            return httpx.Response(200, json={"city": "Hsinchu", "country": "TW", "loc": "24.7877,120.9976"})
+
+        ipinfo_route = respx.get("https://ipinfo.io/140.113.17.1/json").mock(side_effect=slow_ipinfo)
+        respx.get("https://ipapi.co/140.113.17.1/json/").mock(return_value=httpx.Response(429))
+
+        results = await asyncio.gather(*(geocoding.ip_geolocate_async("140.113.17.1") for _ in range(5)))
+
+        assert ipinfo_route.call_count == 1
+        assert all(result is results[0] for result in results)
+        assert results[0].city == "Hsinchu"
+        assert "140.113.17.1" not in geocoding._IP_GEOLOCATE_INFLIGHT
+
+    @respx.mock
+    def test_ip_geolocation_does_not_warn_per_request(self, recwarn):
+        """測試 IP 定位不在每次請求時發出 warnings，精度資訊由結果的 accuracy_radius_km 提供"""
+        respx.get("https://ipinfo.io/140.113.17.1/json").mock(
+            return_value=httpx.Response(200, json={"city": "Hsinchu", "country": "TW", "loc": "24.7877,120.9976"})
+        )
+
+        result = ip_geolocate("140.113.17.1")
+        ip_geolocate("140.113.17.1")
+
+        assert result.accuracy_radius_km == 30
+        assert not [w for w in recwarn if issubclass(w.category, UserWarning)]
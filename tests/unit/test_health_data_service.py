@@ -0,0 +1,148 @@
+"""
+健康資料服務 HealthDataService 單元測試
+測試範圍：
+- YAML 資料載入（libyaml C 解析器、UTF-8 繁體中文）
+- 缺檔與格式錯誤時的降級行為
+"""
+
+import yaml
+
+from app.services import health_data
+from app.services.health_data import HealthDataService
+
+
+class TestHealthDataLoading:
+    """YAML 資料載入測試"""
+
+    def test_uses_libyaml_loader_when_available(self):
+        """測試 PyYAML 具備 libyaml 時使用 CSafeLoader"""
+        expected = yaml.CSafeLoader if yaml.__with_libyaml__ else yaml.SafeLoader
+        assert health_data._YAML_LOADER is expected
+
+    def test_loads_traditional_chinese_yaml(self, tmp_path):
+        """測試以位元組讀取的 YAML 正確解碼繁體中文"""
+        (tmp_path / "health_topics.yaml").write_text(
+            'health_topics:\n  - id: "t1"\n    title: "就醫流程指南"\n    priority: "high"\n',
+            encoding="utf-8"
+        )
+
+        service = HealthDataService(data_path=str(tmp_path))
+        topics = service.get_health_topics()
+
+        assert topics.total == 1
+        assert topics.topics[0].title == "就醫流程指南"
+        assert topics.topics[0].priority == 1
+
+    def test_missing_or_malformed_files_degrade_to_empty(self, tmp_path):
+        """測試缺檔或 YAML 格式錯誤時回傳空資料"""
+        (tmp_path / "health_resources.yaml").write_text("resources: [unclosed", encoding="utf-8")
+
+        service = HealthDataService(data_path=str(tmp_path))
+
+        assert service._load_yaml_file("health_topics.yaml") == {}
+        assert service._load_yaml_file("health_resources.yaml") == {}
+        assert service.get_health_topics().total == 0
+
+    def test_files_loaded_once_at_construction(self, tmp_path, monkeypatch):
+        """測試資料檔於建構時載入一次，之後的查詢不再讀檔"""
+        (tmp_path / "health_topics.yaml").write_text(
+            'health_topics:\n  - id: "t1"\n    title: "急診就醫指引"\n', encoding="utf-8"
+        )
+        service = HealthDataService(data_path=str(tmp_path))
+
+        def fail_load(filename):
+            raise AssertionError(f"unexpected reload of {filename}")
+
+        monkeypatch.setattr(service, "_load_yaml_file", fail_load)
+
+        assert service.get_health_topics().topics[0].title == "急診就醫指引"
+        assert service.get_health_resources().total == 0
+
+    def test_dependency_returns_shared_instance(self):
+        """測試依賴注入函式回傳同一個服務實例"""
+        assert health_data.get_health_data_service() is health_data.get_health_data_service()
+
+    def test_built_responses_reused_until_timeout(self, tmp_path, monkeypatch):
+        """測試建立好的回應物件在快取期限內重複使用，逾時後重新建立"""
+        (tmp_path / "health_topics.yaml").write_text(
+            'health_topics:\n  - id: "t1"\n    title: "急診就醫指引"\n', encoding="utf-8"
+        )
+        service = HealthDataService(data_path=str(tmp_path))
+        clock = [1000.0]
+        monkeypatch.setattr(health_data.time, "monotonic", lambda: clock[0])
+
+        first = service.get_health_topics()
+        assert service.get_health_topics() is first
+
+        clock[0] += service._cache_timeout + 1
+        rebuilt = service.get_health_topics()
+        assert rebuilt is not first
+        assert rebuilt.topics[0].title == "急診就醫指引"
+
+    def test_topics_validated_once_at_load(self, tmp_path, monkeypatch):
+        """測試健康主題於載入時驗證為模型，重建回應時沿用同一批模型"""
+        (tmp_path / "health_topics.yaml").write_text(
+            'health_topics:\n  - id: "t1"\n    title: "急診就醫指引"\n    priority: "medium"\n',
+            encoding="utf-8"
+        )
+        service = HealthDataService(data_path=str(tmp_path))
+        clock = [1000.0]
+        monkeypatch.setattr(health_data.time, "monotonic", lambda: clock[0])
+
+        first = service.get_health_topics()
+        clock[0] += service._cache_timeout + 1
+        rebuilt = service.get_health_topics()
+
+        assert rebuilt is not first
+        assert rebuilt.topics[0] is first.topics[0]
+        assert rebuilt.topics[0].priority == 2
+
+    def test_invalid_topic_data_logged_at_load(self, tmp_path, caplog):
+        """測試主題資料型別錯誤時於載入階段記錄錯誤並降級為空清單"""
+        (tmp_path / "health_topics.yaml").write_text(
+            'health_topics:\n  - id: "t1"\n    title: ["not", "a", "string"]\n', encoding="utf-8"
+        )
+
+        with caplog.at_level("ERROR", logger=health_data.__name__):
+            service = HealthDataService(data_path=str(tmp_path))
+
+        assert "Error parsing health topics" in caplog.text
+        assert service.get_health_topics().total == 0
+
+    def test_missing_resource_contact_and_services_default_to_empty(self, tmp_path):
+        """測試資源缺少聯絡資訊與服務項目時回傳各自獨立的空值"""
+        (tmp_path / "health_resources.yaml").write_text(
+            'health_resources:\n'
+            '  government_agencies:\n'
+            '    - id: "a1"\n      title: "衛生福利部"\n'
+            '    - id: "a2"\n      title: "疾病管制署"\n      contact: null\n'
+            '      services: ["防疫資訊"]\n',
+            encoding="utf-8"
+        )
+        service = HealthDataService(data_path=str(tmp_path))
+
+        first, second = service.get_health_resources().resources
+
+        assert first.contact == {} and first.services == []
+        assert second.contact == {} and second.services == ["防疫資訊"]
+        first.contact["phone"] = "1922"
+        assert second.contact == {}
+
+    def test_list_responses_built_without_revalidation(self, tmp_path, monkeypatch):
+        """測試主題與資源回應直接組裝已驗證的模型，不再經過 Pydantic 驗證"""
+        (tmp_path / "health_topics.yaml").write_text(
+            'health_topics:\n  - id: "t1"\n    title: "急診就醫指引"\n', encoding="utf-8"
+        )
+        service = HealthDataService(data_path=str(tmp_path))
+
+        def fail_validation(*args, **kwargs):
+            raise AssertionError("response re-validated")
+
+        monkeypatch.setattr(health_data.HealthTopicsResponse, "__init__", fail_validation)
+        monkeypatch.setattr(health_data.HealthResourcesResponse, "__init__", fail_validation)
+
+        topics = service.get_health_topics()
+        assert topics.total == 1
+        assert topics.language == "zh-TW"
+        assert topics.model_dump()["topics"][0]["title"] == "急診就醫指引"
+        assert service.get_health_resources().resources == []
@@ -60,4 +60,15 @@ class TestHealthCheck:
         # 驗證 X-Request-Id 格式（應該是有效的 UUID 或類似格式）
         request_id = response.headers["X-Request-Id"]
         assert isinstance(request_id, str)
-        assert len(request_id) >= 8  # 最少 8 字元的識別碼
\ No newline at end of file
+        assert len(request_id) >= 8  # 最少 8 字元的識別碼
+    def test_small_responses_are_not_gzipped(self):
+        """測試小於壓縮門檻的回應不經 gzip 壓縮"""
+        response = self.client.get("/healthz", headers={"Accept-Encoding": "gzip"})
+        assert response.status_code == 200
+        assert "content-encoding" not in response.headers
+
+    def test_large_responses_are_gzipped(self):
+        """測試超過 1KB 的回應以 gzip 壓縮"""
+        response = self.client.get("/openapi.json", headers={"Accept-Encoding": "gzip"})
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == "gzip"
@@ -0,0 +1,51 @@
+"""
+測試事件迴圈共用的 httpx.AsyncClient
+測試重點：
+- 同一事件迴圈重用同一個 client
+- 事件迴圈改變時建立新 client，並在舊迴圈上關閉舊 client
+- aclose 關閉目前的 client
+"""
+
+import asyncio
+import pytest
+from app.utils.http_client import LoopBoundAsyncClient
+
+
+async def _get(holder):
+    return holder.get()
+
+
+class TestLoopBoundAsyncClient:
+    """依事件迴圈管理的 AsyncClient 測試"""
+
+    @pytest.mark.asyncio
+    async def test_reuses_client_within_loop(self):
+        """測試同一事件迴圈內重用同一個 client"""
+        holder = LoopBoundAsyncClient(timeout=5.0)
+
+        client = holder.get()
+
+        assert holder.get() is client
+        await holder.aclose()
+        assert client.is_closed
+
+    def test_closes_previous_client_when_loop_changes(self):
+        """測試事件迴圈改變時，舊 client 於其原本的迴圈上關閉而不是被遺棄"""
+        holder = LoopBoundAsyncClient(timeout=5.0)
+        first_loop = asyncio.new_event_loop()
+        second_loop = asyncio.new_event_loop()
+        try:
+            first = first_loop.run_until_complete(_get(holder))
+            second = second_loop.run_until_complete(_get(holder))
+
+            assert second is not first
+            # 關閉排程在舊迴圈上，舊迴圈再次執行時完成
+            first_loop.run_until_complete(asyncio.sleep(0.01))
+            assert first.is_closed
+            assert not second.is_closed
+
+            second_loop.run_until_complete(holder.aclose())
+            assert second.is_closed
+        finally:
+            first_loop.close()
+            second_loop.close()
@@ -9,9 +9,12 @@ import httpx
 from unittest.mock import patch, Mock
 from app.services.places import (
     nearby_hospitals,
+    nearby_hospitals_async,
+    nearby_hospitals_batch,
     format_hospital_results,
     PlaceResult,
     calculate_distance,
+    calculate_distances,
     nearby_hospitals_with_fallback,
     PlacesAPIError
 )
@@ -68,6 +71,20 @@ class TestPlaceResult:
         assert result.phone is None
         assert result.rating is None
         assert result.is_open_now is None
+        assert result.opening_hours == []
+
+    def test_place_result_is_immutable_and_slotted(self):
+        """測試：PlaceResult 不可變且不帶 __dict__"""
+        import dataclasses
+
+        result = PlaceResult(id="test_id", name="測試醫院", address="測試地址",
+                             latitude=25.0, longitude=121.5)
+
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            result.distance_meters = 100
+        assert not hasattr(result, "__dict__")
+        assert PlaceResult(id="other", name="其他", address="", latitude=25.0,
+                           longitude=121.5).opening_hours is not result.opening_hours
 
 
 class TestNearbyHospitals:
@@ -193,6 +210,352 @@ class TestNearbyHospitals:
         # Then
         assert results == []
 
+    @respx.mock
+    def test_nearby_hospitals_invalid_json_response(self):
+        """測試：回應不是合法 JSON 時轉為 INVALID_RESPONSE 錯誤"""
+        import orjson
+
+        route = respx.post("https://places.googleapis.com/v1/places:searchNearby").mock(
+            return_value=httpx.Response(200, content=b"<html>not json</html>")
+        )
+
+        with pytest.raises(PlacesAPIError) as exc_info:
+            nearby_hospitals(25.0330, 121.5654, 1000, 10)
+
+        assert exc_info.value.error_type == "INVALID_RESPONSE"
+        assert orjson.loads(route.calls.last.request.content)["maxResultCount"] == 10
+
+    @pytest.mark.parametrize("error, error_type", [
+        (httpx.ConnectTimeout("timeout"), "TIMEOUT"),
+        (httpx.WriteTimeout("timeout"), "TIMEOUT"),
+        (httpx.RemoteProtocolError("protocol"), "NETWORK_ERROR"),
+        (httpx.ConnectError("refused"), "NETWORK_ERROR"),
+    ])
+    @respx.mock
+    def test_nearby_hospitals_transport_errors(self, error, error_type):
+        """測試：傳輸錯誤依例外類別轉為對應的 PlacesAPIError，並保留原始例外"""
+        respx.post("https://places.googleapis.com/v1/places:searchNearby").mock(side_effect=error)
+
+        with pytest.raises(PlacesAPIError) as exc_info:
+            nearby_hospitals(25.0330, 121.5654, 1000, 10)
+
+        assert exc_info.value.error_type == error_type
+        assert exc_info.value.__cause__ is error
+
+
+class TestNearbyHospitalsAsync:
+    """測試附近醫院搜尋（非同步版本）"""
+
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_nearby_hospitals_async_reuses_client(self):
+        """測試：非同步搜尋結果與同步版本一致，並重用同一事件迴圈的連線池"""
+        from app.services import places
+
+        respx.post("https://places.googleapis.com/v1/places:searchNearby").mock(
+            return_value=httpx.Response(200, json={"places": [
+                {
+                    "id": "place_far",
+                    "displayName": {"text": "馬偕醫院"},
+                    "location": {"latitude": 25.0630, "longitude": 121.5234}
+                },
+                {
+                    "id": "place_near",
+                    "displayName": {"text": "台大醫院"},
+                    "location": {"latitude": 25.0408, "longitude": 121.5129}
+                }
+            ]})
+        )
+
+        results = await nearby_hospitals_async(25.0330, 121.5654, 3000, 10)
+        client = places._get_async_http_client()
+        await nearby_hospitals_async(25.0330, 121.5654, 3000, 10)
+
+        assert [r.id for r in results] == ["place_near", "place_far"]
+        assert places._get_async_http_client() is client
+
+        await places.close_async_http_client()
+        assert client.is_closed
+
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_nearby_hospitals_async_maps_errors(self):
+        """測試：非同步版本將配額錯誤與網路錯誤轉為 PlacesAPIError"""
+        from app.services import places
+
+        route = respx.post("https://places.googleapis.com/v1/places:searchNearby")
+
+        route.mock(side_effect=httpx.ConnectError("Network error"))
+        with pytest.raises(PlacesAPIError) as exc_info:
+            await nearby_hospitals_async(25.0330, 121.5654, 1000, 10)
+        assert exc_info.value.error_type == "NETWORK_ERROR"
+
+        route.mock(side_effect=None, return_value=httpx.Response(429))
+        with pytest.raises(PlacesAPIError) as exc_info:
+            await nearby_hospitals_async(25.0330, 121.5654, 1000, 10)
+        assert exc_info.value.error_type == "RESOURCE_EXHAUSTED"
+
+        await places.close_async_http_client()
+
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_nearby_hospitals_async_adjusts_concurrency_limit(self):
+        """測試：成功回應放寬並行上限，429 時減半"""
+        from app.services import places
+        from app.utils.resilience import AIMDConcurrencyLimiter
+
+        limiter = AIMDConcurrencyLimiter(initial_limit=1, max_limit=8)
+        route = respx.post("https://places.googleapis.com/v1/places:searchNearby")
+
+        with patch.object(places, "_PLACES_CONCURRENCY", limiter):
+            route.mock(return_value=httpx.Response(200, json={"places": []}))
+            await nearby_hospitals_async(25.0330, 121.5654, 1000, 10)
+            await nearby_hospitals_async(25.0450, 121.5654, 1000, 10)
+            assert limiter.limit == 2
+
+            route.mock(return_value=httpx.Response(429))
+            with pytest.raises(PlacesAPIError):
+                await nearby_hospitals_async(25.0600, 121.5654, 1000, 10)
+            assert limiter.limit == 1
+            assert limiter.in_flight == 0
+
+        await places.close_async_http_client()
+
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_nearby_hospitals_async_retries_timeouts(self):
+        """測試：讀取逾時以非同步退避重試，重試用盡才回報 TIMEOUT"""
+        from unittest.mock import AsyncMock
+        from app.services import places
+
+        route = respx.post("https://places.googleapis.com/v1/places:searchNearby")
+        route.side_effect = [
+            httpx.ReadTimeout("timeout"),
+            httpx.Response(200, json={"places": []})
+        ]
+
+        with patch("app.utils.resilience.asyncio.sleep", new_callable=AsyncMock) as mock_sleep:
+            assert await nearby_hospitals_async(25.0330, 121.5654, 1000, 10) == []
+            assert route.call_count == 2
+            assert mock_sleep.await_count == 1
+
+            route.side_effect = httpx.ReadTimeout("timeout")
+            with pytest.raises(PlacesAPIError) as exc_info:
+                await nearby_hospitals_async(25.0450, 121.5654, 1000, 10)
+            assert exc_info.value.error_type == "TIMEOUT"
+            assert route.call_count == 2 + 1 + places._ASYNC_RETRY_MAX
+
+        await places.close_async_http_client()
+
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_sync_and_async_requests_send_same_headers(self):
+        """測試：同步與非同步版本送出相同的固定標頭與 API 金鑰"""
+        from app.services import places
+
+        route = respx.post("https://places.googleapis.com/v1/places:searchNearby").mock(
+            return_value=httpx.Response(200, json={"places": []})
+        )
+
+        nearby_hospitals(25.0330, 121.5654, 1000, 10)
+        await nearby_hospitals_async(25.0450, 121.5654, 1000, 10)
+
+        api_key = places.get_settings().google_places_api_key
+        for sent in route.calls:
+            assert sent.request.headers["Content-Type"] == "application/json"
+            assert sent.request.headers["X-Goog-FieldMask"] == places._PLACES_FIELD_MASK
+            assert sent.request.headers["X-Goog-Api-Key"] == api_key
+
+        await places.close_async_http_client()
+
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_nearby_hospitals_batch_keeps_order_and_partial_failures(self):
+        """測試：批次搜尋依輸入順序回傳，重複查詢只送一次，個別失敗以例外物件表示"""
+        from app.services import places
+
+        def respond(request):
+            import orjson
+            center = orjson.loads(request.content)["locationRestriction"]["circle"]["center"]
+            if center["latitude"] == 25.0600:
+                return httpx.Response(503)
+            return httpx.Response(200, json={"places": [
+                {"id": f"place_{center['latitude']}", "displayName": {"text": "醫院"},
+                 "location": {"latitude": center["latitude"], "longitude": center["longitude"]}}
+            ]})
+
+        route = respx.post("https://places.googleapis.com/v1/places:searchNearby").mock(side_effect=respond)
+
+        results = await nearby_hospitals_batch([
+            (25.0330, 121.5654, 1000),
+            (25.0600, 121.5654, 1000),
+            (91.0, 121.5654, 1000),
+            (25.0330, 121.5654, 1000),
+        ], max_results=5)
+
+        assert route.call_count == 2
+        assert [r.id for r in results[0]] == ["place_25.033"]
+        assert isinstance(results[1], PlacesAPIError)
+        assert isinstance(results[2], ValueError)
+        assert results[3] == results[0] and results[3] is not results[0]
+
+        await places.close_async_http_client()
+
+
+class TestNearbyHospitalsCache:
+    """測試附近醫院搜尋的網格快取"""
+
+    @respx.mock
+    def test_nearby_searches_share_grid_cell_and_rerank(self):
+        """測試：同一網格內的鄰近查詢共用 API 結果，距離依各自座標重新計算"""
+        route = respx.post("https://places.googleapis.com/v1/places:searchNearby").mock(
+            return_value=httpx.Response(200, json={"places": [
+                {"id": "place_1", "displayName": {"text": "台大醫院"},
+                 "location": {"latitude": 25.0408, "longitude": 121.5129}}
+            ]})
+        )
+
+        first = nearby_hospitals(25.03301, 121.56541, 3000, 10)
+        second = nearby_hospitals(25.03304, 121.56543, 3000, 10)
+
+        assert route.call_count == 1
+        assert second[0].id == "place_1"
+        assert second[0] is not first[0]
+        assert second[0].distance_meters == calculate_distance(25.03304, 121.56543, 25.0408, 121.5129)
+
+        # 不同網格或不同半徑需重新查詢
+        nearby_hospitals(25.0450, 121.56541, 3000, 10)
+        nearby_hospitals(25.03301, 121.56541, 5000, 10)
+        assert route.call_count == 3
+
+    def test_rank_by_distance_keeps_nearest_in_stable_order(self):
+        """測試：只保留最近的 max_results 筆，等距者維持 API 原順序"""
+        from app.services.places import _rank_by_distance
+
+        places = [
+            {"id": "far", "name": "遠", "address": "", "latitude": 25.10, "longitude": 121.5654},
+            {"id": "tie_a", "name": "甲", "address": "", "latitude": 25.04, "longitude": 121.5654},
+            {"id": "near", "name": "近", "address": "", "latitude": 25.034, "longitude": 121.5654},
+            {"id": "tie_b", "name": "乙", "address": "", "latitude": 25.04, "longitude": 121.5654},
+        ]
+
+        ranked = _rank_by_distance(places, 25.0330, 121.5654, 3)
+
+        assert [r.id for r in ranked] == ["near", "tie_a", "tie_b"]
+        assert [r.id for r in _rank_by_distance(places, 25.0330, 121.5654, 10)] == [
+            "near", "tie_a", "tie_b", "far"
+        ]
+
+    @respx.mock
+    def test_request_body_uses_grid_center_and_is_reused(self):
+        """測試：請求圓心為量化後的網格座標，同一網格重用序列化後的請求內容"""
+        import orjson
+        from app.services import places
+
+        route = respx.post("https://places.googleapis.com/v1/places:searchNearby").mock(
+            return_value=httpx.Response(503)
+        )
+        places._nearby_request_body.cache_clear()
+
+        for lat in (25.03301, 25.03304):
+            with pytest.raises(PlacesAPIError):
+                nearby_hospitals(lat, 121.56541, 3000, 50)
+
+        first, second = (sent.request.content for sent in route.calls)
+        assert first == second
+        body = orjson.loads(first)
+        assert body["locationRestriction"]["circle"]["center"] == {"latitude": 25.033, "longitude": 121.565}
+        assert body["maxResultCount"] == 20
+        assert places._nearby_request_body.cache_info().hits == 1
+
+    @respx.mock
+    def test_failed_searches_are_not_cached(self):
+        """測試：API 錯誤不寫入快取"""
+        route = respx.post("https://places.googleapis.com/v1/places:searchNearby")
+        route.side_effect = [
+            httpx.Response(503),
+            httpx.Response(200, json={"places": []})
+        ]
+
+        with pytest.raises(PlacesAPIError):
+            nearby_hospitals(25.0330, 121.5654, 3000, 10)
+        assert nearby_hospitals(25.0330, 121.5654, 3000, 10) == []
+        assert route.call_count == 2
+
+
+class TestNearbyHospitalsRateLimit:
+    """測試依 Places API 回應標頭暫停請求"""
+
+    @respx.mock
+    def test_retry_after_pauses_requests(self):
+        """測試：429 的 Retry-After 期間不再送出請求，過期後恢復"""
+        from app.services import places
+
+        route = respx.post("https://places.googleapis.com/v1/places:searchNearby").mock(
+            return_value=httpx.Response(429, headers={"Retry-After": "30"})
+        )
+
+        with pytest.raises(PlacesAPIError) as exc_info:
+            nearby_hospitals(25.0330, 121.5654, 3000, 10)
+        assert exc_info.value.retry_after == 30.0
+
+        with pytest.raises(PlacesAPIError) as exc_info:
+            nearby_hospitals(25.0330, 121.5654, 3000, 10)
+        assert exc_info.value.status_code == 429
+        assert exc_info.value.error_type == "RESOURCE_EXHAUSTED"
+        assert 0 < exc_info.value.retry_after <= 30
+        assert route.call_count == 1
+
+        route.mock(return_value=httpx.Response(200, json={"places": []}))
+        with patch.object(places.time, "monotonic", return_value=places._pause_until + 0.1):
+            assert nearby_hospitals(25.0330, 121.5654, 3000, 10) == []
+        assert route.call_count == 2
+
+    @respx.mock
+    def test_low_remaining_quota_pauses_requests(self):
+        """測試：剩餘配額低於上限 10% 時主動短暫暫停"""
+        from app.services import places
+
+        route = respx.post("https://places.googleapis.com/v1/places:searchNearby")
+
+        route.mock(return_value=httpx.Response(
+            200, json={"places": []},
+            headers={"X-RateLimit-Remaining": "50", "X-RateLimit-Limit": "100"}
+        ))
+        nearby_hospitals(25.0330, 121.5654, 3000, 10)
+        assert places._pause_until == 0.0
+
+        route.mock(return_value=httpx.Response(
+            200, json={"places": []},
+            headers={"X-Goog-Quota-Remaining": "5", "X-Goog-Quota-Limit": "100"}
+        ))
+        nearby_hospitals(25.0450, 121.5654, 3000, 10)
+
+        with pytest.raises(PlacesAPIError) as exc_info:
+            nearby_hospitals(25.0600, 121.5654, 3000, 10)
+        assert exc_info.value.retry_after <= places._LOW_QUOTA_PAUSE_SECONDS
+        assert route.call_count == 2
+
+    def test_parse_retry_after(self):
+        """測試：Retry-After 支援秒數與 HTTP 日期格式"""
+        from app.services.places import _parse_retry_after
+
+        assert _parse_retry_after("120") == 120.0
+        assert _parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+        assert _parse_retry_after("soon") is None
+
+    @respx.mock
+    def test_fallback_reports_retry_after(self):
+        """測試：降級回應附上建議重試秒數"""
+        respx.post("https://places.googleapis.com/v1/places:searchNearby").mock(
+            return_value=httpx.Response(429, headers={"Retry-After": "7"})
+        )
+
+        result = nearby_hospitals_with_fallback(25.0330, 121.5654)
+
+        assert result["status"] == "degraded"
+        assert result["retry_after"] == 7
+
 
 class TestNearbyHospitalsWithFallback:
     """測試附近醫院搜尋降級功能"""
@@ -242,6 +605,32 @@ class TestNearbyHospitalsWithFallback:
         assert "results" in result
         assert "emergency_numbers" in result
 
+    def test_static_fallback_returns_fresh_lists(self):
+        """測試：靜態降級每次回傳新的列表與 dict，不修改共用的院所資料"""
+        from app.services.places import _fallback_to_static_hospitals
+
+        first = _fallback_to_static_hospitals(25.0330, 121.5654)
+        first["results"][0]["name"] = "已修改"
+        first["results"].clear()
+        first["emergency_numbers"].append("999")
+
+        second = _fallback_to_static_hospitals(25.0330, 121.5654)
+        assert len(second["results"]) == 5
+        assert second["results"][0]["name"] == "臺大醫院"
+        assert second["emergency_numbers"] == ["119", "110", "112"]
+
+    def test_static_fallback_sorted_by_distance_to_user(self):
+        """測試：靜態降級依與使用者的距離排序並附上距離"""
+        from app.services.places import _fallback_to_static_hospitals
+
+        result = _fallback_to_static_hospitals(22.6273, 120.3014)  # 高雄
+
+        names = [hospital["name"] for hospital in result["results"]]
+        assert names[:2] == ["高雄醫學大學附設醫院", "成大醫院"]
+        distances = [hospital["distance_meters"] for hospital in result["results"]]
+        assert distances == sorted(distances)
+        assert distances[0] == calculate_distance(22.6273, 120.3014, 22.6465, 120.3094)
+
 
 class TestPlacesAPIError:
     """測試Places API錯誤物件"""
@@ -405,6 +794,16 @@ class TestCalculateDistance:
         # Then
         assert distance >= 0
 
+    def test_calculate_distances_matches_scalar(self):
+        """測試：批次距離計算與逐點計算結果一致"""
+        origin = (25.0330, 121.5654)
+        points = [(25.0408, 121.5129), (25.0630, 121.5234), (22.6273, 120.3014), (25.0330, 121.5654)]
+
+        assert calculate_distances(*origin, points) == [
+            calculate_distance(*origin, *point) for point in points
+        ]
+        assert calculate_distances(*origin, []) == []
+
 
 class TestPlacesErrorHandling:
     """測試地點服務錯誤處理"""
@@ -299,4 +299,80 @@ class TestRateLimiting:
         limiter.cleanup_expired()
 
         # 過期記錄應該被清理
-        assert len(limiter._request_history) < initial_size
\ No newline at end of file
+        assert len(limiter._request_history) < initial_size
+
+    def test_cleanup_removes_least_recently_used_expired_clients(self):
+        """測試清理由最久未存取的鍵開始，移除過期者並保留仍在使用中的鍵"""
+        clock = [1000.0]
+        limiter = RateLimiter(max_requests=5, window_seconds=10)
+
+        with patch("app.utils.resilience.time.monotonic_ns", side_effect=lambda: round(clock[0] * 1e9)):
+            limiter.check_rate_limit("idle")
+            limiter.check_rate_limit("active")
+            clock[0] = 1015.0
+            limiter.check_rate_limit("active")
+
+            clock[0] = 1025.0
+            limiter.cleanup_expired()
+
+        assert list(limiter._request_history) == ["active"]
+
+    def test_tracked_clients_bounded_by_lru(self):
+        """測試追蹤的鍵數超過上限時淘汰最久未存取者"""
+        limiter = RateLimiter(max_requests=5, window_seconds=60, max_clients=2)
+
+        limiter.check_rate_limit("a")
+        limiter.check_rate_limit("b")
+        limiter.check_rate_limit("a")
+        limiter.check_rate_limit("c")
+
+        assert list(limiter._request_history) == ["a", "c"]
+
+    def test_sliding_window_evicts_oldest_and_reports_retry_after(self):
+        """測試滑動窗口逐筆淘汰最舊請求，Retry-After 以最舊請求計算"""
+        clock = [1000.0]
+        limiter = RateLimiter(max_requests=3, window_seconds=10, sliding_window=True,
+                              burst_size=2, burst_window=1)
+
+        with patch("app.utils.resilience.time.monotonic_ns", side_effect=lambda: round(clock[0] * 1e9)):
+            for offset in (0.0, 2.0, 4.0):
+                clock[0] = 1000.0 + offset
+                assert limiter.check_rate_limit("10.0.0.1")
+
+            clock[0] = 1004.5
+            assert limiter.check_rate_limit("10.0.0.1") is False
+            assert limiter.get_retry_after("10.0.0.1") == 5
+
+            # 最舊的一筆過期後只釋出一個名額
+            clock[0] = 1010.0
+            assert limiter.check_rate_limit("10.0.0.1")
+            assert list(limiter._request_history["10.0.0.1"]) == [1002 * 10**9, 1004 * 10**9, 1010 * 10**9]
+            assert limiter.check_rate_limit("10.0.0.1") is False
+
+            # 突發限制：1 秒內最多 2 筆
+            clock[0] = 1030.0
+            assert limiter.check_rate_limit("10.0.0.1")
+            assert limiter.check_rate_limit("10.0.0.1")
+            assert limiter.check_rate_limit("10.0.0.1") is False
+
+    def test_redis_rate_limiter_uses_single_atomic_script(self):
+        """測試 Redis 速率限制以單一腳本原子判斷，Redis 錯誤時降級為允許"""
+        from app.utils.redis_rate_limiter import RedisRateLimiter
+
+        redis_client = Mock()
+        script = redis_client.register_script.return_value
+        script.side_effect = [1, 0, ConnectionError("redis down")]
+
+        limiter = RedisRateLimiter(redis_client=redis_client, max_requests=5, window_seconds=60)
+
+        assert limiter.check_rate_limit("10.0.0.1") is True
+        assert limiter.check_rate_limit("10.0.0.1") is False
+        assert limiter.check_rate_limit("10.0.0.1") is True
+
+        keys = script.call_args.kwargs["keys"]
+        now, window, limit, member = script.call_args.kwargs["args"]
+        assert keys == ["rate_limit:10.0.0.1"]
+        assert (window, limit) == (60, 5)
+        assert member.startswith(f"{now}:")
+        redis_client.pipeline.assert_not_called()
+        redis_client.zrem.assert_not_called()
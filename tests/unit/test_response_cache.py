@@ -0,0 +1,124 @@
+"""
+測試回應快取 ResponseCache
+"""
+
+import asyncio
+
+import pytest
+from freezegun import freeze_time
+
+from app.services.cache import ResponseCache
+
+
+def test_cache_key_ignores_argument_order():
+    """測試快取鍵與參數順序無關"""
+    cache = ResponseCache(ttl=300)
+    cache.set({"results": [1]}, lat=25.04, lng=121.56, radius=3000)
+
+    cached = cache.get(radius=3000, lng=121.56, lat=25.04)
+
+    assert cached is not None
+    assert cached["results"] == [1]
+    assert cached["cache_age"] == 0
+
+
+def test_cache_key_distinguishes_values_and_field_boundaries():
+    """測試不同參數值或欄位切分不會產生相同快取鍵"""
+    cache = ResponseCache(ttl=300)
+
+    assert cache._get_key(lat=25.04, lng=121.56) != cache._get_key(lat=25.04, lng=121.57)
+    assert cache._get_key(a="1", b="2") != cache._get_key(a="1\x01b\x002")
+    assert len(cache._get_key(lat=25.04)) == 16
+
+
+def test_cache_evicts_least_recently_used_beyond_maxsize():
+    """測試超過容量時淘汰最久未使用的項目"""
+    cache = ResponseCache(ttl=300, maxsize=2)
+    cache.set({"n": 1}, q="a")
+    cache.set({"n": 2}, q="b")
+
+    assert cache.get(q="a")["n"] == 1  # 讀取後 a 變成最近使用
+    cache.set({"n": 3}, q="c")
+
+    assert cache.get(q="b") is None
+    assert cache.get(q="a")["n"] == 1
+    assert cache.get(q="c")["n"] == 3
+
+
+def test_cache_expires_entries_lazily():
+    """測試過期項目於讀取時移除"""
+    with freeze_time("2024-01-15 10:00:00") as frozen:
+        cache = ResponseCache(ttl=60)
+        cache.set({"n": 1}, q="a")
+
+        frozen.tick(30)
+        assert cache.get(q="a")["cache_age"] == 30
+
+        frozen.tick(31)
+        assert cache.get(q="a") is None
+        assert len(cache._cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_stale_entries_served_while_refreshing_once():
+    """測試過期後的寬限期內回傳舊資料，並只排程一次背景更新"""
+    cache = ResponseCache(ttl=60, stale_ttl=60)
+    refreshed = asyncio.Event()
+    refresh_calls = 0
+
+    async def refresh():
+        nonlocal refresh_calls
+        refresh_calls += 1
+        cache.set({"n": 2}, q="a")
+        refreshed.set()
+
+    with freeze_time("2024-01-15 10:00:00") as frozen:
+        cache.set({"n": 1}, q="a")
+        frozen.tick(90)
+
+        first = cache.get(on_stale=refresh, q="a")
+        second = cache.get(on_stale=refresh, q="a")
+        assert first["n"] == second["n"] == 1
+        assert first["stale"] is True
+
+        await asyncio.wait_for(refreshed.wait(), timeout=1)
+        fresh = cache.get(on_stale=refresh, q="a")
+        assert fresh["n"] == 2
+        assert "stale" not in fresh
+        assert refresh_calls == 1
+
+        frozen.tick(121)
+        assert cache.get(on_stale=refresh, q="a") is None
+        assert cache.get(q="a") is None
+
+
+@pytest.mark.asyncio
+async def test_failed_refresh_backs_off_before_retrying():
+    """測試背景更新失敗後，退避期間內只回傳舊資料而不重複觸發更新"""
+    cache = ResponseCache(ttl=60, stale_ttl=600, refresh_backoff=30)
+    refresh_calls = 0
+
+    async def failing_refresh():
+        nonlocal refresh_calls
+        refresh_calls += 1
+        raise RuntimeError("backend down")
+
+    with freeze_time("2024-01-15 10:00:00") as frozen:
+        cache.set({"n": 1}, q="a")
+        frozen.tick(90)
+
+        assert cache.get(on_stale=failing_refresh, q="a")["stale"] is True
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+
+        # 退避期間內仍回傳舊資料，但不再排程更新
+        for _ in range(5):
+            assert cache.get(on_stale=failing_refresh, q="a")["n"] == 1
+            await asyncio.sleep(0)
+        assert refresh_calls == 1
+
+        # 退避結束後再嘗試一次
+        frozen.tick(31)
+        cache.get(on_stale=failing_refresh, q="a")
+        await asyncio.sleep(0)
+        assert refresh_calls == 2
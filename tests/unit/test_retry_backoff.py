@@ -9,9 +9,9 @@
 
 import pytest
 import time
-from unittest.mock import Mock, patch, call
+from unittest.mock import AsyncMock, Mock, patch, call
 import httpx
-from app.utils.resilience import exponential_backoff_retry
+from app.utils.resilience import exponential_backoff_retry, exponential_backoff_retry_async
 
 
 class TestExponentialBackoff:
@@ -234,4 +234,60 @@ class TestExponentialBackoff:
 
         assert result == {"result": "success"}
         # 驗證函數被調用時帶有正確參數
-        mock_func.assert_called_with(arg1="test", arg2=123)
\ No newline at end of file
+        mock_func.assert_called_with(arg1="test", arg2=123)
+
+    def test_full_jitter_within_backoff_bound(self):
+        """測試完全抖動延遲介於 0 與指數退避值之間"""
+        mock_func = Mock(side_effect=[
+            httpx.HTTPStatusError("Error", request=Mock(), response=Mock(status_code=503))
+            for _ in range(3)
+        ] + [{"status": "ok"}])
+
+        with patch('time.sleep') as mock_sleep, \
+                patch('app.utils.resilience.random.uniform', side_effect=lambda a, b: b) as mock_uniform:
+            exponential_backoff_retry(
+                mock_func,
+                max_retries=3,
+                base_delay=1.0,
+                max_delay=3.0,
+                full_jitter=True
+            )
+
+        assert [c.args for c in mock_uniform.call_args_list] == [(0, 1.0), (0, 2.0), (0, 3.0)]
+        assert [c.args[0] for c in mock_sleep.call_args_list] == [1.0, 2.0, 3.0]
+
+
+class TestExponentialBackoffAsync:
+    """非同步指數退避重試測試"""
+
+    @pytest.mark.asyncio
+    async def test_retries_with_asyncio_sleep(self):
+        """測試以 asyncio.sleep 等待，不呼叫 time.sleep"""
+        mock_func = AsyncMock(side_effect=[
+            httpx.ReadTimeout("timeout"),
+            httpx.HTTPStatusError("Error", request=Mock(), response=Mock(status_code=429)),
+            {"status": "ok"}
+        ])
+
+        with patch('app.utils.resilience.asyncio.sleep', new_callable=AsyncMock) as mock_sleep, \
+                patch('time.sleep') as mock_time_sleep:
+            result = await exponential_backoff_retry_async(mock_func, max_retries=3, base_delay=1.0)
+
+        assert result == {"status": "ok"}
+        assert mock_func.await_count == 3
+        assert [c.args[0] for c in mock_sleep.await_args_list] == [1.0, 2.0]
+        mock_time_sleep.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_non_retryable_error_raised_immediately(self):
+        """測試不可重試錯誤立即拋出"""
+        mock_func = AsyncMock(side_effect=httpx.HTTPStatusError(
+            "Bad request", request=Mock(), response=Mock(status_code=400)
+        ))
+
+        with patch('app.utils.resilience.asyncio.sleep', new_callable=AsyncMock) as mock_sleep:
+            with pytest.raises(httpx.HTTPStatusError):
+                await exponential_backoff_retry_async(mock_func, max_retries=3)
+
+        assert mock_func.await_count == 1
+        mock_sleep.assert_not_awaited()
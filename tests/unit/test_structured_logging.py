@@ -180,6 +180,24 @@ class TestStructuredLogger:
         assert log_data["memory_usage_mb"] == 45.2
         assert log_data["cpu_usage_percent"] == 12.8
 
+    def test_encodes_raw_datetimes_and_skips_filtered_levels(self):
+        """Test datetimes are serialized at emit time and filtered levels emit nothing."""
+        log_stream = StringIO()
+        handler = logging.StreamHandler(log_stream)
+        handler.setFormatter(StructuredFormatter())
+
+        self.logger.logger.handlers.clear()
+        self.logger.logger.addHandler(handler)
+
+        self.logger.debug("Filtered out", at=datetime(2024, 1, 1, 8, 30))
+        assert log_stream.getvalue() == ""
+
+        self.logger.info("Window", filters={"start_time": datetime(2024, 1, 1, 8, 30), "end_time": None})
+
+        log_data = json.loads(log_stream.getvalue().strip())
+        assert log_data["filters"]["start_time"] == "2024-01-01T08:30:00"
+        assert log_data["filters"]["end_time"] is None
+
 
 class TestStructuredFormatter:
     """Test structured JSON formatter."""